@@ -0,0 +1,122 @@
+"""
+Archive benchmarks
+__________________
+Decodes a synthetic archive of sprint report dumps with an increasing number of
+processes and reports the files and issues decoded per second.
+
+Notes
+_____
+The archive is written once to a temporary directory, one <board>-<sprint>.json
+file per report, so every process count decodes the same files including the
+store rows. Spawning the pool is part of the measured time.
+
+Usage
+_____
+    python -m benchmarks.bench_archive --reports 200 --issues 500 --processes 1 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from jira_sprint_reporter.archive import archive_files, decode_archive
+from utilities.fixtures import (
+    SPRINT_REPORT_FIXTURES,
+    load_fixture,
+    synthetic_sprint_report,
+)
+
+DEFAULT_REPORTS: int = 64
+DEFAULT_ISSUES: int = 300
+DEFAULT_PROCESS_COUNTS: tuple[int, ...] = (1, 2, 4, os.cpu_count() or 1)
+
+
+def write_archive(directory: str, reports: int, issues: int) -> None:
+    """Writes reports synthetic sprint reports of issues issues each"""
+    bases: list[dict] = [
+        synthetic_sprint_report(load_fixture(name), issues)
+        for name in SPRINT_REPORT_FIXTURES
+    ]
+    for number in range(reports):
+        raw: dict = bases[number % len(bases)]
+        raw["sprint"]["id"] = 70_000 + number
+        with open(
+            os.path.join(directory, f"6363-{70_000 + number}.json"),
+            "w",
+            encoding="utf-8",
+        ) as archive_file:
+            json.dump(raw, archive_file)
+
+
+def run_archive_benchmarks(
+    reports: int = DEFAULT_REPORTS,
+    issues: int = DEFAULT_ISSUES,
+    process_counts: tuple[int, ...] = DEFAULT_PROCESS_COUNTS,
+) -> list[dict]:
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        write_archive(directory, reports, issues)
+        for processes in dict.fromkeys(process_counts):
+            start: float = time.perf_counter()
+            decoded: int = 0
+            failed: int = 0
+            for result in decode_archive(archive_files([directory]), None, processes):
+                decoded += result.issue_count
+                failed += result.error is not None
+            wall_time: float = time.perf_counter() - start
+            results.append(
+                {
+                    "processes": processes,
+                    "reports": reports,
+                    "failed": failed,
+                    "wall_s": wall_time,
+                    "files_per_s": reports / wall_time,
+                    "issues_per_s": decoded / wall_time,
+                }
+            )
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    lines: list[str] = [
+        f"{'Processes':>9} {'Files/s':>10} {'Issues/s':>12} {'Wall s':>8} "
+        f"{'Speedup':>8} {'Failed':>7}"
+    ]
+    serial: float = results[0]["wall_s"] if results else 0.0
+    for item in results:
+        lines.append(
+            f"{item['processes']:>9} {item['files_per_s']:>10.1f} "
+            f"{item['issues_per_s']:>12.0f} {item['wall_s']:>8.2f} "
+            f"{serial / item['wall_s']:>8.2f} {item['failed']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive decode throughput per process count"
+    )
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS)
+    parser.add_argument(
+        "--issues", type=int, default=DEFAULT_ISSUES, help="per sprint report"
+    )
+    parser.add_argument(
+        "--processes", type=int, nargs="*", default=list(DEFAULT_PROCESS_COUNTS)
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    results: list[dict] = run_archive_benchmarks(
+        args.reports, args.issues, tuple(args.processes)
+    )
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,96 @@
+"""
+Import benchmarks
+_________________
+Times importing the CLI and the query modules in fresh interpreters, the cost
+paid by every cron run and test collection, and lists the heavy packages each
+import executes eagerly.
+
+Usage
+_____
+    python -m benchmarks.bench_import --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Optional
+
+from utilities.utils import get_absolute_path
+
+DEFAULT_REPEAT: int = 5
+DEFAULT_MODULES: tuple[str, ...] = (
+    "main",
+    "jira_sprint_reporter.queries",
+    "jira_sprint_reporter.batch",
+)
+HEAVY_MODULES: tuple[str, ...] = ("requests", "urllib3", "numpy", "dotenv", "asyncio")
+
+PROBE: str = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+loaded = [
+    name
+    for name in {heavy!r}
+    if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule"
+]
+print(json.dumps({{"seconds": seconds, "loaded": loaded}}))
+"""
+
+
+def probe_import(module: str) -> dict:
+    """Imports module in a new interpreter and returns its import time in
+    seconds and the heavy packages it executed"""
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=get_absolute_path("."),
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_import_benchmarks(
+    modules: tuple[str, ...] = DEFAULT_MODULES, repeat: int = DEFAULT_REPEAT
+) -> list[dict]:
+    results: list[dict] = []
+    for module in modules:
+        probes: list[dict] = [probe_import(module) for _ in range(repeat)]
+        timings: list[float] = [probe["seconds"] for probe in probes]
+        results.append(
+            {
+                "module": module,
+                "runs": repeat,
+                "min_s": min(timings),
+                "median_s": statistics.median(timings),
+                "eager_heavy_modules": probes[-1]["loaded"],
+            }
+        )
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    return "\n".join(
+        f"{item['module']:<32} {item['median_s'] * 1000:>8.1f} ms median "
+        f"{item['min_s'] * 1000:>8.1f} ms min  eager: "
+        + (", ".join(item["eager_heavy_modules"]) or "none")
+        for item in results
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Import time of the CLI and query modules"
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--modules", nargs="*", default=list(DEFAULT_MODULES))
+    args = parser.parse_args(argv)
+    print(format_results(run_import_benchmarks(tuple(args.modules), args.repeat)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
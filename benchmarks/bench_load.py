@@ -0,0 +1,190 @@
+"""
+Load benchmarks
+_______________
+Runs manifest batches end to end against the local stand-in server and reports
+the throughput and tail latency of report generation per worker count.
+
+Notes
+_____
+The on-disk sprint report cache is disabled and every report uses its own
+sprint id, so each report pays the full fetch, render and publish path. The
+per report latencies come from the manifest results, the per request ones from
+the HTTP records of the tracer.
+
+Usage
+_____
+    python -m benchmarks.bench_load --reports 40 --workers 1 4 8 --latency 0.05
+    python -m benchmarks.bench_load --error-rate 0.05 --output load.json
+"""
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from typing import Optional
+
+from benchmarks.standin import (
+    DEFAULT_ISSUES_PER_SPRINT,
+    FaultInjection,
+    StandinServer,
+    SyntheticJira,
+)
+from jira_sprint_reporter import client, settings, sprint_report_queries, tracing
+from jira_sprint_reporter.batch import ManifestEntry, ManifestResult, run_manifest
+from jira_sprint_reporter.request_policy import RateLimiter, RetryPolicy
+
+DEFAULT_REPORTS: int = 20
+DEFAULT_WORKER_COUNTS: tuple[int, ...] = (1, 4, 8)
+FIRST_SPRINT_ID: int = 50_000
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Returns the nearest rank percentile, share between 0 and 1"""
+    if not values:
+        return 0.0
+    ordered: list[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))]
+
+
+def latency_summary(values: list[float]) -> dict:
+    return {
+        "p50_s": percentile(values, 0.50),
+        "p95_s": percentile(values, 0.95),
+        "p99_s": percentile(values, 0.99),
+        "max_s": max(values, default=0.0),
+    }
+
+
+def load_entries(reports: int, first_sprint: int) -> list[ManifestEntry]:
+    return [
+        ManifestEntry("6363", str(first_sprint + number), "LOAD", "1", f"team-{number}")
+        for number in range(reports)
+    ]
+
+
+def run_load_scenario(
+    server: StandinServer, reports: int, workers: int, first_sprint: int
+) -> dict:
+    """Publishes reports sprint reports with workers threads through the
+    stand-in server and returns the throughput and latency figures"""
+    tracer: tracing.Tracer = tracing.Tracer()
+    tracing.set_tracer(tracer)
+    client.set_client(
+        client.ApiClient(
+            retry_policy=RetryPolicy(base_delay=0.05, max_delay=1.0),
+            rate_limiter=RateLimiter(),
+            pool_maxsize=max(workers, client.DEFAULT_POOL_MAXSIZE),
+            base_urls={
+                client.JIRA_BASE_URL: server.url,
+                client.CONFLUENCE_BASE_URL: server.url,
+            },
+        )
+    )
+    start: float = time.perf_counter()
+    results: list[ManifestResult] = run_manifest(
+        "load-test", load_entries(reports, first_sprint), workers
+    )
+    wall_time: float = time.perf_counter() - start
+    failed: int = sum(
+        1 for result in results if result.error or result.status_code != 200
+    )
+    return {
+        "workers": workers,
+        "reports": reports,
+        "failed": failed,
+        "wall_s": wall_time,
+        "reports_per_s": reports / wall_time,
+        "report_latency": latency_summary([result.elapsed for result in results]),
+        "http_requests": len(tracer.http_calls),
+        "http_errors": sum(
+            1 for call in tracer.http_calls if (call.status_code or 500) >= 400
+        ),
+        "http_latency": latency_summary([call.seconds for call in tracer.http_calls]),
+    }
+
+
+def run_load_benchmarks(
+    reports: int = DEFAULT_REPORTS,
+    worker_counts: tuple[int, ...] = DEFAULT_WORKER_COUNTS,
+    faults: Optional[FaultInjection] = None,
+    issues: int = DEFAULT_ISSUES_PER_SPRINT,
+) -> list[dict]:
+    previous_settings: settings.Settings = settings.get_settings()
+    previous_tracer: tracing.Tracer = tracing.get_tracer()
+    previous_memo = sprint_report_queries.get_sprint_report_memo()
+    settings.set_settings(
+        dataclasses.replace(previous_settings, sprint_report_cache=False)
+    )
+    sprint_report_queries.set_sprint_report_memo(
+        sprint_report_queries.SprintReportMemo()
+    )
+    results: list[dict] = []
+    try:
+        with StandinServer(SyntheticJira(issues), faults) as server:
+            for scenario, workers in enumerate(worker_counts):
+                results.append(
+                    run_load_scenario(
+                        server,
+                        reports,
+                        workers,
+                        FIRST_SPRINT_ID + scenario * reports,
+                    )
+                )
+    finally:
+        client.set_client(None)
+        tracing.set_tracer(previous_tracer)
+        sprint_report_queries.set_sprint_report_memo(previous_memo)
+        settings.set_settings(previous_settings)
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    lines: list[str] = [
+        f"{'Workers':>7} {'Reports/s':>10} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} "
+        f"{'HTTP p95 s':>10} {'Requests':>9} {'Errors':>7} {'Failed':>7}"
+    ]
+    for item in results:
+        lines.append(
+            f"{item['workers']:>7} {item['reports_per_s']:>10.2f} "
+            f"{item['report_latency']['p50_s']:>8.3f} "
+            f"{item['report_latency']['p95_s']:>8.3f} "
+            f"{item['report_latency']['p99_s']:>8.3f} "
+            f"{item['http_latency']['p95_s']:>10.3f} "
+            f"{item['http_requests']:>9} {item['http_errors']:>7} "
+            f"{item['failed']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Report throughput and latency against the stand-in server"
+    )
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS)
+    parser.add_argument(
+        "--workers", type=int, nargs="*", default=list(DEFAULT_WORKER_COUNTS)
+    )
+    parser.add_argument(
+        "--issues", type=int, default=DEFAULT_ISSUES_PER_SPRINT, help="per sprint"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    results: list[dict] = run_load_benchmarks(
+        args.reports,
+        tuple(args.workers),
+        FaultInjection(args.latency, args.jitter, args.error_rate, args.error_status),
+        args.issues,
+    )
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
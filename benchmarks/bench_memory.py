@@ -0,0 +1,102 @@
+"""
+Memory benchmarks
+_________________
+Compares the memory used per instance by the slotted entity classes against
+equivalent __dict__ backed dataclasses.
+
+Usage
+_____
+    python -m benchmarks.bench_memory --instances 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from typing import Any, Optional
+
+from entities.jira_issue import JiraIssue
+from entities.sprint_report_api import JiraIssueSprintReport
+from entities.team_info import TeamBoard, TeamSprint
+from utilities.fixtures import load_fixture
+
+DEFAULT_INSTANCES: int = 100_000
+
+
+def dict_backed_class(cls: type) -> type:
+    """Returns a plain @dataclass with the same fields as cls, which keeps a
+    __dict__ per instance like the entities did before they were slotted"""
+    return dataclasses.make_dataclass(
+        f"DictBacked{cls.__name__}",
+        [(item.name, item.type) for item in dataclasses.fields(cls)],
+    )
+
+
+def sample_values() -> dict[type, tuple]:
+    """Returns the field values of one decoded fixture instance per entity class"""
+    sprint_issue: dict = load_fixture("sprint-36928")["contents"]["completedIssues"][0]
+    samples: list[Any] = [
+        JiraIssue.from_dict(load_fixture("intgpt-109")),
+        JiraIssueSprintReport.from_dict(sprint_issue),
+        TeamBoard.from_dict(load_fixture("qppi-boards")["values"][0]),
+        TeamSprint.from_dict(load_fixture("6363-sprints")["values"][0]),
+    ]
+    return {
+        type(sample): tuple(
+            getattr(sample, item.name) for item in dataclasses.fields(sample)
+        )
+        for sample in samples
+    }
+
+
+def bytes_per_instance(cls: type, values: tuple, instances: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects: list = [cls(*values) for _ in range(instances)]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / instances
+
+
+def run_memory_benchmarks(instances: int = DEFAULT_INSTANCES) -> list[dict]:
+    results: list[dict] = []
+    for cls, values in sample_values().items():
+        slotted: float = bytes_per_instance(cls, values, instances)
+        dict_backed: float = bytes_per_instance(
+            dict_backed_class(cls), values, instances
+        )
+        results.append(
+            {
+                "class": cls.__name__,
+                "instances": instances,
+                "slotted_bytes": slotted,
+                "dict_backed_bytes": dict_backed,
+                "saving": 1 - slotted / dict_backed,
+            }
+        )
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    return "\n".join(
+        f"{item['class']:<24} {item['slotted_bytes']:>8.0f} B slotted "
+        f"{item['dict_backed_bytes']:>8.0f} B dict backed "
+        f"{item['saving']:>6.1%} saved"
+        for item in results
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Memory per instance of the entity classes"
+    )
+    parser.add_argument("--instances", type=int, default=DEFAULT_INSTANCES)
+    args = parser.parse_args(argv)
+    print(format_results(run_memory_benchmarks(args.instances)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
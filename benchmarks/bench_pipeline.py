@@ -0,0 +1,243 @@
+"""
+Pipeline benchmarks
+___________________
+Times parse -> resolve -> render on the recorded fixtures and on synthetic
+sprints scaled to thousands of issues, and records the results as JSON so they
+can be compared across versions.
+
+Usage
+_____
+    python -m benchmarks.bench_pipeline --output bench_results.json
+    python -m benchmarks.bench_pipeline --compare bench_results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tomllib
+from typing import Any, Callable, Optional
+
+from entities.jira_issue import JIRA_ISSUE_PATHS, JiraIssue
+from entities.sprint_report_api import (
+    SPRINT_REPORT_PATHS,
+    sprint_report_from_dict,
+    update_sprint_jira_issue_types,
+)
+from entities.team_info import team_board_list_from_dict, team_sprint_list_from_dict
+from jira_sprint_reporter.settings import get_settings
+from templates.sprint_report_template import sprint_report_template
+from utilities import json_decoding
+from utilities.fixtures import (
+    SPRINT_REPORT_FIXTURES,
+    load_fixture,
+    synthetic_sprint_report,
+)
+from utilities.utils import get_absolute_path
+
+DEFAULT_SCALES: tuple[int, ...] = (1_000, 10_000)
+DEFAULT_REPEAT: int = 5
+
+
+def time_callable(
+    function: Callable[[Any], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = DEFAULT_REPEAT,
+) -> dict:
+    """Runs function(setup()) repeat times, only timing the function call"""
+    timings: list[float] = []
+    for _ in range(repeat):
+        argument: Any = setup() if setup else None
+        start: float = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+    }
+
+
+def pipeline_benchmarks(name: str, raw: dict, repeat: int) -> list[dict]:
+    """Times the decode, resolve and render stages of one raw sprint report"""
+    issue_count: int = sum(
+        len(raw["contents"].get(list_name) or [])
+        for list_name in (
+            "completedIssues",
+            "issuesNotCompletedInCurrentSprint",
+            "puntedIssues",
+            "issuesCompletedInAnotherSprint",
+        )
+    )
+    resolved = update_sprint_jira_issue_types(sprint_report_from_dict(raw))
+    stages: list[tuple[str, Callable[[Any], Any], Optional[Callable[[], Any]]]] = [
+        ("sprint_report_from_dict", lambda _: sprint_report_from_dict(raw), None),
+        (
+            "sprint_report_from_dict_lazy",
+            lambda _: sprint_report_from_dict(raw, lazy=True),
+            None,
+        ),
+        (
+            "update_sprint_jira_issue_types",
+            update_sprint_jira_issue_types,
+            lambda: sprint_report_from_dict(raw),
+        ),
+        (
+            "sprint_report_template",
+            lambda _: sprint_report_template(resolved, "6363"),
+            None,
+        ),
+    ]
+    return [
+        {
+            "benchmark": benchmark,
+            "dataset": name,
+            "issues": issue_count,
+            **time_callable(function, setup, repeat),
+        }
+        for benchmark, function, setup in stages
+    ]
+
+
+def decoder_benchmarks(repeat: int, number: int = 1_000) -> list[dict]:
+    """Times the single issue and team_info list decoders, number decodes per run"""
+    decoders: list[tuple[str, str, Callable[[Any], Any]]] = [
+        ("JiraIssue.from_dict", "intgpt-109", JiraIssue.from_dict),
+        ("team_board_list_from_dict", "qppi-boards", team_board_list_from_dict),
+        ("team_sprint_list_from_dict", "6363-sprints", team_sprint_list_from_dict),
+    ]
+    results: list[dict] = []
+    for benchmark, fixture, decoder in decoders:
+        data: Any = load_fixture(fixture)
+        result: dict = time_callable(
+            lambda _, decoder=decoder, data=data: [
+                decoder(data) for _ in range(number)
+            ],
+            repeat=repeat,
+        )
+        results.append(
+            {"benchmark": benchmark, "dataset": fixture, "decodes": number, **result}
+        )
+    return results
+
+
+def json_decoding_benchmarks(repeat: int, number: int = 100) -> list[dict]:
+    """Times decoding the raw fixtures in full and reduced to the entity paths,
+    number decodes per run"""
+    payloads: list[tuple[str, tuple[str, ...]]] = [
+        ("intgpt-109", JIRA_ISSUE_PATHS),
+        (SPRINT_REPORT_FIXTURES[0], SPRINT_REPORT_PATHS),
+    ]
+    decoder: Optional[str] = get_settings().json_decoder
+    results: list[dict] = []
+    for fixture, paths in payloads:
+        raw: bytes = json.dumps(load_fixture(fixture)).encode("utf-8")
+        for benchmark, selected in (("loads", None), ("loads_selected", paths)):
+            result: dict = time_callable(
+                lambda _, raw=raw, selected=selected: [
+                    json_decoding.loads(raw, selected, decoder) for _ in range(number)
+                ],
+                repeat=repeat,
+            )
+            results.append(
+                {
+                    "benchmark": f"{json_decoding.json_backend(decoder)}.{benchmark}",
+                    "dataset": fixture,
+                    "decodes": number,
+                    **result,
+                }
+            )
+    return results
+
+
+def project_version() -> str:
+    with open(get_absolute_path("pyproject.toml"), "rb") as pyproject:
+        return tomllib.load(pyproject)["tool"]["poetry"]["version"]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=get_absolute_path("."),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    scales: tuple[int, ...] = DEFAULT_SCALES, repeat: int = DEFAULT_REPEAT
+) -> dict:
+    results: list[dict] = []
+    for fixture in SPRINT_REPORT_FIXTURES:
+        results += pipeline_benchmarks(fixture, load_fixture(fixture), repeat)
+    base: dict = load_fixture(SPRINT_REPORT_FIXTURES[0])
+    for scale in scales:
+        results += pipeline_benchmarks(
+            f"synthetic-{scale}", synthetic_sprint_report(base, scale), repeat
+        )
+    results += decoder_benchmarks(repeat)
+    results += json_decoding_benchmarks(repeat)
+    return {
+        "version": project_version(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def format_results(report: dict, baseline: Optional[dict] = None) -> str:
+    """Returns a table of the median timings, with the ratio against the
+    baseline report when given"""
+    previous: dict[tuple[str, str], float] = {
+        (item["benchmark"], item["dataset"]): item["median_s"]
+        for item in (baseline or {}).get("results", [])
+    }
+    lines: list[str] = []
+    for item in report["results"]:
+        line: str = (
+            f"{item['benchmark']:<32} {item['dataset']:<18} "
+            f"{item['median_s'] * 1000:>10.3f} ms"
+        )
+        old: Optional[float] = previous.get((item["benchmark"], item["dataset"]))
+        if old:
+            line += f"  x{item['median_s'] / old:.2f} vs baseline"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parse, resolve and render benchmarks")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_SCALES),
+        help="issue counts of the synthetic sprints",
+    )
+    args = parser.parse_args(argv)
+    report: dict = run_benchmarks(tuple(args.scales), args.repeat)
+    baseline: Optional[dict] = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_results(report, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
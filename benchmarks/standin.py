@@ -0,0 +1,579 @@
+"""
+Stand-in server
+_______________
+A local HTTP server answering the Jira and Confluence rest api calls of the
+reporter, so the whole pipeline can be load tested on a laptop without network.
+
+Notes
+_____
+One server answers both hosts: the greenhopper sprint report, the agile board
+and sprint listings, single issues and JQL key searches, and the Confluence
+content, page creation, update and content property calls. GET responses come
+from the recordings directory when one matches the request, otherwise from
+synthetic data built out of tests/json_files (see utilities.fixtures).
+Created pages are kept in memory.
+
+Every response can be delayed (latency and jitter) and replaced by an error
+(error_rate, error_status, Retry-After). In record mode the GET requests that
+are not recorded yet are forwarded to the real Jira or Confluence with the
+caller's credentials and captured, so later runs replay real data offline.
+Point the reporter at the server with JIRA_URL and CONFLUENCE_URL.
+
+Usage
+_____
+    python -m benchmarks.standin --port 8080 --latency 0.05 --error-rate 0.01
+    JIRA_URL=http://127.0.0.1:8080 CONFLUENCE_URL=http://127.0.0.1:8080 \\
+        python main.py --manifest reports.yaml
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from jira_sprint_reporter.client import CONFLUENCE_BASE_URL, JIRA_BASE_URL
+from utilities.fixtures import load_fixture, synthetic_sprint_report
+
+DEFAULT_PORT: int = 8080
+DEFAULT_ISSUES_PER_SPRINT: int = 100
+DEFAULT_PAGE_SIZE: int = 50
+CONFLUENCE_PATH_PREFIX: str = "/rest/api/content"
+RECORDED_HEADERS: tuple[str, ...] = ("Content-Type", "ETag")
+
+_ISSUE_KEY = re.compile(r"[A-Z][A-Z0-9]+-\d+")
+_BOARD = re.compile(r"^/rest/agile/latest/board/(\d+)$")
+_BOARD_SPRINTS = re.compile(r"^/rest/agile/latest/board/(\d+)/sprint$")
+_ISSUE = re.compile(r"^/rest/api/2/issue/([^/]+)$")
+_PAGE = re.compile(r"^/rest/api/content/(\d+)$")
+_PAGE_PROPERTY = re.compile(r"^/rest/api/content/(\d+)/property(?:/([^/]+))?$")
+
+
+@dataclass
+class StandinResponse:
+    status: int
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def from_json(status: int, data: Any) -> "StandinResponse":
+        return StandinResponse(
+            status,
+            json.dumps(data).encode("utf-8"),
+            {"Content-Type": "application/json"},
+        )
+
+    def conditional(self, headers: dict) -> "StandinResponse":
+        """Returns 304 Not Modified when If-None-Match carries the ETag of the
+        response, else the response"""
+        etag: Optional[str] = self.headers.get("ETag")
+        if etag is not None and headers.get("If-None-Match") == etag:
+            return StandinResponse(304, b"", {"ETag": etag})
+        return self
+
+
+@dataclass
+class FaultInjection:
+    """
+    The delays and errors added to every response.
+
+    ...
+    Attributes
+    __________
+    latency: float
+        Seconds added to every response.
+    jitter: float
+        Up to this many seconds are added at random on top of latency.
+    error_rate: float
+        Share of the requests answered with error_status instead.
+    error_status: int
+        The injected HTTP status, e.g. 503 or 429.
+    retry_after: Optional[float]
+        Retry-After seconds sent with the injected errors.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    retry_after: Optional[float] = None
+
+    def delay(self) -> float:
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def error(self) -> Optional[StandinResponse]:
+        if not self.error_rate or random.random() >= self.error_rate:
+            return None
+        response: StandinResponse = StandinResponse.from_json(
+            self.error_status, {"errorMessages": ["Injected by the stand-in server"]}
+        )
+        if self.retry_after is not None:
+            response.headers["Retry-After"] = f"{self.retry_after:g}"
+        return response
+
+
+def recording_key(method: str, path: str, query: list[tuple[str, str]]) -> str:
+    request_line: str = f"{method} {path}?{sorted(query)}"
+    return hashlib.sha1(request_line.encode("utf-8")).hexdigest()[:20]
+
+
+class Recordings:
+    """
+    The recorded responses of a directory, one JSON file per request. With
+    record, the GET requests not recorded yet are sent to the real servers and
+    written to the directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        record: bool = False,
+        jira_url: str = JIRA_BASE_URL,
+        confluence_url: str = CONFLUENCE_BASE_URL,
+    ) -> None:
+        self.directory: str = directory
+        self.record: bool = record
+        self.jira_url: str = jira_url.rstrip("/")
+        self.confluence_url: str = confluence_url.rstrip("/")
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(
+        self, method: str, path: str, query: list[tuple[str, str]]
+    ) -> Optional[StandinResponse]:
+        try:
+            with open(
+                self.path(recording_key(method, path, query)), encoding="utf-8"
+            ) as recording_file:
+                recording: dict = json.load(recording_file)
+        except FileNotFoundError:
+            return None
+        return StandinResponse(
+            recording["status"],
+            recording["body"].encode("utf-8"),
+            recording["headers"],
+        )
+
+    def capture(
+        self,
+        method: str,
+        path: str,
+        query: list[tuple[str, str]],
+        headers: dict[str, str],
+    ) -> StandinResponse:
+        """Sends the request to the real server and records its response"""
+        upstream: str = (
+            self.confluence_url
+            if path.startswith(CONFLUENCE_PATH_PREFIX)
+            else self.jira_url
+        )
+        upstream_response: requests.Response = requests.request(
+            method, upstream + path, params=query, headers=headers, timeout=60
+        )
+        response: StandinResponse = StandinResponse(
+            upstream_response.status_code,
+            upstream_response.content,
+            {
+                name: upstream_response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in upstream_response.headers
+            },
+        )
+        if response.status == 200:
+            recording: dict = {
+                "request": {"method": method, "path": path, "query": query},
+                "status": response.status,
+                "headers": response.headers,
+                "body": response.body.decode("utf-8"),
+            }
+            key: str = recording_key(method, path, query)
+            temporary_path: str = f"{self.path(key)}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as recording_file:
+                json.dump(recording, recording_file)
+            os.replace(temporary_path, self.path(key))
+        return response
+
+
+def agile_page(values: list, params: dict[str, str]) -> dict:
+    start_at: int = int(params.get("startAt") or 0)
+    max_results: int = int(params.get("maxResults") or DEFAULT_PAGE_SIZE)
+    page: list = values[start_at : start_at + max_results]
+    return {
+        "maxResults": max_results,
+        "startAt": start_at,
+        "total": len(values),
+        "isLast": start_at + max_results >= len(values),
+        "values": page,
+    }
+
+
+def project_fields(issue: dict, fields: Optional[str]) -> dict:
+    """Keeps the requested fields only, like the fields parameter of Jira"""
+    if not fields or fields in ("*all", "*navigable"):
+        return issue
+    names: set[str] = set(fields.split(","))
+    projected: dict = {k: v for k, v in issue.items() if k != "fields"}
+    projected["fields"] = {
+        name: value for name, value in issue["fields"].items() if name in names
+    }
+    return projected
+
+
+class SyntheticJira:
+    """
+    Jira and Confluence answers built from the recorded fixtures. Sprint reports
+    of any board and sprint id are scaled to issues_per_sprint issues.
+    """
+
+    def __init__(self, issues_per_sprint: int = DEFAULT_ISSUES_PER_SPRINT) -> None:
+        self.issues_per_sprint: int = issues_per_sprint
+        self.sprint_report_base: dict = load_fixture("sprint-36928")
+        self.issue_template: dict = load_fixture("intgpt-109")
+        self.boards: list[dict] = load_fixture("qppi-boards")["values"]
+        self.sprints: list[dict] = load_fixture("6363-sprints")["values"]
+        self.sprint_reports: dict[tuple[str, str], StandinResponse] = {}
+        self.pages: dict[str, dict] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def sprint_report(self, board: str, sprint: str) -> StandinResponse:
+        with self._lock:
+            cached: Optional[StandinResponse] = self.sprint_reports.get(
+                (board, sprint)
+            )
+        if cached is not None:
+            return cached
+        report: dict = synthetic_sprint_report(
+            self.sprint_report_base, self.issues_per_sprint
+        )
+        report["sprint"].update(id=int(sprint), name=f"Sprint {sprint}")
+        response: StandinResponse = StandinResponse.from_json(200, report)
+        response.headers["ETag"] = f'"{hashlib.sha1(response.body).hexdigest()}"'
+        with self._lock:
+            return self.sprint_reports.setdefault((board, sprint), response)
+
+    def issue(self, key: str) -> dict:
+        issue: dict = copy.deepcopy(self.issue_template)
+        issue.update(key=key, id=str(10_000_000 + int(key.rsplit("-", 1)[1])))
+        return issue
+
+    def get(self, path: str, params: dict[str, str], headers: dict) -> StandinResponse:
+        if path == "/rest/greenhopper/latest/rapid/charts/sprintreport":
+            sprint: str = params.get("sprintId", "")
+            if not sprint.isdigit():
+                return StandinResponse.from_json(
+                    400, {"message": f"Invalid sprintId: {sprint!r}"}
+                )
+            response: StandinResponse = self.sprint_report(
+                params.get("rapidViewId", ""), sprint
+            )
+            return response.conditional(headers)
+        if path == "/rest/agile/latest/board":
+            name: str = params.get("name", "").lower()
+            boards: list[dict] = [
+                board for board in self.boards if name in board["name"].lower()
+            ]
+            return StandinResponse.from_json(200, agile_page(boards, params))
+        if match := _BOARD.match(path):
+            board: dict = dict(self.boards[0], id=int(match.group(1)))
+            return StandinResponse.from_json(200, board)
+        if match := _BOARD_SPRINTS.match(path):
+            states: set[str] = set(filter(None, params.get("state", "").split(",")))
+            sprints: list[dict] = [
+                dict(sprint, originBoardId=int(match.group(1)))
+                for sprint in self.sprints
+                if not states or sprint.get("state") in states
+            ]
+            return StandinResponse.from_json(200, agile_page(sprints, params))
+        if match := _ISSUE.match(path):
+            return StandinResponse.from_json(
+                200, project_fields(self.issue(match.group(1)), params.get("fields"))
+            )
+        if path == "/rest/api/2/search":
+            keys: list[str] = _ISSUE_KEY.findall(params.get("jql", ""))
+            page: dict = agile_page(keys, params)
+            return StandinResponse.from_json(
+                200,
+                {
+                    "startAt": page["startAt"],
+                    "maxResults": page["maxResults"],
+                    "total": page["total"],
+                    "issues": [
+                        project_fields(self.issue(key), params.get("fields"))
+                        for key in page["values"]
+                    ],
+                },
+            )
+        if path == CONFLUENCE_PATH_PREFIX:
+            with self._lock:
+                results: list[dict] = [
+                    copy.deepcopy(page)
+                    for page in self.pages.values()
+                    if page["title"] == params.get("title")
+                    and page["space"]["key"] == params.get("spaceKey")
+                ]
+            return StandinResponse.from_json(200, {"results": results})
+        return StandinResponse.from_json(404, {"errorMessages": [f"No route {path}"]})
+
+    def create_page(self, data: dict) -> StandinResponse:
+        with self._lock:
+            if any(
+                page["title"] == data.get("title")
+                and page["space"]["key"] == data["space"]["key"]
+                for page in self.pages.values()
+            ):
+                return StandinResponse.from_json(
+                    400, {"message": "A page with this title already exists"}
+                )
+            page_id: str = str(100_000 + len(self.pages))
+            properties: dict = (data.get("metadata") or {}).get("properties") or {}
+            page: dict = dict(
+                data,
+                id=page_id,
+                version={"number": 1},
+                metadata={
+                    "properties": {
+                        key: dict(value, version={"number": 1})
+                        for key, value in properties.items()
+                    }
+                },
+            )
+            self.pages[page_id] = page
+            return StandinResponse.from_json(200, page)
+
+    def update_page(self, page_id: str, data: dict) -> StandinResponse:
+        with self._lock:
+            page: Optional[dict] = self.pages.get(page_id)
+            if page is None:
+                return StandinResponse.from_json(404, {"message": "No such page"})
+            if data["version"]["number"] != page["version"]["number"] + 1:
+                return StandinResponse.from_json(409, {"message": "Version conflict"})
+            page.update(
+                title=data["title"], body=data["body"], version=data["version"]
+            )
+            return StandinResponse.from_json(200, page)
+
+    def save_property(self, page_id: str, data: dict) -> StandinResponse:
+        with self._lock:
+            page: Optional[dict] = self.pages.get(page_id)
+            if page is None:
+                return StandinResponse.from_json(404, {"message": "No such page"})
+            properties: dict = page["metadata"]["properties"]
+            version: dict = data.get("version") or {"number": 1}
+            properties[data["key"]] = {"value": data["value"], "version": version}
+            return StandinResponse.from_json(200, properties[data["key"]])
+
+    def send(self, method: str, path: str, data: dict) -> StandinResponse:
+        if method == "POST" and path == CONFLUENCE_PATH_PREFIX:
+            return self.create_page(data)
+        if method == "PUT" and (match := _PAGE.match(path)):
+            return self.update_page(match.group(1), data)
+        if match := _PAGE_PROPERTY.match(path):
+            return self.save_property(match.group(1), data)
+        return StandinResponse.from_json(404, {"errorMessages": [f"No route {path}"]})
+
+
+class StandinServer:
+    """
+    Runs the stand-in on a background thread.
+
+    ...
+    Attributes
+    __________
+    jira: SyntheticJira
+        The synthetic data and the created pages.
+    faults: FaultInjection
+        The delays and errors added to every response.
+    recordings: Optional[Recordings]
+        Recorded responses served before the synthetic ones.
+    requests_served: int
+        Number of requests answered, including the injected errors.
+    """
+
+    def __init__(
+        self,
+        jira: Optional[SyntheticJira] = None,
+        faults: Optional[FaultInjection] = None,
+        recordings: Optional[Recordings] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.jira: SyntheticJira = jira or SyntheticJira()
+        self.faults: FaultInjection = faults or FaultInjection()
+        self.recordings: Optional[Recordings] = recordings
+        self.requests_served: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self.httpd: ThreadingHTTPServer = ThreadingHTTPServer(
+            (host, port), standin_handler(self)
+        )
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(
+        self, method: str, target: str, headers: dict, body: bytes
+    ) -> StandinResponse:
+        with self._lock:
+            self.requests_served += 1
+        delay: float = self.faults.delay()
+        if delay:
+            time.sleep(delay)
+        injected: Optional[StandinResponse] = self.faults.error()
+        if injected is not None:
+            return injected
+        parts = urlsplit(target)
+        query: list[tuple[str, str]] = parse_qsl(parts.query)
+        if method == "GET":
+            if self.recordings is not None:
+                recorded: Optional[StandinResponse] = self.recordings.load(
+                    method, parts.path, query
+                )
+                if recorded is not None:
+                    return recorded.conditional(headers)
+                if self.recordings.record:
+                    return self.recordings.capture(
+                        method,
+                        parts.path,
+                        query,
+                        {
+                            name: value
+                            for name, value in headers.items()
+                            if name in ("Authorization", "Cookie", "Accept")
+                        },
+                    ).conditional(headers)
+            return self.jira.get(parts.path, dict(query), headers)
+        try:
+            data: dict = json.loads(body or b"{}")
+        except ValueError:
+            return StandinResponse.from_json(400, {"message": "Invalid JSON"})
+        return self.jira.send(method, parts.path, data)
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+def standin_handler(server: StandinServer) -> type[BaseHTTPRequestHandler]:
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def read_body(self) -> bytes:
+            """Reads a Content-Length or chunked (streamed page) request body"""
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks: list[bytes] = []
+                while True:
+                    size: int = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def handle_request(self) -> None:
+            body: bytes = self.read_body() if self.command != "GET" else b""
+            response: StandinResponse = server.respond(
+                self.command, self.path, dict(self.headers), body
+            )
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            self.wfile.write(response.body)
+
+        do_GET = handle_request
+        do_POST = handle_request
+        do_PUT = handle_request
+
+        def log_message(
+            self, format: str, *args: Any  # pylint: disable=redefined-builtin
+        ) -> None:
+            pass
+
+    return StandinHandler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Jira and Confluence rest apis"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--issues",
+        type=int,
+        default=DEFAULT_ISSUES_PER_SPRINT,
+        help="issues of every synthetic sprint report",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument(
+        "--recordings", help="directory of the recorded responses to replay"
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="forward the GET requests not recorded yet to the real servers and "
+        "record them in --recordings",
+    )
+    args = parser.parse_args(argv)
+    if args.record and not args.recordings:
+        parser.error("--record needs --recordings")
+    server: StandinServer = StandinServer(
+        SyntheticJira(args.issues),
+        FaultInjection(
+            args.latency,
+            args.jitter,
+            args.error_rate,
+            args.error_status,
+            args.retry_after,
+        ),
+        Recordings(args.recordings, args.record) if args.recordings else None,
+        args.host,
+        args.port,
+    )
+    print(f"Serving Jira and Confluence on {server.url}, Ctrl+C to stop")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
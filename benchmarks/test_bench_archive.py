@@ -0,0 +1,9 @@
+from benchmarks.bench_archive import run_archive_benchmarks
+
+
+def test_archive_benchmark_decodes_every_file() -> None:
+    results: list[dict] = run_archive_benchmarks(
+        reports=4, issues=20, process_counts=(1, 2)
+    )
+    assert [item["processes"] for item in results] == [1, 2]
+    assert all(item["failed"] == 0 and item["issues_per_s"] > 0 for item in results)
@@ -0,0 +1,11 @@
+from benchmarks.bench_memory import run_memory_benchmarks
+
+
+def test_memory_benchmark_reports_every_entity() -> None:
+    results: list[dict] = run_memory_benchmarks(instances=100)
+    assert {item["class"] for item in results} == {
+        "JiraIssue",
+        "JiraIssueSprintReport",
+        "TeamBoard",
+        "TeamSprint",
+    }
@@ -0,0 +1,35 @@
+from benchmarks.bench_pipeline import format_results, run_benchmarks
+from entities.sprint_report_api import (
+    SprintReport,
+    get_all_jira_issues_from_sprint_report,
+    sprint_report_from_dict,
+)
+from jira_sprint_reporter.settings import get_settings
+from utilities.fixtures import load_fixture, synthetic_sprint_report
+from utilities.json_decoding import json_backend
+
+
+def test_synthetic_sprint_report_has_the_requested_issue_count() -> None:
+    raw: dict = synthetic_sprint_report(load_fixture("sprint-36928"), 250)
+    sprint: SprintReport = sprint_report_from_dict(raw)
+    issues = get_all_jira_issues_from_sprint_report(sprint)
+    assert len(issues) == 250
+    assert len({issue.key for issue in issues}) == 250
+    assert len(sprint.added_issues or {}) == 25
+
+
+def test_benchmark_report_covers_every_stage() -> None:
+    report: dict = run_benchmarks(scales=(20,), repeat=1)
+    benchmarks: set[str] = {item["benchmark"] for item in report["results"]}
+    assert benchmarks == {
+        "sprint_report_from_dict",
+        "sprint_report_from_dict_lazy",
+        "update_sprint_jira_issue_types",
+        "sprint_report_template",
+        "JiraIssue.from_dict",
+        "team_board_list_from_dict",
+        "team_sprint_list_from_dict",
+        f"{json_backend(get_settings().json_decoder)}.loads",
+        f"{json_backend(get_settings().json_decoder)}.loads_selected",
+    }
+    assert "x1.00 vs baseline" in format_results(report, report)
@@ -0,0 +1,128 @@
+import dataclasses
+import json
+from pathlib import Path
+from typing import Generator
+
+import pytest
+import requests
+
+from benchmarks.bench_load import run_load_benchmarks
+from benchmarks.standin import (
+    FaultInjection,
+    Recordings,
+    StandinServer,
+    SyntheticJira,
+)
+from jira_sprint_reporter import client, confluence, settings
+from jira_sprint_reporter.batch import ManifestEntry, ManifestResult, run_manifest
+from jira_sprint_reporter.client import CONFLUENCE_BASE_URL, JIRA_BASE_URL, ApiClient
+from jira_sprint_reporter.request_policy import RateLimiter, RetryPolicy
+
+
+def standin_client(server: StandinServer, max_attempts: int = 4) -> ApiClient:
+    return ApiClient(
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.01),
+        rate_limiter=RateLimiter(),
+        base_urls={JIRA_BASE_URL: server.url, CONFLUENCE_BASE_URL: server.url},
+    )
+
+
+@pytest.fixture
+def standin() -> Generator[StandinServer, None, None]:
+    settings.set_settings(
+        dataclasses.replace(settings.get_settings(), sprint_report_cache=False)
+    )
+    with StandinServer(SyntheticJira(issues_per_sprint=30)) as server:
+        client.set_client(standin_client(server))
+        yield server
+    client.set_client(None)
+    settings.set_settings(None)
+
+
+def test_manifest_reports_are_published_and_then_unchanged(
+    standin: StandinServer,
+) -> None:
+    entries: list[ManifestEntry] = [
+        ManifestEntry("6363", "latest closed", "SPACE", "7"),
+        ManifestEntry("6363", "61001", "SPACE", "7"),
+    ]
+    first: list[ManifestResult] = run_manifest("creds", entries, 2, upsert=True)
+    assert [(result.status_code, result.action) for result in first] == [
+        (200, confluence.CREATED),
+        (200, confluence.CREATED),
+    ]
+    again: list[ManifestResult] = run_manifest("creds", entries, 2, upsert=True)
+    assert {result.action for result in again} == {confluence.UNCHANGED}
+    assert len(standin.jira.pages) == 2
+
+
+def test_streamed_pages_are_accepted(standin: StandinServer) -> None:
+    response = client.get_client().post(
+        f"{CONFLUENCE_BASE_URL}/rest/api/content",
+        data=iter([b'{"title": "Streamed", ', b'"space": {"key": "S"}}']),
+    )
+    assert response.status_code == 200
+    assert standin.jira.pages[response.json()["id"]]["title"] == "Streamed"
+
+
+def test_injected_errors_are_retried_then_returned() -> None:
+    faults: FaultInjection = FaultInjection(error_rate=1.0, retry_after=0)
+    with StandinServer(faults=faults) as server:
+        with standin_client(server, max_attempts=3) as api_client:
+            response = api_client.get(f"{JIRA_BASE_URL}/rest/api/2/issue/A-1")
+        assert response.status_code == 503
+        assert server.requests_served == 3
+
+
+def test_recorded_responses_are_replayed_offline(tmp_path: Path) -> None:
+    path: str = "/rest/api/2/issue/INTGPT-7?fields=summary"
+    with StandinServer() as upstream:
+        recordings: Recordings = Recordings(
+            str(tmp_path), record=True, jira_url=upstream.url
+        )
+        with StandinServer(recordings=recordings) as recorder:
+            recorded = requests.get(recorder.url + path, timeout=5)
+    assert recorded.status_code == 200
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    with StandinServer(recordings=Recordings(str(tmp_path))) as replay:
+        replay.jira.issue_template = {}
+        replayed = requests.get(replay.url + path, timeout=5)
+    assert json.loads(replayed.content) == json.loads(recorded.content)
+    assert replayed.json()["fields"] == {"summary": "API Validate ID token"}
+
+
+def test_load_benchmark_reports_throughput_and_latency() -> None:
+    results: list[dict] = run_load_benchmarks(
+        reports=3, worker_counts=(1, 3), issues=20
+    )
+    assert [item["workers"] for item in results] == [1, 3]
+    assert all(item["failed"] == 0 and item["reports_per_s"] > 0 for item in results)
+    assert all(item["http_requests"] == 6 for item in results)
+
+
+def test_recorded_sprint_reports_answer_conditional_requests(tmp_path: Path) -> None:
+    path: str = (
+        "/rest/greenhopper/latest/rapid/charts/sprintreport"
+        "?rapidViewId=6363&sprintId=61001"
+    )
+    with StandinServer(SyntheticJira(issues_per_sprint=5)) as upstream:
+        recordings: Recordings = Recordings(
+            str(tmp_path), record=True, jira_url=upstream.url
+        )
+        with StandinServer(recordings=recordings) as recorder:
+            etag: str = requests.get(recorder.url + path, timeout=5).headers["ETag"]
+    with StandinServer(recordings=Recordings(str(tmp_path))) as replay:
+        replayed = requests.get(
+            replay.url + path, headers={"If-None-Match": etag}, timeout=5
+        )
+    assert (replayed.status_code, replayed.headers["ETag"]) == (304, etag)
+
+
+def test_invalid_sprint_ids_are_rejected(standin: StandinServer) -> None:
+    response = requests.get(
+        f"{standin.url}/rest/greenhopper/latest/rapid/charts/sprintreport"
+        "?rapidViewId=6363&sprintId=latest",
+        timeout=5,
+    )
+    assert response.status_code == 400
+    assert "sprintId" in response.json()["message"]
@@ -4,8 +4,27 @@ from typing import Any, Optional
 
 from utilities import utils
 
+JIRA_ISSUE_PATHS: tuple[str, ...] = (
+    "id",
+    "key",
+    "fields.summary",
+    "fields.issuetype.name",
+    "fields.priority.name",
+    "fields.components.name",
+    "fields.labels",
+    "fields.status.name",
+    "fields.description",
+    "fields.fixVersions.name",
+    "fields.assignee.name",
+    "fields.reporter.name",
+    "fields.created",
+    "fields.updated",
+    "fields.resolution.name",
+    "fields.resolutiondate",
+)
+"""The paths JiraIssue.from_dict reads, see utilities.json_decoding.loads"""
 
-@dataclass
+@dataclass(slots=True)
 class JiraIssue:
     issue_id: int
     key: str
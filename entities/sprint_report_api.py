@@ -7,14 +7,53 @@ _____
 https://jira.amer.thermo.com/rest/greenhopper/latest/rapid/charts/sprintreport?rapidViewId={}&sprintId={}
 """
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Optional
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Optional, cast, overload
 
 from utilities import utils
 
-
-@dataclass
+JIRA_ISSUE_SPRINT_REPORT_PATHS: tuple[str, ...] = (
+    "id",
+    "key",
+    "typeId",
+    "summary",
+    "assigneeName",
+    "statusId",
+    "priorityId",
+    "done",
+    "currentEstimateStatistic.statFieldValue.value",
+    "estimateStatistic.statFieldValue.value",
+)
+SPRINT_REPORT_ISSUE_LISTS: tuple[str, ...] = (
+    "completedIssues",
+    "issuesNotCompletedInCurrentSprint",
+    "puntedIssues",
+    "issuesCompletedInAnotherSprint",
+)
+SPRINT_REPORT_PATHS: tuple[str, ...] = (
+    "sprint.id",
+    "sprint.name",
+    "sprint.goal",
+    "sprint.state",
+    "sprint.activatedDate",
+    "sprint.completeDate",
+    "contents.entityData.statuses",
+    "contents.entityData.priorities",
+    "contents.entityData.types",
+    "contents.completedIssuesInitialEstimateSum.value",
+    "contents.completedIssuesEstimateSum.value",
+    "contents.issueKeysAddedDuringSprint",
+    *(
+        f"contents.{list_name}.{path}"
+        for list_name in SPRINT_REPORT_ISSUE_LISTS
+        for path in JIRA_ISSUE_SPRINT_REPORT_PATHS
+    ),
+)
+"""The paths SprintReport.from_dict reads, plus sprint.state for the cache"""
+
+
+@dataclass(slots=True)
 class JiraIssueSprintReport:
     """ "
     The JiraIssueSpritnReport object captures the most relevant data of issues
@@ -25,6 +64,9 @@ class JiraIssueSprintReport:
     __________
     key: str
         The issue key given by Jira.
+    components, labels, fix_versions: Optional[list[str]]
+        Not part of the sprint report, None until the issue is enriched with
+        jira_sprint_reporter.issue_search.enrich_sprint_report.
 
     """
 
@@ -38,6 +80,9 @@ class JiraIssueSprintReport:
     resolution: str
     original_estimate: Optional[int] = None
     final_estimate: Optional[int] = None
+    components: Optional[list[str]] = None
+    labels: Optional[list[str]] = None
+    fix_versions: Optional[list[str]] = None
 
     def __getitem__(self, key: str) -> Any:
         return getattr(self, key)
@@ -110,6 +155,12 @@ class JiraIssueSprintReport:
             result["original_estimate"] = int(self.original_estimate)
         if self.final_estimate is not None:
             result["final_estimate"] = int(self.final_estimate)
+        if self.components is not None:
+            result["components"] = self.components
+        if self.labels is not None:
+            result["labels"] = self.labels
+        if self.fix_versions is not None:
+            result["fix_versions"] = self.fix_versions
         return result
 
     def __repr__(self):
@@ -126,6 +177,72 @@ class JiraIssueSprintReport:
         final_estimate: {self.final_estimate}"""
 
 
+@dataclass
+class SprintReportIndex:
+    """
+    The SprintReportIndex object groups the issues of a SprintReport in a single
+    pass so the report helpers do not rescan the issue lists.
+
+    ...
+    Attributes
+    __________
+    all_issues: list[JiraIssueSprintReport]
+        Completed, not completed, removed and completed outside issues in order.
+    by_key: dict[str, JiraIssueSprintReport]
+        Issues by issue key.
+    by_type: dict[str, list[JiraIssueSprintReport]]
+        Issues by issue type.
+    by_status: dict[str, list[JiraIssueSprintReport]]
+        Issues by issue status.
+    by_assignee: dict[str, list[JiraIssueSprintReport]]
+        Issues by assignee name.
+    added_keys: set[str]
+        Keys of the issues added during the sprint.
+    added_issues: Optional[list[JiraIssueSprintReport]]
+        Issues added during the sprint, None when the report has no added keys.
+    commited_completed_issues: list[JiraIssueSprintReport]
+        Completed issues that were part of the original commitment.
+    """
+
+    all_issues: list[JiraIssueSprintReport]
+    by_key: dict[str, JiraIssueSprintReport]
+    by_type: dict[str, list[JiraIssueSprintReport]]
+    by_status: dict[str, list[JiraIssueSprintReport]]
+    by_assignee: dict[str, list[JiraIssueSprintReport]]
+    added_keys: set[str]
+    added_issues: Optional[list[JiraIssueSprintReport]]
+    commited_completed_issues: list[JiraIssueSprintReport]
+    signature: tuple = ()
+
+    @staticmethod
+    def from_sprint_report(sprint: "SprintReport") -> "SprintReportIndex":
+        added_keys: set[str] = set(sprint.added_issues or ())
+        completed_ids: set[int] = {id(issue) for issue in sprint.completed_issues or ()}
+        index: SprintReportIndex = SprintReportIndex(
+            [],
+            {},
+            {},
+            {},
+            {},
+            added_keys,
+            [] if sprint.added_issues is not None else None,
+            [],
+            sprint_report_index_signature(sprint),
+        )
+        for issue in get_all_jira_issues_from_sprint_report(sprint):
+            index.all_issues.append(issue)
+            index.by_key[issue.key] = issue
+            index.by_type.setdefault(issue.issue_type, []).append(issue)
+            index.by_status.setdefault(issue.issue_status, []).append(issue)
+            index.by_assignee.setdefault(issue.assignee, []).append(issue)
+            if issue.key in added_keys:
+                if index.added_issues is not None:
+                    index.added_issues.append(issue)
+            elif id(issue) in completed_ids:
+                index.commited_completed_issues.append(issue)
+        return index
+
+
 @dataclass
 class SprintReport:
     """
@@ -154,9 +271,12 @@ class SprintReport:
     removed_issues: Optional[list[JiraIssueSprintReport]] = None
     issues_completed_outside: Optional[list[JiraIssueSprintReport]] = None
     added_issues: Optional[dict] = None
+    index_cache: Optional[SprintReportIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @staticmethod
-    def from_dict(obj: Any) -> "SprintReport":
+    def from_dict(obj: Any, zone: tzinfo = timezone.utc) -> "SprintReport":
         """
         Captures all the relevant fields from the original JSON resonse
 
@@ -164,6 +284,8 @@ class SprintReport:
         _________
         sprint_id: int
             The given identification number given by Jira.
+        zone: tzinfo
+            Timezone of the Jira user profile, the sprint dates carry no offset.
 
         Returns
         _______
@@ -174,10 +296,10 @@ class SprintReport:
         name: str = utils.get_object_str(obj, "sprint.name")
         goal: str = utils.get_object_str(obj, "sprint.goal")
         start_date: datetime = utils.get_object_datetime_sprint_report(
-            obj, "sprint.activatedDate"
+            obj, "sprint.activatedDate", zone=zone
         )
         end_date: datetime = utils.get_object_datetime_sprint_report(
-            obj, "sprint.completeDate"
+            obj, "sprint.completeDate", zone=zone
         )
         status_types: dict = utils.get_object(obj, "contents.entityData.statuses")
         priority_types: dict = utils.get_object(obj, "contents.entityData.priorities")
@@ -250,7 +372,192 @@ class SprintReport:
         return result
 
 
-def sprint_report_from_dict(s: Any) -> SprintReport:
+@dataclass
+class SprintLookupTables:
+    """
+    The SprintLookupTables object resolves the status, priority and issue type
+    ids of the sprint report issues to their names with one dict lookup each.
+
+    ...
+    Attributes
+    __________
+    statuses: dict[str, str]
+        Status names by status id.
+    priorities: dict[str, str]
+        Priority names by priority id.
+    types: dict[str, str]
+        Issue type names by type id.
+
+    Notes
+    _____
+    The tables can be reused across the sprints of a board, every sprint passed
+    to update_from_sprint_report adds the ids it knows about.
+    """
+
+    statuses: dict[str, str] = field(default_factory=dict)
+    priorities: dict[str, str] = field(default_factory=dict)
+    types: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def from_sprint_report(sprint: SprintReport) -> "SprintLookupTables":
+        return SprintLookupTables().update_from_sprint_report(sprint)
+
+    def update_from_sprint_report(self, sprint: SprintReport) -> "SprintLookupTables":
+        """Adds the entityData names of the sprint, accepting both the raw
+        entityData dicts and the ones already cleaned by clean_issue_types"""
+        add_lookup_names(self.statuses, sprint.status_types, "statusName")
+        add_lookup_names(self.priorities, sprint.priority_types, "priorityName")
+        add_lookup_names(self.types, sprint.issue_types, "typeName")
+        return self
+
+    def resolve(self, issue: JiraIssueSprintReport) -> JiraIssueSprintReport:
+        issue.issue_status = self.statuses.get(issue.issue_status, issue.issue_status)
+        issue.issue_priority = self.priorities.get(
+            issue.issue_priority, issue.issue_priority
+        )
+        issue.issue_type = self.types.get(issue.issue_type, issue.issue_type)
+        return issue
+
+    def resolve_list(
+        self, issue_list: Optional[list[JiraIssueSprintReport]]
+    ) -> Optional[list[JiraIssueSprintReport]]:
+        if issue_list is not None:
+            for issue in issue_list:
+                self.resolve(issue)
+        return issue_list
+
+
+def add_lookup_names(table: dict[str, str], types: Optional[dict], name: str) -> None:
+    if types:
+        for type_id, data in types.items():
+            value: Optional[str] = data.get(name) if isinstance(data, dict) else data
+            if value is not None:
+                table[type_id] = value
+
+
+LAZY_ISSUE_LISTS: dict[str, str] = {
+    "completed_issues": "completedIssues",
+    "not_completed_issues": "issuesNotCompletedInCurrentSprint",
+    "removed_issues": "puntedIssues",
+    "issues_completed_outside": "issuesCompletedInAnotherSprint",
+}
+
+
+class LazyIssueList:
+    """
+    Descriptor that decodes one issue list of a LazySprintReport on first
+    access and stores it in the instance __dict__, so later reads are a dict
+    lookup. Assigning a list stores it without decoding.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.name: str = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type) -> "LazyIssueList": ...
+
+    @overload
+    def __get__(
+        self, instance: "LazySprintReport", owner: type
+    ) -> Optional[list[JiraIssueSprintReport]]: ...
+
+    def __get__(
+        self, instance: Optional["LazySprintReport"], owner: type
+    ) -> "LazyIssueList | Optional[list[JiraIssueSprintReport]]":
+        if instance is None:
+            return self
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        value: Optional[list[JiraIssueSprintReport]] = (
+            get_optional_jira_issue_sprint_report_list(instance.contents, self.path)
+        )
+        if instance.lookups is not None:
+            instance.lookups.resolve_list(value)
+        instance.__dict__[self.name] = value
+        return value
+
+    def __set__(
+        self,
+        instance: "LazySprintReport",
+        value: Optional[list[JiraIssueSprintReport]],
+    ) -> None:
+        instance.__dict__[self.name] = value
+
+
+def lazy_issue_list(name: str) -> Optional[list[JiraIssueSprintReport]]:
+    """Returns the LazyIssueList of the SprintReport field name, typed as the
+    field it replaces on LazySprintReport"""
+    return cast(
+        Optional[list[JiraIssueSprintReport]], LazyIssueList(LAZY_ISSUE_LISTS[name])
+    )
+
+
+class LazySprintReport(SprintReport):
+    """
+    A SprintReport that keeps the raw contents dict and decodes each issue list
+    (completed, not completed, removed, completed outside) only when it is first
+    read. Summary consumers such as story point totals never pay for decoding
+    the issues.
+    """
+
+    completed_issues = lazy_issue_list("completed_issues")
+    not_completed_issues = lazy_issue_list("not_completed_issues")
+    removed_issues = lazy_issue_list("removed_issues")
+    issues_completed_outside = lazy_issue_list("issues_completed_outside")
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, contents: dict, summary: SprintReport
+    ) -> None:
+        self.contents: dict = contents
+        self.lookups: Optional[SprintLookupTables] = None
+        for item in fields(SprintReport):
+            if item.name not in LAZY_ISSUE_LISTS:
+                setattr(self, item.name, getattr(summary, item.name))
+
+    @staticmethod
+    def from_dict(obj: Any, zone: tzinfo = timezone.utc) -> "LazySprintReport":
+        """
+        Decodes the sprint fields of the JSON response, in zone, and keeps its
+        contents for the issue lists.
+
+        Returns
+        _______
+        LazySprintReport object
+            A SprintReport whose issue lists are decoded on first access.
+        """
+        contents: dict = utils.get_object(obj, "contents") or {}
+        summary: SprintReport = SprintReport.from_dict(
+            {
+                **obj,
+                "contents": {
+                    key: value
+                    for key, value in contents.items()
+                    if key not in LAZY_ISSUE_LISTS.values()
+                },
+            },
+            zone,
+        )
+        return LazySprintReport(contents, summary)
+
+    def is_decoded(self, name: str) -> bool:
+        """Whether the issue list attribute has already been decoded"""
+        return name in self.__dict__
+
+    def resolve_issue_types(self, lookups: SprintLookupTables) -> None:
+        """Resolves the lists decoded so far and keeps the tables for the rest"""
+        self.lookups = lookups
+        for name in LAZY_ISSUE_LISTS:
+            if self.is_decoded(name):
+                lookups.resolve_list(getattr(self, name))
+
+
+def sprint_report_from_dict(
+    s: Any, lazy: bool = False, zone: tzinfo = timezone.utc
+) -> SprintReport:
     """
     Returns a SprintReport object
 
@@ -258,6 +565,10 @@ def sprint_report_from_dict(s: Any) -> SprintReport:
     __________
     s: Any
         JSON response from the Jira sprint report rest api.
+    lazy: bool
+        Return a LazySprintReport that decodes the issue lists on first access.
+    zone: tzinfo
+        Timezone of the Jira user profile, the sprint dates carry no offset.
 
     Returns
     _______
@@ -265,7 +576,9 @@ def sprint_report_from_dict(s: Any) -> SprintReport:
         The Python object contains the most relevant fields from the Jira
         rest api.
     """
-    return SprintReport.from_dict(s)
+    if lazy:
+        return LazySprintReport.from_dict(s, zone)
+    return SprintReport.from_dict(s, zone)
 
 
 def sprint_report_to_dict(x: SprintReport) -> dict:
@@ -327,6 +640,47 @@ def get_all_jira_issues_from_sprint_report(
     return result
 
 
+def sprint_report_index_signature(sprint: SprintReport) -> tuple:
+    """Identifies the issue lists an index was built from, so replacing or
+    resizing one of them rebuilds the index"""
+    return tuple(
+        (id(items), len(items) if items is not None else -1)
+        for items in (
+            sprint.completed_issues,
+            sprint.not_completed_issues,
+            sprint.removed_issues,
+            sprint.issues_completed_outside,
+            sprint.added_issues,
+        )
+    )
+
+
+def get_sprint_report_index(sprint: SprintReport) -> SprintReportIndex:
+    """
+    Returns the SprintReportIndex of the sprint, building it on first use.
+
+    Parameters
+    __________
+    sprint: SprintReport
+        The sprint report to index.
+
+    Returns
+    _______
+    SprintReportIndex
+        The cached index, rebuilt when the issue lists were replaced or resized.
+        Call invalidate_sprint_report_index after editing issues in place.
+    """
+    index: Optional[SprintReportIndex] = sprint.index_cache
+    if index is None or index.signature != sprint_report_index_signature(sprint):
+        index = SprintReportIndex.from_sprint_report(sprint)
+        sprint.index_cache = index
+    return index
+
+
+def invalidate_sprint_report_index(sprint: SprintReport) -> None:
+    sprint.index_cache = None
+
+
 def append_jira_issues_sprint_report(
     result: list[JiraIssueSprintReport],
     items_list: Optional[list[JiraIssueSprintReport]],
@@ -364,68 +718,70 @@ def clean_issue_types(obj: dict, name: str) -> dict:
 def set_issue_type(
     jira_issue: JiraIssueSprintReport, types: dict, name: str
 ) -> JiraIssueSprintReport:
-    access_name: str = name.split("_")[1]
-    print(f"access_name with initial split: {access_name}")
-    access_name = f"{access_name}Name"
-    print(f"access_name after concatenation: {access_name}")
+    access_name: str = f"{name.split('_')[1]}Name"
     types = clean_issue_types(types, access_name)
-    print(types)
-    for type_key, type_value in types.items():
-        if jira_issue[name] == type_key:
-            jira_issue[name] = type_value
+    jira_issue[name] = types.get(jira_issue[name], jira_issue[name])
     return jira_issue
 
 
-def update_sprint_jira_issue_types(sprint: SprintReport) -> SprintReport:
+def update_sprint_jira_issue_types(
+    sprint: SprintReport, lookups: Optional[SprintLookupTables] = None
+) -> SprintReport:
+    """
+    Replaces the status, priority and issue type ids of every issue with their
+    names.
+
+    Parameters
+    __________
+    sprint: SprintReport
+        The sprint report with the raw entityData dicts.
+    lookups: Optional[SprintLookupTables]
+        Tables shared by the sprints of a board. The sprint's names are added to
+        them, new tables are built when None.
+
+    Returns
+    _______
+    SprintReport
+        The same sprint report with resolved names.
+    """
+    lookups = (lookups or SprintLookupTables()).update_from_sprint_report(sprint)
     sprint.status_types = clean_issue_types(sprint.status_types, "statusName")
     sprint.priority_types = clean_issue_types(sprint.priority_types, "priorityName")
     sprint.issue_types = clean_issue_types(sprint.issue_types, "typeName")
-    sprint.completed_issues = update_sprint_issue_keys_with_values(
-        sprint.completed_issues, sprint
-    )
-    sprint.not_completed_issues = update_sprint_issue_keys_with_values(
-        sprint.not_completed_issues, sprint
-    )
-    sprint.removed_issues = update_sprint_issue_keys_with_values(
-        sprint.removed_issues, sprint
-    )
-    sprint.issues_completed_outside = update_sprint_issue_keys_with_values(
-        sprint.issues_completed_outside, sprint
-    )
+    if isinstance(sprint, LazySprintReport):
+        sprint.resolve_issue_types(lookups)
+    else:
+        sprint.completed_issues = lookups.resolve_list(sprint.completed_issues)
+        sprint.not_completed_issues = lookups.resolve_list(
+            sprint.not_completed_issues
+        )
+        sprint.removed_issues = lookups.resolve_list(sprint.removed_issues)
+        sprint.issues_completed_outside = lookups.resolve_list(
+            sprint.issues_completed_outside
+        )
+    invalidate_sprint_report_index(sprint)
     return sprint
 
 
 def update_issue_key_with_value(
     issue: JiraIssueSprintReport, original: dict, name: str
 ) -> str:
-    for clean_key, clean_value in original.items():
-        if issue[name] == clean_key:
-            issue[name] = clean_value
+    issue[name] = original.get(issue[name], issue[name])
     return issue[name]
 
 
 def update_sprint_issue_keys_with_values(
     issue_list: Optional[list[JiraIssueSprintReport]], original: SprintReport
 ) -> Optional[list[JiraIssueSprintReport]]:
-    if issue_list is not None:
-        for issue in issue_list:
-            issue.issue_status = update_issue_key_with_value(
-                issue, original.status_types, "issue_status"
-            )
-            issue.issue_priority = update_issue_key_with_value(
-                issue, original.priority_types, "issue_priority"
-            )
-            issue.issue_type = update_issue_key_with_value(
-                issue, original.issue_types, "issue_type"
-            )
-    return issue_list
+    return SprintLookupTables.from_sprint_report(original).resolve_list(issue_list)
 
 
 def get_active_developers(sprint: SprintReport) -> set:
-    issue_list: list[JiraIssueSprintReport] = get_all_jira_issues_from_sprint_report(
-        sprint
-    )
-    return {item.assignee for item in issue_list if item.assignee != "None"}
+    return {
+        assignee
+        for assignee in get_sprint_report_index(sprint).by_assignee
+        if assignee != "None"
+    }
 
 
 def get_added_issues(
@@ -445,14 +801,7 @@ def get_total_commited_pbis(sprint: SprintReport) -> int:
     if sprint.completed_issues is None:
         return 0
 
-    if sprint.added_issues is not None:
-        added_keys: set = set(sprint.added_issues.keys())
-        commited_issues: list[JiraIssueSprintReport] = [
-            issue for issue in sprint.completed_issues if issue["key"] not in added_keys
-        ]
-        return len(commited_issues)
-
-    return len(sprint.completed_issues)
+    return len(get_sprint_report_index(sprint).commited_completed_issues)
 
 
 def get_original_commited_issues(sprint: SprintReport) -> list[JiraIssueSprintReport]:
@@ -5,7 +5,7 @@ from typing import Any, Optional
 from utilities.utils import get_object, get_optional_datetime, get_optional_object
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TeamBoard:
     team_board_id: int
     name: str
@@ -45,7 +45,7 @@ class ListTeamBoards:
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TeamSprint:
     sprint_id: int
     name: str
@@ -53,20 +53,20 @@ class TeamSprint:
     end_date: Optional[datetime]
     origin_board_id: int
     goal: Optional[str]
+    complete_date: Optional[datetime] = None
 
     @staticmethod
     def from_dict(obj: Any) -> "TeamSprint":
         sprint_id: int = int(get_object(obj, "id"))
         name: str = get_object(obj, "name")
-        start_date: Optional[datetime] = get_optional_datetime(
-            obj, "startDate", str_len=-10
-        )
-        end_date: Optional[datetime] = get_optional_datetime(
-            obj, "endDate", str_len=-10
-        )
+        start_date: Optional[datetime] = get_optional_datetime(obj, "startDate")
+        end_date: Optional[datetime] = get_optional_datetime(obj, "endDate")
         origin_board_id: int = int(get_object(obj, "originBoardId"))
         goal: Optional[str] = get_optional_object(obj, "goal")
-        return TeamSprint(sprint_id, name, start_date, end_date, origin_board_id, goal)
+        complete_date: Optional[datetime] = get_optional_datetime(obj, "completeDate")
+        return TeamSprint(
+            sprint_id, name, start_date, end_date, origin_board_id, goal, complete_date
+        )
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -76,6 +76,7 @@ class TeamSprint:
         result["end_date"] = str(self.end_date)
         result["origin_board_id"] = self.origin_board_id
         result["goal"] = self.goal
+        result["complete_date"] = str(self.complete_date)
         return result
 
 
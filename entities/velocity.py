@@ -0,0 +1,188 @@
+"""
+VelocityTrend
+_____________
+Story point velocity, completion and scope change over consecutive closed
+sprints of a board.
+Notes
+_____
+Every metric is a NumPy array with one value per sprint, oldest sprint first.
+Completion is a percentage and NaN for sprints without committed story points.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from entities.sprint_report_api import SprintReport, get_sprint_report_index
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_import("numpy")
+
+DEFAULT_ROLLING_WINDOW: int = 3
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Returns the trailing mean over window values, averaging the available values
+    for the first sprints of the series.
+
+    Parameters
+    __________
+    values: np.ndarray
+        One value per sprint.
+    window: int
+        Number of sprints averaged, at least 1.
+    """
+    cumulative: np.ndarray = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    ends: np.ndarray = np.arange(1, len(values) + 1)
+    starts: np.ndarray = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def percentage(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Returns numerator / denominator * 100, NaN where the denominator is 0"""
+    result: np.ndarray = np.full(len(numerator), np.nan)
+    np.divide(numerator * 100.0, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def sum_estimates(issues: Optional[Sequence[Any]]) -> int:
+    return sum(issue.final_estimate or 0 for issue in issues or ())
+
+
+def to_optional_list(values: np.ndarray) -> list[Optional[float]]:
+    """Returns the array as floats, with None instead of NaN for JSON exports"""
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+@dataclass
+class VelocityTrend:
+    """
+    The VelocityTrend object captures the velocity metrics of the last closed
+    sprints of a board.
+
+    ...
+    Attributes
+    __________
+    board: str
+        The board id (rapidViewId).
+    sprint_ids: list[int]
+        The sprint ids, oldest first.
+    committed: np.ndarray
+        Committed story points per sprint.
+    delivered: np.ndarray
+        Delivered story points per sprint.
+    completion: np.ndarray
+        Delivered / committed story points in percent.
+    added_issues, removed_issues: np.ndarray
+        Number of issues added to and removed from each sprint.
+    added_points, removed_points: np.ndarray
+        Story points of the issues added to and removed from each sprint.
+    rolling_committed, rolling_delivered, rolling_completion: np.ndarray
+        Trailing averages over rolling_window sprints, the rolling completion
+        is the ratio of the rolling sums.
+    """
+
+    board: str
+    sprint_ids: list[int]
+    sprint_names: list[str]
+    end_dates: list[datetime]
+    committed: np.ndarray
+    delivered: np.ndarray
+    completion: np.ndarray
+    added_issues: np.ndarray
+    removed_issues: np.ndarray
+    added_points: np.ndarray
+    removed_points: np.ndarray
+    rolling_window: int
+    rolling_committed: np.ndarray
+    rolling_delivered: np.ndarray
+    rolling_completion: np.ndarray
+
+    @staticmethod
+    def from_sprint_reports(
+        board: str,
+        sprints: Sequence[SprintReport],
+        rolling_window: int = DEFAULT_ROLLING_WINDOW,
+    ) -> "VelocityTrend":
+        """
+        Computes the trend of the given sprint reports, which must be ordered
+        oldest first.
+
+        Returns
+        _______
+        VelocityTrend object
+            The per sprint and rolling metrics as NumPy arrays.
+        """
+        committed: np.ndarray = np.array(
+            [sprint.commited_story_points or 0 for sprint in sprints], dtype=float
+        )
+        delivered: np.ndarray = np.array(
+            [sprint.delivered_story_points or 0 for sprint in sprints], dtype=float
+        )
+        added: list[Any] = [
+            get_sprint_report_index(sprint).added_issues or [] for sprint in sprints
+        ]
+        rolling_committed: np.ndarray = rolling_mean(committed, rolling_window)
+        rolling_delivered: np.ndarray = rolling_mean(delivered, rolling_window)
+        return VelocityTrend(
+            board,
+            [sprint.sprint_id for sprint in sprints],
+            [sprint.name for sprint in sprints],
+            [sprint.end_date for sprint in sprints],
+            committed,
+            delivered,
+            percentage(delivered, committed),
+            np.array([len(issues) for issues in added], dtype=int),
+            np.array(
+                [len(sprint.removed_issues or ()) for sprint in sprints], dtype=int
+            ),
+            np.array([sum_estimates(issues) for issues in added], dtype=float),
+            np.array(
+                [sum_estimates(sprint.removed_issues) for sprint in sprints],
+                dtype=float,
+            ),
+            rolling_window,
+            rolling_committed,
+            rolling_delivered,
+            percentage(rolling_delivered, rolling_committed),
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Returns the trend with plain lists, ready for json.dumps.
+
+        Returns
+        _______
+        A dict representation of the VelocityTrend object.
+        """
+        completion: list[Optional[float]] = to_optional_list(self.completion)
+        result: dict = {}
+        result["board"] = self.board
+        result["rolling_window"] = self.rolling_window
+        result["sprints"] = [
+            {
+                "sprint_id": sprint_id,
+                "name": name,
+                "end_date": str(end_date),
+                "committed": float(self.committed[position]),
+                "delivered": float(self.delivered[position]),
+                "completion": completion[position],
+                "added_issues": int(self.added_issues[position]),
+                "removed_issues": int(self.removed_issues[position]),
+                "added_points": float(self.added_points[position]),
+                "removed_points": float(self.removed_points[position]),
+            }
+            for position, (sprint_id, name, end_date) in enumerate(
+                zip(self.sprint_ids, self.sprint_names, self.end_dates)
+            )
+        ]
+        result["rolling_committed"] = to_optional_list(self.rolling_committed)
+        result["rolling_delivered"] = to_optional_list(self.rolling_delivered)
+        result["rolling_completion"] = to_optional_list(self.rolling_completion)
+        return result
@@ -0,0 +1,253 @@
+"""
+Sprint report archives
+______________________
+Decodes directories of raw sprint report JSON dumps on a pool of processes and
+streams compact results back, optionally into the SprintStore.
+
+Notes
+_____
+Every file is read, decoded and resolved inside a worker process, which sends
+back only the summary and the store rows of the sprint, not the SprintReport.
+At most max_in_flight files are submitted at a time and results are yielded as
+they finish, so memory stays bounded by the in-flight files whatever the size
+of the archive. benchmarks/bench_archive.py measures how the throughput scales
+with the number of processes.
+
+Archives hold either raw responses of the sprint report rest api or entries of
+the sprint report cache. Files named <board>-<sprint>.json, the cache naming,
+carry their board id, other files use the board passed by the caller. When
+storing, a file left without a board is counted as failed.
+"""
+
+import contextlib
+import glob
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Iterable, Iterator, Optional
+
+from entities.sprint_report_api import (
+    LAZY_ISSUE_LISTS,
+    SPRINT_REPORT_PATHS,
+    SprintReport,
+    sprint_report_from_dict,
+    update_sprint_jira_issue_types,
+)
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.store import SprintStore, sprint_report_rows
+from utilities.json_decoding import loads
+
+DEFAULT_ARCHIVE_WORKERS: int = os.cpu_count() or 1
+ARCHIVE_FILE_PATTERN: re.Pattern = re.compile(r"^(\d+)-(\d+)\.json$")
+NO_BOARD_ERROR: str = "no board, name the file <board>-<sprint>.json or pass --board"
+ARCHIVE_PATHS: tuple[str, ...] = (
+    *SPRINT_REPORT_PATHS,
+    *(f"data.{path}" for path in SPRINT_REPORT_PATHS),
+)
+
+
+@dataclass
+class ArchivedSprintReport:
+    """
+    The ArchivedSprintReport object is the compact, picklable result of decoding
+    one archive file.
+
+    ...
+    Attributes
+    __________
+    path: str
+        The decoded file.
+    board_id: Optional[int]
+        The board of the sprint, None when neither the file name nor the caller
+        gave one.
+    sprint_id, name, state: Optional
+        The sprint fields, None when the file failed.
+    commited_story_points, delivered_story_points: Optional[float]
+        The story point sums of the sprint report.
+    issue_count: int
+        Number of issues over the four issue lists.
+    report_row, issue_rows:
+        The rows of SprintStore.save_sprint_rows, empty when board_id is None.
+    error: Optional[str]
+        Why the file could not be decoded, None on success.
+    """
+
+    path: str
+    board_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    name: Optional[str] = None
+    state: Optional[str] = None
+    commited_story_points: Optional[float] = None
+    delivered_story_points: Optional[float] = None
+    issue_count: int = 0
+    report_row: tuple = ()
+    issue_rows: list[tuple] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def archive_board_id(path: str, board: Optional[int] = None) -> Optional[int]:
+    """Returns the board id of a <board>-<sprint>.json file name, else board"""
+    match: Optional[re.Match] = ARCHIVE_FILE_PATTERN.match(os.path.basename(path))
+    return int(match.group(1)) if match else board
+
+
+def archive_files(sources: Iterable[str]) -> Iterator[str]:
+    """Yields the JSON files of every source, a file, a directory or a glob
+    pattern, lazily so huge archives are never listed up front"""
+    for source in sources:
+        if os.path.isdir(source):
+            with os.scandir(source) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if entry.is_file() and entry.name.endswith(".json"):
+                        yield entry.path
+        elif os.path.isfile(source):
+            yield source
+        else:
+            yield from sorted(glob.iglob(source))
+
+
+def decode_archive_file(path: str, board: Optional[int] = None) -> ArchivedSprintReport:
+    """
+    Decodes and resolves one archived sprint report, the task run by the
+    worker processes.
+
+    Parameters
+    __________
+    path: str
+        A raw sprint report response or a sprint report cache entry.
+    board: Optional[int]
+        The board of the sprint when the file name does not carry it.
+
+    Returns
+    _______
+    ArchivedSprintReport
+        The summary and store rows of the sprint, or the error of the file.
+    """
+    board_id: Optional[int] = archive_board_id(path, board)
+    try:
+        with open(path, "rb") as archive_file:
+            document: dict = loads(
+                archive_file.read(), ARCHIVE_PATHS, get_settings().json_decoder
+            )
+        data: dict = document.get("data", document)
+        if "sprint" not in data:
+            raise ValueError("not a sprint report response")
+        sprint: SprintReport = update_sprint_jira_issue_types(
+            sprint_report_from_dict(data, zone=get_settings().sprint_report_timezone())
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return ArchivedSprintReport(path, board_id, error=f"{type(e).__name__}: {e}")
+    result: ArchivedSprintReport = ArchivedSprintReport(
+        path,
+        board_id,
+        sprint.sprint_id,
+        sprint.name,
+        data.get("sprint", {}).get("state"),
+        sprint.commited_story_points,
+        sprint.delivered_story_points,
+        sum(len(getattr(sprint, name) or ()) for name in LAZY_ISSUE_LISTS),
+    )
+    if board_id is not None:
+        result.report_row, result.issue_rows = sprint_report_rows(board_id, sprint)
+    return result
+
+
+def decode_archive(
+    paths: Iterable[str],
+    board: Optional[int] = None,
+    workers: int = DEFAULT_ARCHIVE_WORKERS,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[ArchivedSprintReport]:
+    """
+    Decodes the archive files on a pool of processes.
+
+    Parameters
+    __________
+    paths: Iterable[str]
+        The files, consumed lazily, e.g. archive_files.
+    board: Optional[int]
+        The board of the files whose name does not carry one.
+    workers: int
+        Number of worker processes, 1 decodes in the calling process.
+    max_in_flight: Optional[int]
+        Files submitted but not yielded yet, twice the workers when None.
+
+    Returns
+    _______
+    Iterator[ArchivedSprintReport]
+        The results in completion order, not in the order of paths.
+    """
+    if workers <= 1:
+        for path in paths:
+            yield decode_archive_file(path, board)
+        return
+    limit: int = max(max_in_flight or 2 * workers, workers)
+    pending_paths: Iterator[str] = iter(paths)
+    in_flight: set[Future] = set()
+    # spawn, as forking a process that runs the client's threads can deadlock
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as executor:
+        while True:
+            for path in pending_paths:
+                in_flight.add(executor.submit(decode_archive_file, path, board))
+                if len(in_flight) >= limit:
+                    break
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def store_archive(
+    store: SprintStore, results: Iterable[ArchivedSprintReport]
+) -> Iterator[ArchivedSprintReport]:
+    """Saves the decoded sprints into the store as they arrive and passes every
+    result on, marking the sprints without a board as failed"""
+    for result in results:
+        if result.report_row:
+            store.save_sprint_rows(result.report_row, result.issue_rows)
+        elif result.error is None:
+            result.error = NO_BOARD_ERROR
+        yield result
+
+
+def report_archive(
+    sources: Iterable[str],
+    board: Optional[int] = None,
+    workers: int = DEFAULT_ARCHIVE_WORKERS,
+    store_path: Optional[str] = None,
+) -> list[ArchivedSprintReport]:
+    """Decodes the archive, into the store at store_path when set, prints a line
+    per file and the throughput, and returns the results without their rows"""
+    start: float = time.perf_counter()
+    results: Iterator[ArchivedSprintReport] = decode_archive(
+        archive_files(sources), board, workers
+    )
+    summaries: list[ArchivedSprintReport] = []
+    with contextlib.ExitStack() as stack:
+        if store_path:
+            results = store_archive(
+                stack.enter_context(SprintStore(store_path)), results
+            )
+        for result in results:
+            result.report_row, result.issue_rows = (), []
+            summaries.append(result)
+            if result.error:
+                print(f"{result.path}: {result.error}")
+            else:
+                print(
+                    f"{result.path}: sprint {result.sprint_id} {result.name}, "
+                    f"{result.issue_count} issues, "
+                    f"{result.delivered_story_points}/"
+                    f"{result.commited_story_points} points"
+                )
+    seconds: float = time.perf_counter() - start
+    failed: int = sum(1 for result in summaries if result.error)
+    print(
+        f"Decoded {len(summaries) - failed} sprint reports, {failed} failed, "
+        f"in {seconds:.2f} s ({len(summaries) / max(seconds, 1e-9):.1f} files/s)"
+    )
+    return summaries
@@ -0,0 +1,265 @@
+"""
+Batch
+_____
+Non-interactive sprint report runs for many teams described in a manifest file.
+
+Notes
+_____
+A manifest is a YAML, JSON or CSV file with one row per team report:
+
+    board, sprint, space, ancestor[, team]
+
+where sprint is either a sprint id or "latest closed".
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+
+from entities.team_info import TeamSprint
+from entities.velocity import VelocityTrend
+from jira_sprint_reporter import confluence, queries
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.velocity import fetch_velocity_trend
+from utilities.lazy_import import lazy_import, load_lazy_modules
+
+if TYPE_CHECKING:
+    import requests
+else:
+    requests = lazy_import("requests")
+
+LATEST_CLOSED: str = "latest closed"
+DEFAULT_WORKERS: int = 4
+
+
+@dataclass
+class ManifestEntry:
+    """
+    One team report requested by a manifest file.
+
+    ...
+    Attributes
+    __________
+    board: str
+        The Jira board id.
+    sprint: str
+        The sprint id or "latest closed".
+    space: str
+        The Confluence space key where the page is created.
+    ancestor: str
+        The Confluence page id the report is created under.
+    team: str
+        A label for the summary table, defaults to the board id.
+    velocity_window: int
+        Number of closed sprints of the velocity trend section, 0 leaves it out.
+    """
+
+    board: str
+    sprint: str
+    space: str
+    ancestor: str
+    team: str = ""
+    velocity_window: int = 0
+
+    @staticmethod
+    def from_dict(obj: Any) -> "ManifestEntry":
+        missing: list[str] = [
+            name
+            for name in ("board", "sprint", "space", "ancestor")
+            if not str(obj.get(name) or "").strip()
+        ]
+        if missing:
+            raise ValueError(f"Manifest row {obj} is missing {', '.join(missing)}")
+        board: str = str(obj.get("board")).strip()
+        return ManifestEntry(
+            board,
+            str(obj.get("sprint")).strip(),
+            str(obj.get("space")).strip(),
+            str(obj.get("ancestor")).strip(),
+            str(obj.get("team") or board).strip(),
+            int(obj.get("velocity_window") or 0),
+        )
+
+
+@dataclass
+class ManifestResult:
+    """The outcome of one manifest entry."""
+
+    entry: ManifestEntry
+    sprint_id: Optional[str] = None
+    status_code: Optional[int] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    action: Optional[str] = None
+
+
+def load_manifest(path: str) -> list[ManifestEntry]:
+    """
+    Reads the manifest rows from a YAML, JSON or CSV file.
+
+    Parameters
+    __________
+    path: str
+        Manifest file path, the format is chosen by its extension.
+
+    Returns
+    _______
+    list[ManifestEntry]
+        The manifest rows in file order.
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as manifest_file:
+        if extension == ".csv":
+            rows: Any = list(csv.DictReader(manifest_file))
+        elif extension == ".json":
+            rows = json.load(manifest_file)
+        elif extension in (".yaml", ".yml"):
+            try:
+                import yaml  # pylint: disable=import-outside-toplevel
+            except ImportError as err:
+                raise ImportError(
+                    "PyYAML is required for YAML manifests: pip install pyyaml"
+                ) from err
+            rows = yaml.safe_load(manifest_file)
+        else:
+            raise ValueError(f"Unsupported manifest format: {path}")
+    if isinstance(rows, dict):
+        rows = rows.get("teams", [])
+    return [ManifestEntry.from_dict(row) for row in rows]
+
+
+def resolve_sprint_id(board: str, sprint: str) -> str:
+    """Returns the sprint id, looking up the latest closed sprint of the board when
+    requested"""
+    if sprint.lower() != LATEST_CLOSED:
+        return sprint
+    sprints: list[TeamSprint] = queries.list_team_sprints(board, state="closed").sprints
+    if not sprints:
+        raise LookupError(f"Board {board} has no closed sprints")
+    latest: Optional[TeamSprint] = None
+    latest_date: Optional[datetime] = None
+    for team_sprint in sprints:
+        closed_date: Optional[datetime] = sprint_closed_date(team_sprint)
+        if closed_date and (latest_date is None or closed_date > latest_date):
+            latest, latest_date = team_sprint, closed_date
+    if latest is None:
+        return str(max(team_sprint.sprint_id for team_sprint in sprints))
+    return str(latest.sprint_id)
+
+
+def sprint_closed_date(team_sprint: TeamSprint) -> Optional[datetime]:
+    """Returns when the sprint was completed, its planned end date when Jira has no
+    completion date"""
+    return team_sprint.complete_date or team_sprint.end_date
+
+
+def run_manifest_entry(
+    creds: str, entry: ManifestEntry, upsert: bool = False
+) -> ManifestResult:
+    """Publishes the report of one entry, updating the existing page instead of
+    creating a new one with upsert"""
+    result: ManifestResult = ManifestResult(entry)
+    start: float = time.perf_counter()
+    try:
+        result.sprint_id = resolve_sprint_id(entry.board, entry.sprint)
+        velocity: Optional[VelocityTrend] = (
+            fetch_velocity_trend(entry.board, entry.velocity_window)
+            if entry.velocity_window
+            else None
+        )
+        if upsert:
+            published: confluence.PublishResult = confluence.upsert_sprint_report_page(
+                creds,
+                entry.board,
+                result.sprint_id,
+                entry.space,
+                entry.ancestor,
+                velocity=velocity,
+            )
+            result.status_code = published.status_code
+            result.action = published.action
+        else:
+            response: requests.Response = queries.create_confluence_page_with_params(
+                creds,
+                entry.board,
+                result.sprint_id,
+                entry.space,
+                entry.ancestor,
+                velocity=velocity,
+            )
+            result.status_code = response.status_code
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        result.error = f"{type(err).__name__}: {err}"
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_manifest(
+    creds: str,
+    entries: list[ManifestEntry],
+    workers: int = DEFAULT_WORKERS,
+    upsert: bool = False,
+) -> list[ManifestResult]:
+    """Creates the Confluence sprint report of every entry on a pool of worker
+    threads and returns the results in manifest order"""
+    load_lazy_modules("requests")
+    if any(entry.velocity_window for entry in entries):
+        load_lazy_modules("numpy")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda entry: run_manifest_entry(creds, entry, upsert), entries
+            )
+        )
+
+
+def format_summary(
+    results: list[ManifestResult], wall_time: Optional[float] = None
+) -> str:
+    """Returns the per team status and timing summary table"""
+    rows: list[list[str]] = [["Team", "Board", "Sprint", "Status", "Seconds"]]
+    for result in results:
+        rows.append(
+            [
+                result.entry.team,
+                result.entry.board,
+                result.sprint_id or result.entry.sprint,
+                (
+                    f"{result.status_code} {result.action or ''}".rstrip()
+                    if result.status_code is not None
+                    else f"ERROR {result.error}"
+                ),
+                f"{result.elapsed:.2f}",
+            ]
+        )
+    widths: list[int] = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines: list[str] = [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    total: float = sum(result.elapsed for result in results)
+    footer: str = f"{len(results)} reports, {total:.2f} seconds of report time"
+    if wall_time is not None:
+        footer += f", {wall_time:.2f} seconds wall clock"
+    lines.append(footer)
+    return "\n".join(lines)
+
+
+def create_sprint_reports_from_manifest(
+    path: str, workers: int = DEFAULT_WORKERS, upsert: bool = False
+) -> list[ManifestResult]:
+    creds: str = f"{get_settings().password}"
+    start: float = time.perf_counter()
+    results: list[ManifestResult] = run_manifest(
+        creds, load_manifest(path), workers, upsert
+    )
+    print(format_summary(results, time.perf_counter() - start))
+    return results
@@ -0,0 +1,311 @@
+"""
+ApiClient
+_________
+A single pooled, keep-alive HTTP client shared by every Jira and Confluence call.
+
+Notes
+_____
+Every request made through the same ApiClient reuses the TLS connections kept in
+its requests.Session pool, so consecutive board lookups, sprint listings, sprint
+reports and page publishes only pay the handshake once per host. Requests go
+through the client's RetryPolicy and shared RateLimiter, see request_policy.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from jira_sprint_reporter.request_policy import (
+    RateLimiter,
+    RetryPolicy,
+    default_rate_limiter,
+)
+from jira_sprint_reporter.settings import Settings, get_settings
+from jira_sprint_reporter.tracing import (
+    HttpRecord,
+    Tracer,
+    get_tracer,
+    url_template,
+)
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+    import requests.adapters
+else:
+    requests = lazy_import("requests")
+
+JIRA_BASE_URL: str = "https://jira.amer.thermo.com"
+CONFLUENCE_BASE_URL: str = "https://confluence.amer.thermo.com"
+
+DEFAULT_POOL_CONNECTIONS: int = 10
+DEFAULT_POOL_MAXSIZE: int = 20
+
+
+def basic_authorization(credentials: str) -> str:
+    """Returns the Authorization header value for credentials built with
+    utilities.utils.encode_login_credentials"""
+    return f"Basic {credentials}"
+
+
+class ApiClient:
+    """
+    The ApiClient object owns the pooled requests.Session used for all the Jira
+    and Confluence rest api calls.
+
+    ...
+    Attributes
+    __________
+    session: requests.Session
+        The keep-alive session whose connection pools are shared across calls.
+    headers: dict
+        Default headers sent with every request. None values are never sent.
+    timeout: Optional[float]
+        Default timeout in seconds for every request.
+    retry_policy: RetryPolicy
+        Decides which failed requests are sent again.
+    rate_limiter: RateLimiter
+        Per host token buckets, shared by the threads using the client.
+    base_urls: dict[str, str]
+        Replacement base urls by production base url, e.g. a local stand-in
+        server.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict] = None,
+        bearer_token: Optional[str] = None,
+        basic_credentials: Optional[str] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        base_urls: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Parameters
+        __________
+        headers: Optional[dict]
+            Extra default headers, e.g. the Cookie header.
+        bearer_token: Optional[str]
+            Authorization header value, sent unchanged, e.g. "Bearer <token>".
+        basic_credentials: Optional[str]
+            Credentials built with encode_login_credentials. They take precedence
+            over the bearer token.
+        pool_connections: int
+            Number of host pools kept alive by the session.
+        pool_maxsize: int
+            Maximum number of connections kept alive per host, should be at least
+            the number of worker threads sharing the client.
+        timeout: Optional[float]
+            Default timeout in seconds for every request.
+        retry_policy: Optional[RetryPolicy]
+            Retry rules, RetryPolicy() when None.
+        rate_limiter: Optional[RateLimiter]
+            Per host limits, the Jira and Confluence defaults when None.
+        sleep: Callable[[float], None]
+            Waits between the attempts of a request.
+        base_urls: Optional[dict[str, str]]
+            Sends the requests for JIRA_BASE_URL or CONFLUENCE_BASE_URL to
+            another server, e.g. {JIRA_BASE_URL: "http://127.0.0.1:8080"}.
+            Rate limits and traces keep the production url.
+        """
+        self.headers: dict = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        if basic_credentials:
+            self.headers["Authorization"] = basic_authorization(basic_credentials)
+        elif bearer_token:
+            self.headers["Authorization"] = bearer_token
+        if headers:
+            self.headers.update(headers)
+        self.timeout: Optional[float] = timeout
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.rate_limiter: RateLimiter = rate_limiter or default_rate_limiter(
+            JIRA_BASE_URL, CONFLUENCE_BASE_URL
+        )
+        self.sleep: Callable[[float], None] = sleep
+        self.base_urls: dict[str, str] = {
+            base_url: replacement.rstrip("/")
+            for base_url, replacement in (base_urls or {}).items()
+        }
+        self.session: requests.Session = requests.Session()
+        adapter: requests.adapters.HTTPAdapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def build_headers(
+        self,
+        headers: Optional[dict] = None,
+        basic_credentials: Optional[str] = None,
+        encode: bool = False,
+    ) -> dict:
+        """Merges the default headers with the per call ones, dropping None values
+        and optionally encoding the values as utf-8 bytes"""
+        result: dict = dict(self.headers)
+        if basic_credentials:
+            result["Authorization"] = basic_authorization(basic_credentials)
+        if headers:
+            result.update(headers)
+        result = {k: v for k, v in result.items() if v is not None}
+        if encode:
+            result = {
+                k: v.encode("utf-8") if isinstance(v, str) else v
+                for k, v in result.items()
+            }
+        return result
+
+    def resolve_url(self, url: str) -> str:
+        """Returns the url with its base url replaced following base_urls"""
+        for base_url, replacement in self.base_urls.items():
+            if url.startswith(base_url):
+                return replacement + url[len(base_url) :]
+        return url
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        basic_credentials: Optional[str] = None,
+        encode_headers: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Sends a request through the pooled session and returns the
+        requests.Response. Failed attempts are retried following retry_policy,
+        except for streamed bodies, which cannot be sent twice."""
+        kwargs.setdefault("timeout", self.timeout)
+        request_headers: dict = self.build_headers(
+            headers, basic_credentials, encode_headers
+        )
+        replayable: bool = not isinstance(kwargs.get("data"), Iterator)
+        target_url: str = self.resolve_url(url)
+        attempt: int = 1
+        while True:
+            self.rate_limiter.acquire(url)
+            start: float = time.perf_counter()
+            try:
+                response: requests.Response = self.session.request(
+                    method, target_url, headers=request_headers, **kwargs
+                )
+            except requests.RequestException as err:
+                self.trace(method, url, start, attempt, error=err)
+                delay: Optional[float] = (
+                    self.retry_policy.retry_delay(method, attempt, error=err)
+                    if replayable
+                    else None
+                )
+                if delay is None:
+                    raise
+            else:
+                self.trace(
+                    method, url, start, attempt, response, bool(kwargs.get("stream"))
+                )
+                delay = (
+                    self.retry_policy.retry_delay(method, attempt, response=response)
+                    if replayable
+                    else None
+                )
+                if delay is None:
+                    return response
+                response.close()
+            self.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def trace(
+        method: str,
+        url: str,
+        start: float,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        stream: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Records one attempt on the shared tracer. The response size is only
+        read when the body was downloaded already."""
+        tracer: Tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        tracer.record_http(
+            HttpRecord(
+                method,
+                url_template(url),
+                response.status_code if response is not None else None,
+                len(response.content) if response is not None and not stream else 0,
+                time.perf_counter() - start,
+                attempt,
+                type(error).__name__ if error is not None else None,
+            )
+        )
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+_default_client: Optional[ApiClient] = None
+_default_client_lock: threading.Lock = threading.Lock()
+
+
+def client_from_environment() -> ApiClient:
+    """Builds an ApiClient with the BEARER_TOKEN and COOKIE settings, sending the
+    requests to JIRA_URL and CONFLUENCE_URL when set"""
+    settings: Settings = get_settings()
+    base_urls: dict[str, str] = {
+        base_url: replacement
+        for base_url, replacement in (
+            (JIRA_BASE_URL, settings.jira_url),
+            (CONFLUENCE_BASE_URL, settings.confluence_url),
+        )
+        if replacement
+    }
+    return ApiClient(
+        headers={"Cookie": settings.cookie},
+        bearer_token=settings.bearer_token,
+        base_urls=base_urls,
+    )
+
+
+def get_client() -> ApiClient:
+    """Returns the ApiClient shared by every Jira and Confluence call, creating
+    it on first use"""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = client_from_environment()
+    return _default_client
+
+
+def set_client(client: Optional[ApiClient]) -> None:
+    """Replaces the shared ApiClient, closing the previous one. Passing None makes
+    the next get_client call build a new one from the environment"""
+    global _default_client
+    with _default_client_lock:
+        previous: Optional[ApiClient] = _default_client
+        _default_client = client
+    if previous is not None and previous is not client:
+        previous.close()
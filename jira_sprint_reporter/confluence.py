@@ -0,0 +1,228 @@
+"""
+Confluence
+__________
+Publishes the sprint report pages in upsert mode: an existing page with the same
+title in the space is updated instead of creating a duplicate, which Confluence
+rejects, and unchanged pages are not uploaded at all.
+
+Notes
+_____
+The SHA-256 of the rendered storage value is kept in the content property
+CONTENT_HASH_PROPERTY of the page. A refresh renders the page, compares the hash
+and only PUTs a new version when it differs, so nightly runs leave no version
+history noise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from jira_sprint_reporter import queries
+from jira_sprint_reporter.client import CONFLUENCE_BASE_URL, get_client
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.tracing import stage, traced
+from utilities.json_decoding import decode_response
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+
+    from entities.velocity import VelocityTrend
+else:
+    requests = lazy_import("requests")
+
+CONTENT_HASH_PROPERTY: str = "sprint-report-content-hash"
+CREATED: str = "created"
+UPDATED: str = "updated"
+UNCHANGED: str = "unchanged"
+
+
+def storage_hash(content_chunks: Iterable[str]) -> str:
+    """Returns the SHA-256 hex digest of the storage value made of the chunks"""
+    digest = hashlib.sha256()
+    for chunk in content_chunks:
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class ConfluencePage:
+    """
+    The version information of an existing Confluence page.
+
+    ...
+    Attributes
+    __________
+    page_id: str
+        The Confluence content id.
+    version: int
+        The current page version number.
+    content_hash: Optional[str]
+        The stored storage_hash, None when the page was not published by upsert.
+    hash_version: Optional[int]
+        The version number of the content hash property.
+    """
+
+    page_id: str
+    version: int
+    content_hash: Optional[str] = None
+    hash_version: Optional[int] = None
+
+    @staticmethod
+    def from_dict(obj: Any) -> "ConfluencePage":
+        content_hash: dict = (
+            (obj.get("metadata") or {}).get("properties") or {}
+        ).get(CONTENT_HASH_PROPERTY) or {}
+        return ConfluencePage(
+            str(obj["id"]),
+            int(obj["version"]["number"]),
+            content_hash.get("value"),
+            (content_hash.get("version") or {}).get("number"),
+        )
+
+
+@dataclass
+class PublishResult:
+    """The outcome of publishing one page: created, updated or unchanged."""
+
+    action: str
+    status_code: int
+    page_id: Optional[str] = None
+
+
+def raise_for_status(response: requests.Response, action: str) -> None:
+    if response.status_code != 200:
+        raise requests.HTTPError(
+            f"HTTP code: {response.status_code} when {action}", response=response
+        )
+
+
+@traced("confluence lookup")
+def find_confluence_page(
+    creds: str, title: str, space: str
+) -> Optional[ConfluencePage]:
+    """Returns the current page with the title in the space, or None when there
+    is none. Titles are unique within a space, whatever the parent page."""
+    response: requests.Response = get_client().get(
+        f"{CONFLUENCE_BASE_URL}/rest/api/content",
+        basic_credentials=creds,
+        params={
+            "title": title,
+            "spaceKey": space,
+            "type": "page",
+            "status": "current",
+            "expand": f"version,metadata.properties.{CONTENT_HASH_PROPERTY}",
+        },
+    )
+    raise_for_status(response, f"looking up the page {title}")
+    found: dict = decode_response(response, decoder=get_settings().json_decoder)
+    pages: list = found.get("results") or []
+    return ConfluencePage.from_dict(pages[0]) if pages else None
+
+
+def save_content_hash(creds: str, page: ConfluencePage, content_hash: str) -> None:
+    """Stores the content hash property of the page, raising requests.HTTPError
+    when it is not saved so the next run does not skip a stale hash silently"""
+    base_url: str = (
+        f"{CONFLUENCE_BASE_URL}/rest/api/content/{page.page_id}/property"
+    )
+    response: requests.Response
+    if page.hash_version is None:
+        response = get_client().post(
+            base_url,
+            basic_credentials=creds,
+            json={"key": CONTENT_HASH_PROPERTY, "value": content_hash},
+        )
+    else:
+        response = get_client().put(
+            f"{base_url}/{CONTENT_HASH_PROPERTY}",
+            basic_credentials=creds,
+            json={
+                "key": CONTENT_HASH_PROPERTY,
+                "value": content_hash,
+                "version": {"number": page.hash_version + 1},
+            },
+        )
+    raise_for_status(response, f"saving the content hash of page {page.page_id}")
+
+
+def upsert_confluence_page(
+    creds: str,
+    title: str,
+    space: str,
+    ancestor: str,
+    content_chunks: Iterable[str],
+    stream: bool = False,
+) -> PublishResult:
+    """
+    Creates the page, or updates the existing one when its content changed.
+    A failed request raises requests.HTTPError.
+
+    Parameters
+    __________
+    creds: str
+        Confluence basic credentials.
+    title, space, ancestor: str
+        The page title, space key and parent page id.
+    content_chunks: Iterable[str]
+        The storage value in fragments, rendered once.
+    stream: bool
+        Send the request body with chunked transfer encoding.
+
+    Returns
+    _______
+    PublishResult
+        The action taken and the status code of the last request.
+    """
+    with stage("sprint_report_template"):
+        chunks: list[str] = list(content_chunks)
+    content_hash: str = storage_hash(chunks)
+    page: Optional[ConfluencePage] = find_confluence_page(creds, title, space)
+    if page is not None and page.content_hash == content_hash:
+        return PublishResult(UNCHANGED, 200, page.page_id)
+
+    page_data: dict = queries.confluence_page_data(title, space, ancestor)
+    if page is None:
+        page_data["metadata"]["properties"][CONTENT_HASH_PROPERTY] = {
+            "value": content_hash
+        }
+    else:
+        page_data["id"] = page.page_id
+        page_data["version"] = {"number": page.version + 1}
+    body: Iterator[bytes] = queries.iter_confluence_page_body(page_data, chunks)
+    data: Any = body if stream else b"".join(body)
+    base_url: str = f"{CONFLUENCE_BASE_URL}/rest/api/content"
+    if page is None:
+        with stage("confluence publish"):
+            response: requests.Response = get_client().post(
+                base_url, basic_credentials=creds, data=data
+            )
+        raise_for_status(response, f"creating the page {title}")
+        created: dict = decode_response(response, decoder=get_settings().json_decoder)
+        return PublishResult(CREATED, response.status_code, str(created.get("id")))
+
+    with stage("confluence publish"):
+        response = get_client().put(
+            f"{base_url}/{page.page_id}", basic_credentials=creds, data=data
+        )
+    raise_for_status(response, f"updating page {page.page_id}")
+    save_content_hash(creds, page, content_hash)
+    return PublishResult(UPDATED, response.status_code, page.page_id)
+
+
+def upsert_sprint_report_page(
+    creds: str,
+    board: str,
+    sprint: str,
+    space: str,
+    ancestor: str,
+    stream: bool = False,
+    velocity: Optional[VelocityTrend] = None,
+) -> PublishResult:
+    """Upsert mode of queries.create_confluence_page_with_params"""
+    title, content_chunks = queries.render_sprint_report_page(board, sprint, velocity)
+    return upsert_confluence_page(
+        creds, title, space, ancestor, content_chunks, stream
+    )
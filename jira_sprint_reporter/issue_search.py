@@ -0,0 +1,165 @@
+"""
+IssueSearch
+___________
+Bulk Jira issue lookups through the JQL search rest api, used to enrich the
+issues of a sprint report with the fields the report itself does not carry
+(components, labels and fix versions).
+
+Notes
+_____
+The keys are searched in chunks of DEFAULT_SEARCH_CHUNK_SIZE with
+"key in (...)", asking only for the fields JiraIssue.from_dict reads, so a 200
+issue sprint takes a handful of requests instead of one GET per key. The chunks
+are fetched concurrently. Keys that no longer exist are left out of the results.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence
+
+from entities.jira_issue import JIRA_ISSUE_PATHS, JiraIssue, jira_issue_from_dict
+from entities.sprint_report_api import (
+    JiraIssueSprintReport,
+    SprintReport,
+    get_all_jira_issues_from_sprint_report,
+)
+from jira_sprint_reporter.client import JIRA_BASE_URL, get_client
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.tracing import traced
+from utilities.json_decoding import decode_response, projection_params
+from utilities.lazy_import import lazy_import, load_lazy_modules
+
+if TYPE_CHECKING:
+    import requests
+else:
+    requests = lazy_import("requests")
+
+DEFAULT_SEARCH_CHUNK_SIZE: int = 100
+DEFAULT_SEARCH_WORKERS: int = 4
+JIRA_SEARCH_PROJECTION: dict[str, str] = projection_params(JIRA_ISSUE_PATHS)
+JIRA_SEARCH_PATHS: tuple[str, ...] = (
+    "startAt",
+    "maxResults",
+    "total",
+    *(f"issues.{path}" for path in JIRA_ISSUE_PATHS),
+)
+"""The paths of the search response read by search_issue_chunk"""
+
+
+def jql_key_list(keys: Sequence[str]) -> str:
+    return f"key in ({','.join(keys)})"
+
+
+def search_issue_chunk(keys: Sequence[str]) -> list[JiraIssue]:
+    """Returns the issues of up to one chunk of keys, following the result
+    pages when the server caps maxResults below the chunk size"""
+    issues: list[JiraIssue] = []
+    while True:
+        response: requests.Response = get_client().get(
+            f"{JIRA_BASE_URL}/rest/api/2/search",
+            params={
+                "jql": jql_key_list(keys),
+                **JIRA_SEARCH_PROJECTION,
+                "startAt": len(issues),
+                "maxResults": len(keys),
+                "validateQuery": "warn",
+            },
+        )
+        if response.status_code != 200:
+            raise requests.HTTPError(
+                f"HTTP code: {response.status_code}", response=response
+            )
+        page: dict = decode_response(
+            response, JIRA_SEARCH_PATHS, get_settings().json_decoder
+        )
+        values: list = page.get("issues") or []
+        issues.extend(jira_issue_from_dict(value) for value in values)
+        if not values or len(issues) >= (page.get("total") or 0):
+            return issues
+
+
+def chunked(keys: Sequence[str], chunk_size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(keys), chunk_size):
+        yield keys[start : start + chunk_size]
+
+
+@traced("issue search")
+def search_jira_issues(
+    keys: Iterable[str],
+    chunk_size: int = DEFAULT_SEARCH_CHUNK_SIZE,
+    max_workers: int = DEFAULT_SEARCH_WORKERS,
+) -> dict[str, JiraIssue]:
+    """
+    Returns the Jira issues of the keys, looked up with JQL searches.
+
+    Parameters
+    __________
+    keys: Iterable[str]
+        Issue keys, duplicates are searched once.
+    chunk_size: int
+        Number of keys per search request.
+    max_workers: int
+        Number of chunks searched concurrently.
+
+    Returns
+    _______
+    dict[str, JiraIssue]
+        The issues by key, missing keys are left out.
+    """
+    unique_keys: list[str] = list(dict.fromkeys(keys))
+    issues: dict[str, JiraIssue] = {}
+    if not unique_keys:
+        return issues
+    load_lazy_modules("requests")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_issues in executor.map(
+            search_issue_chunk, chunked(unique_keys, chunk_size)
+        ):
+            issues.update((issue.key, issue) for issue in chunk_issues)
+    return issues
+
+
+def enrich_sprint_report(
+    sprint: SprintReport,
+    chunk_size: int = DEFAULT_SEARCH_CHUNK_SIZE,
+    max_workers: int = DEFAULT_SEARCH_WORKERS,
+    issues: Optional[dict[str, JiraIssue]] = None,
+) -> SprintReport:
+    """
+    Adds the components, labels and fix versions of every issue of the sprint
+    report, see search_jira_issues.
+
+    Parameters
+    __________
+    sprint: SprintReport
+        The sprint report to enrich in place.
+    chunk_size, max_workers: int
+        See search_jira_issues.
+    issues: Optional[dict[str, JiraIssue]]
+        Issues already looked up, e.g. for several sprints of a board, the
+        missing keys are searched and added to it.
+
+    Returns
+    _______
+    SprintReport
+        The same sprint report.
+    """
+    issues = issues if issues is not None else {}
+    sprint_issues: list[JiraIssueSprintReport] = (
+        get_all_jira_issues_from_sprint_report(sprint)
+    )
+    issues.update(
+        search_jira_issues(
+            (issue.key for issue in sprint_issues if issue.key not in issues),
+            chunk_size,
+            max_workers,
+        )
+    )
+    for sprint_issue in sprint_issues:
+        jira_issue: Optional[JiraIssue] = issues.get(sprint_issue.key)
+        if jira_issue is not None:
+            sprint_issue.components = jira_issue.components
+            sprint_issue.labels = jira_issue.labels
+            sprint_issue.fix_versions = jira_issue.fix_version
+    return sprint
@@ -0,0 +1,98 @@
+"""
+Pagination
+__________
+Paginated access to the Jira agile rest api listings (boards, sprints).
+
+Notes
+_____
+The agile api answers with pages shaped as
+{"maxResults": 50, "startAt": 0, "total": 201, "isLast": false, "values": [...]}.
+When the first page reports a total, the remaining offsets are fetched
+concurrently; otherwise pages are walked one at a time until isLast.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+from jira_sprint_reporter.client import get_client
+from jira_sprint_reporter.settings import get_settings
+from utilities.json_decoding import decode_response
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+else:
+    requests = lazy_import("requests")
+
+DEFAULT_PAGE_SIZE: int = 50
+DEFAULT_PAGE_WORKERS: int = 4
+
+
+def fetch_agile_page(url: str, params: dict) -> dict:
+    """Returns one page of an agile listing, raising requests.HTTPError when Jira
+    does not answer with a 200"""
+    response: requests.Response = get_client().get(
+        url, params=params, encode_headers=True
+    )
+    if response.status_code != 200:
+        raise requests.HTTPError(
+            f"HTTP code: {response.status_code}", response=response
+        )
+    return decode_response(response, decoder=get_settings().json_decoder)
+
+
+def iter_agile_pages(
+    url: str,
+    params: Optional[dict] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+) -> Iterator[Any]:
+    """
+    Yields every value of an agile listing in server order.
+
+    Parameters
+    __________
+    url: str
+        Listing endpoint without query string, e.g. .../rest/agile/latest/board
+    params: Optional[dict]
+        Server side filters such as {"name": "qppi"} or {"state": "closed"}.
+    page_size: int
+        Requested maxResults, the server may cap it.
+    max_workers: int
+        Number of pages fetched concurrently when the total is known.
+    """
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    first_page: dict = fetch_agile_page(
+        url, {**params, "startAt": 0, "maxResults": page_size}
+    )
+    values: list = first_page.get("values") or []
+    yield from values
+    if first_page.get("isLast", True) or not values:
+        return
+
+    step: int = first_page.get("maxResults") or len(values)
+    total: Optional[int] = first_page.get("total")
+    if total is not None:
+        offsets: range = range(len(values), total, step)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page in executor.map(
+                lambda offset: fetch_agile_page(
+                    url, {**params, "startAt": offset, "maxResults": step}
+                ),
+                offsets,
+            ):
+                yield from page.get("values") or []
+        return
+
+    start_at: int = len(values)
+    while True:
+        page = fetch_agile_page(
+            url, {**params, "startAt": start_at, "maxResults": step}
+        )
+        values = page.get("values") or []
+        yield from values
+        if page.get("isLast", True) or not values:
+            return
+        start_at += len(values)
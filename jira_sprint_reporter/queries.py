@@ -1,11 +1,10 @@
+from __future__ import annotations
+
 import json
-import os
 import sys
+from dataclasses import dataclass
 from getpass import getpass
-from typing import Tuple
-
-import requests
-from dotenv import dotenv_values, load_dotenv
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Tuple
 
 import entities.jira_issue
 from entities.sprint_report_api import (
@@ -18,41 +17,127 @@ from entities.team_info import (
     ListTeamSprints,
     TeamBoard,
     TeamSprint,
-    team_board_list_from_dict,
-    team_sprint_list_from_dict,
+    team_board_from_dict,
+    team_sprint_from_dict,
+)
+from jira_sprint_reporter.client import (
+    CONFLUENCE_BASE_URL,
+    JIRA_BASE_URL,
+    get_client,
+)
+from jira_sprint_reporter.pagination import fetch_agile_page, iter_agile_pages
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.sprint_report_queries import fetch_sprint_report_json
+from jira_sprint_reporter.tracing import stage, traced
+from templates.sprint_report_template import (
+    iter_sprint_report_template,
+    sprint_report_template,
 )
-from templates.sprint_report_template import sprint_report_template
+from utilities.json_decoding import decode_response, projection_params
+from utilities.lazy_import import lazy_import, load_lazy_modules
 from utilities.utils import encode_login_credentials
 
-config = dotenv_values("../.env")
-load_dotenv()
+if TYPE_CHECKING:
+    import asyncio
+
+    import requests
+
+    from entities.velocity import VelocityTrend
+else:
+    asyncio = lazy_import("asyncio")
+    requests = lazy_import("requests")
+
 
-# headers: dict = {"Authorikzation": os.environ.get("PASSWORD")}
-headers_data: dict = {
-    "Accept": "application/json",
-    "Content-Type": "application/json",
-    "Authorization": os.environ.get("BEARER_TOKEN"),
-    "Cookie": os.environ.get("COOKIE"),
-}
+DEFAULT_MAX_IN_FLIGHT: int = 8
 
 
-def query_jira_issue(key: str) -> requests.Response:
+def query_jira_issue(
+    key: str,
+    paths: Optional[Iterable[str]] = entities.jira_issue.JIRA_ISSUE_PATHS,
+) -> requests.Response:
     """Gets issue information from Jira and returns it as a
-    requests.Response or requests.exceptions.ConnectionError"""
-    base_url: str = "https://jira.amer.thermo.com/rest/api/2/issue/"
-    headers = headers_data
+    requests.Response or requests.exceptions.ConnectionError. Only the fields
+    and expansions read by the paths are requested, None returns the full
+    issue."""
+    base_url: str = f"{JIRA_BASE_URL}/rest/api/2/issue/"
     # headers: dict = {"Authorikzation": os.environ.get("PASSWORD")}
 
-    return requests.request("GET", base_url + key, headers=headers)
+    return get_client().get(
+        base_url + key,
+        params=projection_params(paths) if paths is not None else None,
+    )
 
 
 def query_jira_issue_to_jira_issue_type(key: str) -> entities.jira_issue.JiraIssue:
     api_response: requests.Response = query_jira_issue(key)
-    json_data = api_response.json()
+    json_data = decode_response(
+        api_response, entities.jira_issue.JIRA_ISSUE_PATHS, get_settings().json_decoder
+    )
     data_to_show = entities.jira_issue.jira_issue_from_dict(json_data)
     return data_to_show
 
 
+@dataclass
+class JiraIssueResult:
+    """
+    The outcome of fetching one key within a bulk Jira issue query.
+
+    ...
+    Attributes
+    __________
+    key: str
+        The requested issue key.
+    issue: Optional[JiraIssue]
+        The decoded issue, None when the key could not be fetched.
+    error: Optional[str]
+        The reason the key could not be fetched, None on success.
+    """
+
+    key: str
+    issue: Optional[entities.jira_issue.JiraIssue] = None
+    error: Optional[str] = None
+
+
+async def query_jira_issues_async(
+    keys: Sequence[str], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+) -> list[JiraIssueResult]:
+    """Fetches the given issue keys concurrently, with at most max_in_flight
+    requests at a time, and returns one JiraIssueResult per key in input order.
+    A failing key is reported in its result instead of aborting the batch."""
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def fetch(key: str) -> JiraIssueResult:
+        async with semaphore:
+            try:
+                api_response: requests.Response = await asyncio.to_thread(
+                    query_jira_issue, key
+                )
+                if api_response.status_code != 200:
+                    return JiraIssueResult(
+                        key, error=f"HTTP code: {api_response.status_code}"
+                    )
+                json_data: dict = decode_response(
+                    api_response,
+                    entities.jira_issue.JIRA_ISSUE_PATHS,
+                    get_settings().json_decoder,
+                )
+                return JiraIssueResult(
+                    key, entities.jira_issue.jira_issue_from_dict(json_data)
+                )
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                return JiraIssueResult(key, error=f"{type(err).__name__}: {err}")
+
+    return list(await asyncio.gather(*(fetch(key) for key in keys)))
+
+
+def query_jira_issues(
+    keys: Sequence[str], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+) -> list[JiraIssueResult]:
+    """Synchronous entry point for query_jira_issues_async"""
+    load_lazy_modules("requests")
+    return asyncio.run(query_jira_issues_async(keys, max_in_flight))
+
+
 def query_jira_issue_to_dict_or_json(key: str) -> dict:
     jira_issue_data: entities.jira_issue.JiraIssue = (
         query_jira_issue_to_jira_issue_type(key)
@@ -64,55 +149,35 @@ def query_jira_issue_to_dict_or_json(key: str) -> dict:
 def create_confluence_page(ancestor: str, board: str) -> requests.Response:
     with open("../tests/json_files/sprint-36928.json", encoding="utf-8") as json_file:
         data = json.load(json_file)
-        sprint_data: SprintReport = sprint_report_from_dict(data)
+        sprint_data: SprintReport = sprint_report_from_dict(
+            data, zone=get_settings().sprint_report_timezone()
+        )
         sprint_data = update_sprint_jira_issue_types(sprint_data)
-        base_url: str = "https://confluence.amer.thermo.com/rest/api/content"
+        base_url: str = f"{CONFLUENCE_BASE_URL}/rest/api/content"
         # headers: dict = {
         #     "Accept": "application/json",
         #     "Authorization": os.environ.get("PASSWORD"),
         #     "Content-Type": "application/json",
         # }
-        headers = headers_data
         content_value: str = sprint_report_template(sprint_data, board)
-        data: dict = {
-            "title": f"{sprint_data.name} Sprint Report – Generated via Python Script",
-            "type": "page",
-            "space": {"key": "FIREGENE"},
-            "status": "current",
-            "ancestors": [{"id": ancestor}],
-            "body": {
-                "storage": {
-                    "value": content_value,
-                    "representation": "storage",
-                }
-            },
-            "metadata": {"properties": {"editor": {"value": "v2"}}},
-        }
-
-        # return requests.request("POST", base_url, headers=headers, json=data)
-        return requests.post(base_url, headers=headers, json=data)
+        data: dict = confluence_page_data(
+            f"{sprint_data.name} Sprint Report – Generated via Python Script",
+            "FIREGENE",
+            ancestor,
+            content_value,
+        )
 
+        return get_client().post(base_url, json=data)
 
-def create_confluence_page_with_params(
-    creds: str, board: str, sprint: str, space: str, ancestor: str
-) -> requests.Response:
-    base_url: str = (
-        f"https://jira.amer.thermo.com/rest/greenhopper/latest/rapid/charts/sprintreport?rapidViewId={board}&sprintId={sprint}"
-    )
-    sprint_data_response: requests.Response = make_api_request(creds, base_url, "GET")
-    # sprint_data_response: requests.Response = make_api_request_bearer(base_url, "GET")
-    sprint_data: SprintReport = sprint_report_from_dict(sprint_data_response.json())
-    sprint_data = update_sprint_jira_issue_types(sprint_data)
-    base_url: str = "https://confluence.amer.thermo.com/rest/api/content"
-    headers: dict = {
-        "Accept": "application/json",
-        "Authorization": f"Basic {creds}",
-        "Content-Type": "application/json",
-    }
-    # headers = headers_data
-    content_value: str = sprint_report_template(sprint_data, board)
-    data: dict = {
-        "title": f"{sprint_data.name} Sprint Report – Generated via Python Script",
+
+STORAGE_VALUE_PLACEHOLDER: str = "__sprint_report_storage_value__"
+
+
+def confluence_page_data(
+    title: str, space: str, ancestor: str, content_value: str = ""
+) -> dict:
+    return {
+        "title": title,
         "type": "page",
         "space": {"key": space},
         "status": "current",
@@ -126,8 +191,66 @@ def create_confluence_page_with_params(
         "metadata": {"properties": {"editor": {"value": "v2"}}},
     }
 
-    # return requests.request("POST", base_url, headers=headers, json=data)
-    return requests.post(base_url, headers=headers, json=data)
+
+def iter_confluence_page_body(
+    page_data: dict, content_chunks: Iterable[str]
+) -> Iterator[bytes]:
+    """Yields the JSON request body of a Confluence page with the storage value
+    written chunk by chunk, so the rendered page never has to be held as one
+    string"""
+    page_data = dict(page_data)
+    page_data["body"] = {
+        "storage": {"value": STORAGE_VALUE_PLACEHOLDER, "representation": "storage"}
+    }
+    prefix, suffix = json.dumps(page_data).split(json.dumps(STORAGE_VALUE_PLACEHOLDER))
+    yield f'{prefix}"'.encode("utf-8")
+    for chunk in content_chunks:
+        if chunk:
+            yield json.dumps(chunk)[1:-1].encode("utf-8")
+    yield f'"{suffix}'.encode("utf-8")
+
+
+def render_sprint_report_page(
+    board: str, sprint: str, velocity: Optional[VelocityTrend] = None
+) -> Tuple[str, Iterator[str]]:
+    """Returns the page title and the fragments of the sprint report page"""
+    sprint_data: SprintReport = sprint_report_from_dict(
+        fetch_sprint_report_json(board, sprint),
+        zone=get_settings().sprint_report_timezone(),
+    )
+    with stage("update_sprint_jira_issue_types"):
+        sprint_data = update_sprint_jira_issue_types(sprint_data)
+    return (
+        f"{sprint_data.name} Sprint Report – Generated via Python Script",
+        iter_sprint_report_template(sprint_data, board, velocity),
+    )
+
+
+def create_confluence_page_with_params(
+    creds: str,
+    board: str,
+    sprint: str,
+    space: str,
+    ancestor: str,
+    stream: bool = False,
+    velocity: Optional[VelocityTrend] = None,
+) -> requests.Response:
+    """Creates the sprint report page. With stream the body is sent with chunked
+    transfer encoding while the page is rendered. A velocity trend adds its
+    section to the page. See confluence.upsert_sprint_report_page to update an
+    existing page instead."""
+    title, content_chunks = render_sprint_report_page(board, sprint, velocity)
+    base_url: str = f"{CONFLUENCE_BASE_URL}/rest/api/content"
+    body: Iterator[bytes] = iter_confluence_page_body(
+        confluence_page_data(title, space, ancestor), content_chunks
+    )
+    if not stream:
+        with stage("sprint_report_template"):
+            data: bytes = b"".join(body)
+        with stage("confluence publish"):
+            return get_client().post(base_url, basic_credentials=creds, data=data)
+    with stage("sprint_report_template + confluence publish (streamed)"):
+        return get_client().post(base_url, basic_credentials=creds, data=body)
 
 
 def create_sprint_report_confluence_page() -> None:
@@ -154,18 +277,13 @@ def make_api_request(
     #     "Authorization": f"Basic {authorization}",
     #     "Content-Type": "application/json",
     # }
-    headers = headers_data
-    return requests.request(request_type, base_url, headers=headers)
+    return get_client().request(request_type, base_url)
 
 
 def make_api_request_bearer(
     base_url: str, request_type: str = "POST"
 ) -> requests.Response:
-    headers = {
-        k: v.encode("utf-8") if isinstance(v, str) else v
-        for k, v in headers_data.items()
-    }
-    return requests.request(request_type, base_url, headers=headers)
+    return get_client().request(request_type, base_url, encode_headers=True)
 
 
 def select_board_and_sprint(psswrd: str) -> Tuple[str, str]:
@@ -174,55 +292,82 @@ def select_board_and_sprint(psswrd: str) -> Tuple[str, str]:
     return team_board_id, sprint_id
 
 
+def query_team_board(team_board_id: str) -> TeamBoard:
+    return team_board_from_dict(
+        fetch_agile_page(f"{JIRA_BASE_URL}/rest/agile/latest/board/{team_board_id}", {})
+    )
+
+
+def iter_team_boards(name: Optional[str] = None) -> Iterator[TeamBoard]:
+    """Yields every board matching the name across all result pages"""
+    return (
+        team_board_from_dict(item)
+        for item in iter_agile_pages(
+            f"{JIRA_BASE_URL}/rest/agile/latest/board", {"name": name}
+        )
+    )
+
+
+def iter_team_sprints(
+    team_board_id: str, state: Optional[str] = None
+) -> Iterator[TeamSprint]:
+    """Yields every sprint of the board across all result pages, optionally
+    filtered server side by state (future, active, closed)"""
+    return (
+        team_sprint_from_dict(item)
+        for item in iter_agile_pages(
+            f"{JIRA_BASE_URL}/rest/agile/latest/board/{team_board_id}/sprint",
+            {"state": state},
+        )
+    )
+
+
+@traced("board search")
+def list_team_boards(name: Optional[str] = None) -> ListTeamBoards:
+    return ListTeamBoards(list(iter_team_boards(name)))
+
+
+@traced("sprint listing")
+def list_team_sprints(
+    team_board_id: str, state: Optional[str] = None
+) -> ListTeamSprints:
+    return ListTeamSprints(list(iter_team_sprints(team_board_id, state)))
+
+
 def select_team_board(psswrd: str) -> str:
     print("Search for a team board that you would like to generate reports")
     team_board: str = input()
-    board_api: str = (
-        f"https://jira.amer.thermo.com/rest/agile/latest/board?&startAt=0&name={team_board}"
+    try:
+        list_team_board_object: ListTeamBoards = list_team_boards(team_board)
+    except requests.HTTPError as err:
+        print(f"There was an error with the board. {err}")
+        sys.exit()
+    team_selection: dict[str, str] = select_item(
+        list_team_board_object.boards, "team board"
     )
-    # board_response: requests.Response = make_api_request(psswrd, board_api, "GET")
-    board_response: requests.Response = make_api_request_bearer(board_api, "GET")
-    if board_response.status_code == 200:
-        list_team_board_object: ListTeamBoards = team_board_list_from_dict(
-            board_response.json()
-        )
-        team_selection: dict[str, str] = select_item(
-            list_team_board_object.boards, "team board"
-        )
-        print(
-            f"Excellent, we can continue! Your team board number is: {team_selection['id']}"
-        )
-        return team_selection["id"]
-    print(f"There was an error with the board. HTTP code: {board_response.status_code}")
-    sys.exit()
+    print(
+        f"Excellent, we can continue! Your team board number is: {team_selection['id']}"
+    )
+    return team_selection["id"]
 
 
 def select_team_sprint(psswrd: str, team_board_id: str) -> str:
-    sprint_api: str = (
-        # f"https://jira.amer.thermo.com/rest/agile/latest/board/{team_board_id}/sprint?maxResults=9&startAt=0"
-        f"https://jira.amer.thermo.com/rest/agile/latest/board/{team_board_id}/sprint?startAt=0"
+    try:
+        list_team_sprints_object: ListTeamSprints = list_team_sprints(team_board_id)
+    except requests.HTTPError as err:
+        print(f"There was an error with the sprints. {err}")
+        sys.exit()
+    sprint_selection: dict[str, str] = select_item(
+        list_team_sprints_object.sprints, "sprint"
     )
-    # sprint_response: requests.Response = make_api_request(psswrd, sprint_api, "GET")
-    sprint_response: requests.Response = make_api_request_bearer(sprint_api, "GET")
-    if sprint_response.status_code == 200:
-        list_team_sprints_object: ListTeamSprints = team_sprint_list_from_dict(
-            sprint_response.json()
-        )
-        sprint_selection: dict[str, str] = select_item(
-            list_team_sprints_object.sprints, "sprint"
-        )
-        print(
-            f"Excellent, we can continue! Your sprint number is: {sprint_selection['id']}"
-        )
-        return sprint_selection["id"]
     print(
-        f"There was an error with the sprints. HTTP code: {sprint_response.status_code}"
+        f"Excellent, we can continue! Your sprint number is: {sprint_selection['id']}"
     )
-    sys.exit()
+    return sprint_selection["id"]
 
 
 def create_sprint_report_with_user_interaction() -> None:
-    psswrd: str = f"{os.environ.get("PASSWORD")}"
+    psswrd: str = f"{get_settings().password}"
     team_board_id, sprint_id = select_board_and_sprint(psswrd)
 
     print(
@@ -266,7 +411,7 @@ def ask_user_to_login() -> list[str]:
     user_name: str = input()
     password: str = getpass("Enter you Thermo Fisher password")
     test_url: str = (
-        "https://jira.amer.thermo.com/rest/agile/latest/board?maxResults=1&startAt=0&name=qppi"
+        f"{JIRA_BASE_URL}/rest/agile/latest/board?maxResults=1&startAt=0&name=qppi"
     )
     encrypted_credentials: str = encode_login_credentials(user_name, password)
     # test_response = make_api_request(encrypted_credentials, test_url, "GET")
@@ -0,0 +1,231 @@
+"""
+RequestPolicy
+_____________
+Retry with exponential backoff and shared per host rate limiting for the Jira and
+Confluence rest api calls made through ApiClient.
+
+Notes
+_____
+Idempotent methods (GET, PUT, ...) are retried on 429, 502, 503 and 504, on
+timeouts and on dropped connections. POST is only retried when the server
+cannot have processed it: a 429 or 503 answer, or a connection that could not be
+opened. A Retry-After header takes precedence over the backoff delay. Host names
+that cannot be resolved (no VPN) are never retried.
+
+Every request first takes a token from the bucket of its host. The buckets are
+shared by all the threads using the same RateLimiter, JIRA_RATE_LIMIT and
+CONFLUENCE_RATE_LIMIT set the requests per second of each host, see settings.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from jira_sprint_reporter.settings import Settings, get_settings
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+    import urllib3
+else:
+    requests = lazy_import("requests")
+    urllib3 = lazy_import("urllib3")
+
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 502, 503, 504})
+NOT_PROCESSED_STATUSES: frozenset[int] = frozenset({429, 503})
+IDEMPOTENT_METHODS: frozenset[str] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+
+
+def exception_chain(error: BaseException) -> list[BaseException]:
+    """Returns the error followed by its causes, including the urllib3 reason
+    wrapped in the first argument of requests.ConnectionError"""
+    chain: list[BaseException] = []
+    current: Optional[BaseException] = error
+    while current is not None and current not in chain:
+        chain.append(current)
+        reason: Any = getattr(current.args[0], "reason", None) if current.args else None
+        current = (
+            reason
+            if isinstance(reason, BaseException)
+            else current.__cause__ or current.__context__
+        )
+    return chain
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns the seconds to wait for a Retry-After header given in seconds or
+    as an HTTP date, None when missing or invalid"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and after how long.
+
+    ...
+    Attributes
+    __________
+    max_attempts: int
+        Total number of attempts, 1 disables the retries.
+    base_delay: float
+        Backoff of the first retry in seconds, doubled on every attempt.
+    max_delay: float
+        Upper bound of the backoff and of the Retry-After delay.
+    jitter: bool
+        Wait a random time between 0 and the backoff (full jitter), so threads
+        failing together do not retry together.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: bool = True
+
+    def backoff(self, attempt: int) -> float:
+        delay: float = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_retryable_status(self, method: str, status_code: int) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return status_code in RETRYABLE_STATUSES
+        return status_code in NOT_PROCESSED_STATUSES
+
+    def is_retryable_error(self, method: str, error: BaseException) -> bool:
+        chain: list[BaseException] = exception_chain(error)
+        if any(
+            isinstance(item, urllib3.exceptions.NameResolutionError) for item in chain
+        ):
+            return False
+        if isinstance(error, requests.ConnectTimeout) or any(
+            isinstance(item, urllib3.exceptions.NewConnectionError) for item in chain
+        ):
+            return True
+        return method.upper() in IDEMPOTENT_METHODS and isinstance(
+            error, (requests.ConnectionError, requests.Timeout)
+        )
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """
+        Returns the seconds to wait before the next attempt, or None when the
+        response or error of this attempt is final.
+
+        Parameters
+        __________
+        method: str
+            The HTTP method of the request.
+        attempt: int
+            The attempt that just finished, starting at 1.
+        response: Optional[requests.Response]
+            The response of the attempt, None when it raised.
+        error: Optional[BaseException]
+            The exception raised by the attempt.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is not None:
+            if not self.is_retryable_status(method, response.status_code):
+                return None
+            retry_after: Optional[float] = parse_retry_after(
+                response.headers.get("Retry-After")
+            )
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+            return self.backoff(attempt)
+        if error is not None and self.is_retryable_error(method, error):
+            return self.backoff(attempt)
+        return None
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket allowing rate requests per second on average with
+    bursts of up to capacity requests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens: float = self.capacity
+        self.clock: Callable[[], float] = clock
+        self.sleep: Callable[[float], None] = sleep
+        self.updated: float = clock()
+        self._lock: threading.Lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait for it"""
+        with self._lock:
+            now: float = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """Blocks until a token is available and returns the seconds waited"""
+        wait: float = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+@dataclass
+class RateLimiter:
+    """
+    The RateLimiter object keeps one TokenBucket per host name. Hosts without a
+    bucket are not limited.
+    """
+
+    buckets: dict[str, TokenBucket] = field(default_factory=dict)
+
+    def acquire(self, url: str) -> float:
+        bucket: Optional[TokenBucket] = self.buckets.get(urlsplit(url).hostname or "")
+        return bucket.acquire() if bucket is not None else 0.0
+
+
+def default_rate_limiter(jira_url: str, confluence_url: str) -> RateLimiter:
+    """Builds the limiter of the Jira and Confluence hosts, with the rates of
+    JIRA_RATE_LIMIT and CONFLUENCE_RATE_LIMIT when set"""
+    settings: Settings = get_settings()
+    limits: dict[str, float] = {
+        jira_url: settings.jira_rate_limit,
+        confluence_url: settings.confluence_rate_limit,
+    }
+    return RateLimiter(
+        {
+            urlsplit(url).hostname or "": TokenBucket(rate, rate * 2)
+            for url, rate in limits.items()
+            if rate > 0
+        }
+    )
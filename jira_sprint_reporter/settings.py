@@ -0,0 +1,135 @@
+"""
+Settings
+________
+The configuration of the reporter, read once from the environment and the .env
+file on first use.
+
+Notes
+_____
+Nothing is read at import time. The first get_settings call loads the .env file
+found next to the package (or in a parent directory) into the environment
+without overriding the variables already set, then builds the Settings object
+shared by every module. set_settings replaces it, e.g. in tests.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import timezone, tzinfo
+from typing import Mapping, Optional
+from zoneinfo import ZoneInfo
+
+DEFAULT_JIRA_RATE: float = 10.0
+DEFAULT_CONFLUENCE_RATE: float = 5.0
+ENABLED_VALUES: frozenset[str] = frozenset({"1", "on", "true"})
+
+
+def optional_float(value: Optional[str], default: float) -> float:
+    try:
+        return float(value or default)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    The Settings object holds the environment configuration of the reporter.
+
+    ...
+    Attributes
+    __________
+    password: Optional[str]
+        PASSWORD, the encoded Confluence basic credentials.
+    bearer_token: Optional[str]
+        BEARER_TOKEN, the Jira personal access token.
+    cookie: Optional[str]
+        COOKIE, sent with every request when set.
+    jira_rate_limit, confluence_rate_limit: float
+        JIRA_RATE_LIMIT and CONFLUENCE_RATE_LIMIT in requests per second, 0
+        disables the limit.
+    sprint_report_cache: bool
+        True when SPRINT_REPORT_CACHE is 1, on or true, the cache is opt-in.
+    sprint_report_cache_dir: Optional[str]
+        SPRINT_REPORT_CACHE_DIR, the user cache directory when None.
+    sprint_store_path: Optional[str]
+        SPRINT_STORE_PATH, the user data directory when None.
+    jira_url, confluence_url: Optional[str]
+        JIRA_URL and CONFLUENCE_URL, servers receiving the requests instead of
+        the production Jira and Confluence, e.g. benchmarks.standin.
+    jira_timezone: Optional[str]
+        JIRA_TIMEZONE, the IANA timezone of the Jira user profile, e.g.
+        America/New_York. Sprint report dates carry no offset and are read in
+        it, UTC when None.
+    json_decoder: Optional[str]
+        JSON_DECODER, json forces the standard library decoder over orjson.
+    profile_path: Optional[str]
+        SPRINT_REPORTER_PROFILE, the cProfile stats file of every run when set.
+    """
+
+    password: Optional[str] = None
+    bearer_token: Optional[str] = None
+    cookie: Optional[str] = None
+    jira_rate_limit: float = DEFAULT_JIRA_RATE
+    confluence_rate_limit: float = DEFAULT_CONFLUENCE_RATE
+    sprint_report_cache: bool = False
+    sprint_report_cache_dir: Optional[str] = None
+    sprint_store_path: Optional[str] = None
+    jira_url: Optional[str] = None
+    confluence_url: Optional[str] = None
+    jira_timezone: Optional[str] = None
+    json_decoder: Optional[str] = None
+    profile_path: Optional[str] = None
+
+    @staticmethod
+    def from_environment(environ: Mapping[str, str]) -> "Settings":
+        return Settings(
+            environ.get("PASSWORD"),
+            environ.get("BEARER_TOKEN"),
+            environ.get("COOKIE"),
+            optional_float(environ.get("JIRA_RATE_LIMIT"), DEFAULT_JIRA_RATE),
+            optional_float(
+                environ.get("CONFLUENCE_RATE_LIMIT"), DEFAULT_CONFLUENCE_RATE
+            ),
+            environ.get("SPRINT_REPORT_CACHE", "").lower() in ENABLED_VALUES,
+            environ.get("SPRINT_REPORT_CACHE_DIR") or None,
+            environ.get("SPRINT_STORE_PATH") or None,
+            environ.get("JIRA_URL") or None,
+            environ.get("CONFLUENCE_URL") or None,
+            environ.get("JIRA_TIMEZONE") or None,
+            environ.get("JSON_DECODER") or None,
+            environ.get("SPRINT_REPORTER_PROFILE") or None,
+        )
+
+    def sprint_report_timezone(self) -> tzinfo:
+        """Returns the JIRA_TIMEZONE of the sprint report dates, UTC when unset"""
+        return ZoneInfo(self.jira_timezone) if self.jira_timezone else timezone.utc
+
+
+def load_settings() -> Settings:
+    """Loads the .env file into the environment and returns its Settings"""
+    from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+
+    load_dotenv()
+    return Settings.from_environment(os.environ)
+
+
+_settings: Optional[Settings] = None
+_settings_lock: threading.Lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Returns the shared Settings, loading them on first use"""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = load_settings()
+    return _settings
+
+
+def set_settings(settings: Optional[Settings]) -> None:
+    """Replaces the shared Settings, None reloads them on the next get_settings"""
+    global _settings
+    with _settings_lock:
+        _settings = settings
@@ -0,0 +1,222 @@
+"""
+SprintReportCache
+_________________
+A persistent on-disk cache of the greenhopper sprint report responses keyed by
+(board, sprint).
+
+Notes
+_____
+A closed sprint's rapid/charts/sprintreport payload never changes, so closed
+sprints are kept until evicted. Active sprints are fresh for active_ttl seconds
+and revalidated with their ETag afterwards. The least recently used entries are
+evicted once the directory grows past max_bytes.
+
+Only the SPRINT_REPORT_PATHS of a response are stored, so every entry records
+the CACHE_FORMAT it was written with. Entries of another format, e.g. written
+before a field was added to the decoded paths, are treated as missing.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from entities.sprint_report_api import SPRINT_REPORT_PATHS
+from jira_sprint_reporter.settings import get_settings
+
+DEFAULT_ACTIVE_TTL: float = 300.0
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+CACHE_FORMAT: str = hashlib.sha1(
+    "\n".join(SPRINT_REPORT_PATHS).encode("utf-8")
+).hexdigest()[:12]
+
+
+def default_cache_directory() -> str:
+    """Returns SPRINT_REPORT_CACHE_DIR or the user cache directory"""
+    configured: Optional[str] = get_settings().sprint_report_cache_dir
+    if configured:
+        return configured
+    cache_home: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "jira-sprint-reporter", "sprint-reports")
+
+
+@dataclass
+class CachedSprintReport:
+    """
+    A cached sprint report response.
+
+    ...
+    Attributes
+    __________
+    data: dict
+        The raw JSON response of the sprint report rest api.
+    etag: Optional[str]
+        The ETag header Jira sent with the response, if any.
+    fetched_at: float
+        Epoch seconds of the last fetch or successful revalidation.
+    closed: bool
+        Whether the sprint was closed, closed sprints never expire.
+    format: Optional[str]
+        The CACHE_FORMAT of the stored paths, None for entries written before
+        the format was recorded.
+    """
+
+    data: dict
+    etag: Optional[str]
+    fetched_at: float
+    closed: bool
+    format: Optional[str] = CACHE_FORMAT
+
+    @staticmethod
+    def from_dict(obj: Any) -> "CachedSprintReport":
+        return CachedSprintReport(
+            obj["data"],
+            obj.get("etag"),
+            float(obj["fetched_at"]),
+            bool(obj["closed"]),
+            obj.get("format"),
+        )
+
+    def to_dict(self) -> dict:
+        result: dict = {}
+        result["data"] = self.data
+        result["etag"] = self.etag
+        result["fetched_at"] = self.fetched_at
+        result["closed"] = self.closed
+        result["format"] = self.format
+        return result
+
+
+def is_closed_sprint_report(data: dict) -> bool:
+    return str((data.get("sprint") or {}).get("state", "")).upper() == "CLOSED"
+
+
+class SprintReportCache:
+    """
+    The SprintReportCache object stores one JSON file per (board, sprint) inside
+    its directory.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        active_ttl: float = DEFAULT_ACTIVE_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory: str = directory or default_cache_directory()
+        self.active_ttl: float = active_ttl
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+
+    def path(self, board: str, sprint: str) -> str:
+        return os.path.join(self.directory, f"{board}-{sprint}.json")
+
+    def load(self, board: str, sprint: str) -> Optional[CachedSprintReport]:
+        """Returns the cached entry, or None when missing, unreadable or of
+        another CACHE_FORMAT"""
+        try:
+            with open(self.path(board, sprint), encoding="utf-8") as cache_file:
+                entry: CachedSprintReport = CachedSprintReport.from_dict(
+                    json.load(cache_file)
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry if entry.format == CACHE_FORMAT else None
+
+    def is_fresh(self, entry: CachedSprintReport) -> bool:
+        return entry.closed or time.time() - entry.fetched_at < self.active_ttl
+
+    def touch(self, board: str, sprint: str) -> None:
+        """Marks the entry as recently used for the eviction order"""
+        try:
+            os.utime(self.path(board, sprint))
+        except OSError:
+            pass
+
+    def store(
+        self, board: str, sprint: str, data: dict, etag: Optional[str] = None
+    ) -> CachedSprintReport:
+        """Writes the response atomically and evicts old entries when the cache
+        grows past max_bytes"""
+        entry: CachedSprintReport = CachedSprintReport(
+            data, etag, time.time(), is_closed_sprint_report(data)
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                json.dump(entry.to_dict(), temp_file)
+            os.replace(temp_path, self.path(board, sprint))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+        return entry
+
+    def revalidated(
+        self, board: str, sprint: str, entry: CachedSprintReport
+    ) -> CachedSprintReport:
+        """Stores the entry again after Jira answered 304 Not Modified"""
+        return self.store(board, sprint, entry.data, entry.etag)
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache fits in
+        max_bytes"""
+        with self._lock:
+            try:
+                entries: list[os.DirEntry] = [
+                    entry
+                    for entry in os.scandir(self.directory)
+                    if entry.is_file() and entry.name.endswith(".json")
+                ]
+            except OSError:
+                return
+            stats: list[tuple[float, int, str]] = []
+            for entry in entries:
+                try:
+                    stat: os.stat_result = entry.stat()
+                except OSError:
+                    continue
+                stats.append((stat.st_mtime, stat.st_size, entry.path))
+            total: int = sum(size for _, size, _ in stats)
+            for _, size, path in sorted(stats):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def invalidate(self, board: str, sprint: str) -> None:
+        try:
+            os.remove(self.path(board, sprint))
+        except OSError:
+            pass
+
+
+_default_cache: Optional[SprintReportCache] = None
+
+
+def get_sprint_report_cache() -> Optional[SprintReportCache]:
+    """Returns the shared cache, or None unless SPRINT_REPORT_CACHE is set to on"""
+    global _default_cache
+    if not get_settings().sprint_report_cache:
+        return None
+    if _default_cache is None:
+        _default_cache = SprintReportCache()
+    return _default_cache
+
+
+def set_sprint_report_cache(cache: Optional[SprintReportCache]) -> None:
+    global _default_cache
+    _default_cache = cache
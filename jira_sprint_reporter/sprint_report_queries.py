@@ -1,53 +1,249 @@
-import os
-from typing import Optional
+from __future__ import annotations
 
-import requests
-from dotenv import dotenv_values, load_dotenv
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 
 from entities.sprint_report_api import (
+    LAZY_ISSUE_LISTS,
+    SPRINT_REPORT_PATHS,
     JiraIssueSprintReport,
     SprintReport,
     sprint_report_from_dict,
 )
+from jira_sprint_reporter.client import JIRA_BASE_URL, get_client
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.sprint_report_cache import (
+    CachedSprintReport,
+    SprintReportCache,
+    get_sprint_report_cache,
+)
+from jira_sprint_reporter.tracing import traced
+from utilities.json_decoding import decode_response
+from utilities.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+else:
+    requests = lazy_import("requests")
 
-config = dotenv_values("../.env")
-load_dotenv()
 
-headers_data: dict = {
-    "Accept": "application/json",
-    "Content-Type": "application/json",
-    "Authorization": os.environ.get("BEARER_TOKEN"),
-    "Cookie": os.environ.get("COOKIE"),
-}
+DEFAULT_MEMO_TTL: float = 60.0
+DEFAULT_MEMO_ENTRIES: int = 32
+FETCH_LOCK_STRIPES: int = 16
 
 
 class QuerySprintReport:
-    def query_sprint_data(self, sprint_board: str, sprint_id: str) -> requests.Response:
+    def query_sprint_data(
+        self, sprint_board: str, sprint_id: str, headers: Optional[dict] = None
+    ) -> requests.Response:
         base_url: str = (
-            "https://jira.amer.thermo.com/rest/greenhopper/latest/rapid/charts/sprintreport?rapidViewId="
+            f"{JIRA_BASE_URL}/rest/greenhopper/latest/rapid/charts/sprintreport?rapidViewId="
         )
         # headers: dict = {"Authorization": os.environ.get("PASSWORD")}
-        # headers: dict = {"Authorization": os.environ.get("PASSWORD")}
-        headers: dict = headers_data
-        return requests.request(
-            "GET", base_url + sprint_board + "&sprintId=" + sprint_id, headers=headers
+        return get_client().get(
+            base_url + sprint_board + "&sprintId=" + sprint_id, headers=headers
+        )
+
+
+@traced("sprint report fetch")
+def fetch_sprint_report_json(
+    sprint_board: str,
+    sprint_id: str,
+    cache: Optional[SprintReportCache] = None,
+) -> dict:
+    """
+    Returns the raw sprint report JSON, served from the on-disk cache when the
+    cached copy is still fresh or Jira confirms it with 304 Not Modified.
+
+    Parameters
+    __________
+    sprint_board: str
+        The board id (rapidViewId).
+    sprint_id: str
+        The sprint id.
+    cache: Optional[SprintReportCache]
+        The cache to use, defaults to get_sprint_report_cache().
+
+    Returns
+    _______
+    dict
+        The JSON response of the sprint report rest api.
+    """
+    cache = cache or get_sprint_report_cache()
+    entry: Optional[CachedSprintReport] = (
+        cache.load(sprint_board, sprint_id) if cache else None
+    )
+    if cache and entry and cache.is_fresh(entry):
+        cache.touch(sprint_board, sprint_id)
+        return entry.data
+
+    headers: Optional[dict] = (
+        {"If-None-Match": entry.etag} if entry and entry.etag else None
+    )
+    request_data: requests.Response = QuerySprintReport().query_sprint_data(
+        sprint_board, sprint_id, headers
+    )
+    if cache and entry and request_data.status_code == 304:
+        return cache.revalidated(sprint_board, sprint_id, entry).data
+    if request_data.status_code != 200:
+        raise requests.HTTPError(
+            f"HTTP code: {request_data.status_code}", response=request_data
+        )
+    json_data: dict = decode_response(
+        request_data, SPRINT_REPORT_PATHS, get_settings().json_decoder
+    )
+    if cache:
+        cache.store(
+            sprint_board, sprint_id, json_data, request_data.headers.get("ETag")
+        )
+    return json_data
+
+
+@dataclass
+class MemoizedSprintReport:
+    """
+    A sprint report response kept in memory.
+
+    Attributes
+    __________
+    data: dict
+        The JSON response of the sprint report rest api.
+    expires_at: float
+        time.monotonic() after which the response is fetched again.
+    """
+
+    data: dict
+    expires_at: float
+
+
+class SprintReportMemo:
+    """
+    The SprintReportMemo object keeps the sprint report responses of the current
+    process per (board, sprint) for ttl seconds, so slicing the same sprint
+    several ways costs a single download. Concurrent callers asking for the same
+    sprint wait for one fetch instead of starting their own; the fetch locks are
+    a fixed set shared by hashing (board, sprint), so they do not grow with the
+    sprints seen.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_MEMO_TTL, max_entries: int = DEFAULT_MEMO_ENTRIES
+    ) -> None:
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[tuple[str, str], MemoizedSprintReport] = (
+            OrderedDict()
+        )
+        self._fetch_locks: tuple[threading.Lock, ...] = tuple(
+            threading.Lock() for _ in range(FETCH_LOCK_STRIPES)
         )
+        self._lock: threading.Lock = threading.Lock()
 
+    def get(self, board: str, sprint: str) -> Optional[dict]:
+        """Returns the memoized response, or None when missing or expired"""
+        key: tuple[str, str] = (board, sprint)
+        with self._lock:
+            entry: Optional[MemoizedSprintReport] = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.data
 
-def get_sprint_report_data(sprint_board: str, sprint_id: str) -> SprintReport:
-    query_sprint_report: QuerySprintReport = QuerySprintReport()
-    request_data: requests.Response = QuerySprintReport.query_sprint_data(
-        query_sprint_report, sprint_board, sprint_id
+    def put(self, board: str, sprint: str, data: dict) -> None:
+        with self._lock:
+            self._entries[(board, sprint)] = MemoizedSprintReport(
+                data, time.monotonic() + self.ttl
+            )
+            self._entries.move_to_end((board, sprint))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, board: str, sprint: str) -> dict:
+        """Returns the memoized response, fetching it with
+        fetch_sprint_report_json when missing or expired"""
+        data: Optional[dict] = self.get(board, sprint)
+        if data is not None:
+            return data
+        with self.fetch_lock(board, sprint):
+            data = self.get(board, sprint)
+            if data is None:
+                data = fetch_sprint_report_json(board, sprint)
+                self.put(board, sprint, data)
+        return data
+
+    def fetch_lock(self, board: str, sprint: str) -> threading.Lock:
+        """Returns the lock serializing the fetches of the sprint"""
+        return self._fetch_locks[hash((board, sprint)) % len(self._fetch_locks)]
+
+    def invalidate(
+        self, board: Optional[str] = None, sprint: Optional[str] = None
+    ) -> int:
+        """
+        Drops memoized responses and returns how many were dropped.
+
+        Parameters
+        __________
+        board: Optional[str]
+            Only drop the sprints of this board, every board when None.
+        sprint: Optional[str]
+            Only drop this sprint, every sprint of the board when None.
+        """
+        with self._lock:
+            keys: list[tuple[str, str]] = [
+                key
+                for key in self._entries
+                if (board is None or key[0] == board)
+                and (sprint is None or key[1] == sprint)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+
+_sprint_report_memo: SprintReportMemo = SprintReportMemo()
+
+
+def get_sprint_report_memo() -> SprintReportMemo:
+    return _sprint_report_memo
+
+
+def set_sprint_report_memo(memo: SprintReportMemo) -> None:
+    global _sprint_report_memo
+    _sprint_report_memo = memo
+
+
+def invalidate_sprint_report(
+    sprint_board: Optional[str] = None, sprint_id: Optional[str] = None
+) -> int:
+    """Drops the memoized sprint reports of a sprint, a board or every board, so
+    the next access downloads them again"""
+    return _sprint_report_memo.invalidate(sprint_board, sprint_id)
+
+
+def get_sprint_report_data(
+    sprint_board: str, sprint_id: str, lazy: bool = False
+) -> SprintReport:
+    """Decodes the sprint report, downloading it only when it is not memoized.
+    Every call returns a new SprintReport, so callers may update it in place."""
+    json_data: dict = _sprint_report_memo.get_or_fetch(sprint_board, sprint_id)
+    sprint_report_data: SprintReport = sprint_report_from_dict(
+        json_data, lazy, get_settings().sprint_report_timezone()
     )
-    json_data = request_data.json()
-    sprint_report_data: SprintReport = sprint_report_from_dict(json_data)
     return sprint_report_data
 
 
 def get_completed_issues(
     sprint_board: str, sprint_id: str
 ) -> Optional[list[JiraIssueSprintReport]]:
-    sprint_report_data: SprintReport = get_sprint_report_data(sprint_board, sprint_id)
+    sprint_report_data: SprintReport = get_sprint_report_data(
+        sprint_board, sprint_id, lazy=True
+    )
     completed_issues: Optional[list[JiraIssueSprintReport]] = (
         sprint_report_data.completed_issues
     )
@@ -57,8 +253,26 @@ def get_completed_issues(
 def get_not_completed_issues(
     sprint_board: str, sprint_id: str
 ) -> Optional[list[JiraIssueSprintReport]]:
-    sprint_report_data: SprintReport = get_sprint_report_data(sprint_board, sprint_id)
+    sprint_report_data: SprintReport = get_sprint_report_data(
+        sprint_board, sprint_id, lazy=True
+    )
     not_completed_issues: Optional[list[JiraIssueSprintReport]] = (
         sprint_report_data.not_completed_issues
     )
     return not_completed_issues
+
+
+def get_sprint_report_issue_lists(
+    sprint_board: str, sprint_id: str
+) -> dict[str, Optional[list[JiraIssueSprintReport]]]:
+    """
+    Returns every issue category of the sprint from a single sprint report.
+
+    Returns
+    _______
+    dict[str, Optional[list[JiraIssueSprintReport]]]
+        The completed_issues, not_completed_issues, removed_issues and
+        issues_completed_outside lists keyed by their SprintReport attribute.
+    """
+    sprint_report_data: SprintReport = get_sprint_report_data(sprint_board, sprint_id)
+    return {name: getattr(sprint_report_data, name) for name in LAZY_ISSUE_LISTS}
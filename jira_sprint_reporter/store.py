@@ -0,0 +1,381 @@
+"""
+SprintStore
+___________
+A local SQLite store of the boards, sprints and sprint report issues, so
+questions across sprints are answered with indexed queries instead of Jira
+calls.
+
+Notes
+_____
+Sprint reports are stored once their issue types are resolved. sync_board
+only downloads the closed sprints of a board that are not stored yet.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from entities.sprint_report_api import (
+    LAZY_ISSUE_LISTS,
+    JiraIssueSprintReport,
+    SprintReport,
+    update_sprint_jira_issue_types,
+)
+from entities.team_info import TeamBoard, TeamSprint
+from jira_sprint_reporter import queries
+from jira_sprint_reporter.settings import get_settings
+from jira_sprint_reporter.sprint_report_queries import get_sprint_report_data
+from utilities.lazy_import import load_lazy_modules
+
+DEFAULT_SYNC_WORKERS: int = 4
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS boards (
+    board_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    board_type TEXT
+);
+CREATE TABLE IF NOT EXISTS sprints (
+    sprint_id INTEGER NOT NULL,
+    board_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    goal TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    PRIMARY KEY (board_id, sprint_id)
+);
+CREATE INDEX IF NOT EXISTS sprints_board ON sprints (board_id, end_date);
+CREATE TABLE IF NOT EXISTS sprint_reports (
+    sprint_id INTEGER NOT NULL,
+    board_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    goal TEXT,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    commited_story_points INTEGER,
+    delivered_story_points INTEGER,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (board_id, sprint_id)
+);
+CREATE INDEX IF NOT EXISTS sprint_reports_board
+    ON sprint_reports (board_id, end_date);
+CREATE TABLE IF NOT EXISTS sprint_issues (
+    sprint_id INTEGER NOT NULL,
+    board_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    jira_issue_id INTEGER NOT NULL,
+    issue_key TEXT NOT NULL,
+    issue_type TEXT,
+    summary TEXT,
+    assignee TEXT,
+    issue_status TEXT,
+    issue_priority TEXT,
+    resolution INTEGER,
+    original_estimate INTEGER,
+    final_estimate INTEGER,
+    added INTEGER NOT NULL,
+    PRIMARY KEY (board_id, sprint_id, category, position)
+);
+CREATE INDEX IF NOT EXISTS sprint_issues_key ON sprint_issues (issue_key);
+CREATE INDEX IF NOT EXISTS sprint_issues_assignee ON sprint_issues (assignee);
+"""
+
+ISSUE_COLUMNS: tuple[str, ...] = (
+    "jira_issue_id",
+    "key",
+    "issue_type",
+    "summary",
+    "assignee",
+    "issue_status",
+    "issue_priority",
+    "resolution",
+    "original_estimate",
+    "final_estimate",
+)
+
+
+def default_store_path() -> str:
+    """Returns SPRINT_STORE_PATH or a file in the user data directory"""
+    configured: Optional[str] = get_settings().sprint_store_path
+    if configured:
+        return configured
+    data_home: str = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(data_home, "jira-sprint-reporter", "sprints.sqlite3")
+
+
+def to_text(value: Optional[datetime]) -> Optional[str]:
+    """Returns the value as UTC ISO text, so stored dates sort by instant.
+    Naive values are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def sprint_report_rows(
+    board_id: int, sprint: SprintReport
+) -> tuple[tuple, list[tuple]]:
+    """Returns the sprint_reports row, without synced_at, and the sprint_issues
+    rows of a resolved sprint report"""
+    added_keys: set[str] = set(sprint.added_issues or ())
+    issue_rows: list[tuple] = [
+        (
+            sprint.sprint_id,
+            board_id,
+            category,
+            position,
+            *(issue[column] for column in ISSUE_COLUMNS),
+            issue.key in added_keys,
+        )
+        for category in LAZY_ISSUE_LISTS
+        for position, issue in enumerate(getattr(sprint, category) or ())
+    ]
+    report_row: tuple = (
+        sprint.sprint_id,
+        board_id,
+        sprint.name,
+        sprint.goal,
+        to_text(sprint.start_date),
+        to_text(sprint.end_date),
+        sprint.commited_story_points,
+        sprint.delivered_story_points,
+    )
+    return report_row, issue_rows
+
+
+def from_text(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def from_flag(value: Optional[int]) -> Any:
+    """Returns a stored flag as the raw done value of the sprint report issue"""
+    return None if value is None else bool(value)
+
+
+class SprintStore:
+    """
+    The SprintStore object wraps the SQLite database, creating the schema on
+    first use.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path: str = path or default_store_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SprintStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def save_board(self, board: TeamBoard) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO boards VALUES (?, ?, ?)",
+                (board.team_board_id, board.name, board.team_board_type),
+            )
+
+    def save_sprints(self, board_id: int, sprints: Iterable[TeamSprint]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sprints VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        sprint.sprint_id,
+                        board_id,
+                        sprint.name,
+                        sprint.goal,
+                        to_text(sprint.start_date),
+                        to_text(sprint.end_date),
+                    )
+                    for sprint in sprints
+                ],
+            )
+
+    def save_sprint_report(self, board_id: int, sprint: SprintReport) -> None:
+        """Replaces the stored report and issues of the sprint in one transaction"""
+        self.save_sprint_rows(*sprint_report_rows(board_id, sprint))
+
+    def save_sprint_rows(self, report_row: tuple, issue_rows: list[tuple]) -> None:
+        """Replaces the stored report and issues of the sprint with rows built by
+        sprint_report_rows, e.g. in another process"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM sprint_issues WHERE board_id = ? AND sprint_id = ?",
+                (report_row[1], report_row[0]),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sprint_reports VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*report_row, to_text(datetime.now(timezone.utc))),
+            )
+            self.connection.executemany(
+                "INSERT INTO sprint_issues VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                issue_rows,
+            )
+
+    def stored_sprint_ids(self, board_id: int) -> set[int]:
+        return {
+            row["sprint_id"]
+            for row in self.connection.execute(
+                "SELECT sprint_id FROM sprint_reports WHERE board_id = ?", (board_id,)
+            )
+        }
+
+    def load_sprint_report(
+        self, board_id: int, sprint_id: int
+    ) -> Optional[SprintReport]:
+        """Rebuilds a stored SprintReport, with its issue types already resolved"""
+        report: Optional[sqlite3.Row] = self.connection.execute(
+            "SELECT * FROM sprint_reports WHERE board_id = ? AND sprint_id = ?",
+            (board_id, sprint_id),
+        ).fetchone()
+        if report is None:
+            return None
+        issue_lists: dict[str, list[JiraIssueSprintReport]] = {
+            category: [] for category in LAZY_ISSUE_LISTS
+        }
+        added_issues: dict[str, bool] = {}
+        for row in self.connection.execute(
+            "SELECT * FROM sprint_issues WHERE board_id = ? AND sprint_id = ? "
+            "ORDER BY category, position",
+            (board_id, sprint_id),
+        ):
+            issue_lists[row["category"]].append(
+                JiraIssueSprintReport(
+                    row["jira_issue_id"],
+                    row["issue_key"],
+                    row["issue_type"],
+                    row["summary"],
+                    row["assignee"],
+                    row["issue_status"],
+                    row["issue_priority"],
+                    from_flag(row["resolution"]),
+                    row["original_estimate"],
+                    row["final_estimate"],
+                )
+            )
+            if row["added"]:
+                added_issues[row["issue_key"]] = True
+        return SprintReport(
+            report["sprint_id"],
+            report["name"],
+            report["goal"],
+            datetime.fromisoformat(report["start_date"]),
+            datetime.fromisoformat(report["end_date"]),
+            {},
+            {},
+            {},
+            report["commited_story_points"],
+            report["delivered_story_points"],
+            **{
+                category: issues or None
+                for category, issues in issue_lists.items()
+            },
+            added_issues=added_issues,
+        )
+
+    def issue_spillover_count(self, issue_key: str) -> int:
+        """Returns how many sprints ended with the issue not completed"""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM (SELECT DISTINCT board_id, sprint_id "
+            "FROM sprint_issues "
+            "WHERE issue_key = ? AND category = 'not_completed_issues')",
+            (issue_key,),
+        ).fetchone()[0]
+
+    def issue_history(self, issue_key: str) -> list[sqlite3.Row]:
+        """Returns the issue's row of every stored sprint, oldest sprint first"""
+        return self.connection.execute(
+            "SELECT r.sprint_id, r.name, r.end_date, i.category, i.issue_status, "
+            "i.assignee, i.final_estimate, i.added "
+            "FROM sprint_issues i JOIN sprint_reports r USING (board_id, sprint_id) "
+            "WHERE i.issue_key = ? ORDER BY r.end_date",
+            (issue_key,),
+        ).fetchall()
+
+    def board_delivery(
+        self, board_id: int, since: Optional[datetime] = None
+    ) -> list[sqlite3.Row]:
+        """Returns the committed and delivered story points of the board's
+        stored sprints ending after since, oldest first"""
+        return self.connection.execute(
+            "SELECT sprint_id, name, end_date, commited_story_points, "
+            "delivered_story_points FROM sprint_reports "
+            "WHERE board_id = ? AND end_date >= ? ORDER BY end_date",
+            (board_id, to_text(since) or ""),
+        ).fetchall()
+
+    def assignee_issues(self, assignee: str) -> list[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM sprint_issues WHERE assignee = ? ORDER BY sprint_id",
+            (assignee,),
+        ).fetchall()
+
+
+def fetch_resolved_sprint_report(board: str, sprint_id: str) -> SprintReport:
+    return update_sprint_jira_issue_types(get_sprint_report_data(board, sprint_id))
+
+
+def sync_board(
+    store: SprintStore, board: str, workers: int = DEFAULT_SYNC_WORKERS
+) -> list[int]:
+    """
+    Stores the board, its closed sprints and the sprint reports that are not
+    stored yet.
+
+    Parameters
+    __________
+    store: SprintStore
+        The destination store.
+    board: str
+        The board id (rapidViewId).
+    workers: int
+        Number of sprint reports fetched concurrently.
+
+    Returns
+    _______
+    list[int]
+        The ids of the sprint reports added by this sync.
+    """
+    board_id: int = int(board)
+    store.save_board(queries.query_team_board(board))
+    sprints: list[TeamSprint] = queries.list_team_sprints(board, state="closed").sprints
+    store.save_sprints(board_id, sprints)
+    stored: set[int] = store.stored_sprint_ids(board_id)
+    missing: list[str] = [
+        str(sprint.sprint_id) for sprint in sprints if sprint.sprint_id not in stored
+    ]
+    load_lazy_modules("requests")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for sprint_report in executor.map(
+            lambda sprint_id: fetch_resolved_sprint_report(board, sprint_id), missing
+        ):
+            store.save_sprint_report(board_id, sprint_report)
+    return [int(sprint_id) for sprint_id in missing]
+
+
+def sync_boards(
+    boards: Iterable[str],
+    path: Optional[str] = None,
+    workers: int = DEFAULT_SYNC_WORKERS,
+) -> None:
+    """Syncs every board into the store and prints what was added"""
+    with SprintStore(path) as store:
+        for board in boards:
+            added: list[int] = sync_board(store, board, workers)
+            print(f"Board {board}: {len(added)} new sprint reports stored")
@@ -0,0 +1,256 @@
+"""
+Tracing
+_______
+Times the stages of a report run (board search, sprint listing, sprint report
+fetch, type resolution, rendering, Confluence publish) and every HTTP call made
+through ApiClient.
+
+Notes
+_____
+The shared tracer, see get_tracer, is a NullTracer that records nothing unless
+run_traced installs a recording Tracer for a run whose summary, JSON export or
+cProfile is requested. Tracer.summary prints the records and Tracer.write_json
+exports them. Set
+SPRINT_REPORTER_PROFILE to a file path to profile a run without passing the
+--profile flag.
+"""
+
+import cProfile
+import json
+import re
+import statistics
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Any, Callable, ClassVar, Iterator, Optional, TypeVar
+from urllib.parse import parse_qsl, urlsplit
+
+from jira_sprint_reporter.settings import get_settings
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9]+-\d+$")
+
+T = TypeVar("T")
+
+
+def template_segment(segment: str) -> str:
+    if segment.isdigit():
+        return "{id}"
+    return "{key}" if _ISSUE_KEY.match(segment) else segment
+
+
+def url_template(url: str) -> str:
+    """
+    Returns the url with its ids replaced by placeholders, so the calls to the
+    same endpoint are grouped together.
+
+    Parameters
+    __________
+    url: str
+        e.g. .../rest/agile/latest/board/6363/sprint?startAt=50
+    """
+    parts = urlsplit(url)
+    template: str = parts.netloc + "/".join(
+        template_segment(segment) for segment in parts.path.split("/")
+    )
+    query: list[str] = [f"{name}={{}}" for name, _ in parse_qsl(parts.query)]
+    return f"{template}?{'&'.join(query)}" if query else template
+
+
+@dataclass
+class StageRecord:
+    name: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class HttpRecord:
+    method: str
+    url_template: str
+    status_code: Optional[int]
+    response_bytes: int
+    seconds: float
+    attempt: int = 1
+    error: Optional[str] = None
+
+
+@dataclass
+class Tracer:
+    """
+    The Tracer object collects the stage and HTTP records of the current process.
+    Recording is thread safe.
+    """
+
+    enabled: ClassVar[bool] = True
+    stages: list[StageRecord] = field(default_factory=list)
+    http_calls: list[HttpRecord] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Records the duration of the block as the named stage"""
+        start: float = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield
+        except BaseException as err:
+            error = type(err).__name__
+            raise
+        finally:
+            with self._lock:
+                self.stages.append(
+                    StageRecord(name, time.perf_counter() - start, error)
+                )
+
+    def record_http(self, record: HttpRecord) -> None:
+        with self._lock:
+            self.http_calls.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.http_calls.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            result: dict = {}
+            result["stages"] = [asdict(record) for record in self.stages]
+            result["http_calls"] = [asdict(record) for record in self.http_calls]
+            return result
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.to_dict(), trace_file, indent=2)
+
+    def summary(self) -> str:
+        """Returns the count, total, mean and max seconds per stage, and per HTTP
+        method and url template with their status codes and bytes"""
+        with self._lock:
+            stages: dict[str, list[float]] = {}
+            for stage_record in self.stages:
+                stages.setdefault(stage_record.name, []).append(stage_record.seconds)
+            calls: dict[str, list[HttpRecord]] = {}
+            for http_record in self.http_calls:
+                calls.setdefault(
+                    f"{http_record.method} {http_record.url_template}", []
+                ).append(http_record)
+        lines: list[str] = [
+            f"{'Stage':<48} {'Count':>5} {'Total s':>9} {'Mean s':>8} {'Max s':>8}"
+        ]
+        for name, seconds in stages.items():
+            lines.append(
+                f"{name:<48} {len(seconds):>5} {sum(seconds):>9.3f} "
+                f"{statistics.fmean(seconds):>8.3f} {max(seconds):>8.3f}"
+            )
+        lines.append("")
+        lines.append(
+            f"{'HTTP call':<48} {'Count':>5} {'Total s':>9} {'Mean s':>8} "
+            f"{'Bytes':>10}  Status"
+        )
+        for name, records in calls.items():
+            statuses: dict[str, int] = {}
+            for record in records:
+                status: str = str(record.status_code or record.error)
+                statuses[status] = statuses.get(status, 0) + 1
+            seconds = [record.seconds for record in records]
+            lines.append(
+                f"{name[:48]:<48} {len(records):>5} {sum(seconds):>9.3f} "
+                f"{statistics.fmean(seconds):>8.3f} "
+                f"{sum(record.response_bytes for record in records):>10}  "
+                + ", ".join(f"{code} x{count}" for code, count in statuses.items())
+            )
+        return "\n".join(lines)
+
+
+class NullTracer(Tracer):
+    """The default Tracer, which records nothing so untraced runs only pay for a
+    method call per stage and HTTP attempt."""
+
+    enabled: ClassVar[bool] = False
+
+    def stage(self, name: str) -> Any:
+        return nullcontext()
+
+    def record_http(self, record: HttpRecord) -> None:
+        pass
+
+
+_tracer: Tracer = NullTracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def stage(name: str) -> Any:
+    """Context manager recording a stage on the shared tracer"""
+    return _tracer.stage(name)
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator recording every call of the function as the named stage"""
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            with _tracer.stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def run_traced(
+    function: Callable[[], T],
+    summary: bool = False,
+    json_path: Optional[str] = None,
+    profile_path: Optional[str] = None,
+) -> T:
+    """
+    Runs function and reports its trace. A recording Tracer is installed for the
+    run when a report is requested and the shared tracer is a NullTracer.
+
+    Parameters
+    __________
+    function: Callable[[], T]
+        The run, e.g. the manifest or interactive report creation.
+    summary: bool
+        Print the stage and HTTP summary table at the end.
+    json_path: Optional[str]
+        Write the stage and HTTP records as JSON to this file.
+    profile_path: Optional[str]
+        Run under cProfile and dump the stats to this file, defaults to the
+        profile_path setting, SPRINT_REPORTER_PROFILE.
+    """
+    profile_path = profile_path or get_settings().profile_path
+    if not (summary or json_path or profile_path):
+        return function()
+    previous: Tracer = _tracer
+    tracer: Tracer = previous if previous.enabled else Tracer()
+    set_tracer(tracer)
+    profiler: Optional[cProfile.Profile] = (
+        cProfile.Profile() if profile_path else None
+    )
+    try:
+        if profiler is not None:
+            return profiler.runcall(function)
+        return function()
+    finally:
+        if profiler is not None and profile_path:
+            import pstats  # pylint: disable=import-outside-toplevel
+
+            profiler.dump_stats(profile_path)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        set_tracer(previous)
+        if summary:
+            print(tracer.summary())
+        if json_path:
+            tracer.write_json(json_path)
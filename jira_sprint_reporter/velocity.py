@@ -0,0 +1,103 @@
+"""
+Velocity
+________
+Builds the velocity trend of a board out of its last closed sprints.
+
+Notes
+_____
+The sprint reports are fetched concurrently through get_sprint_report_data, so
+closed sprints are served from the sprint report cache after the first run.
+"""
+
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from entities.sprint_report_api import SprintReport
+from entities.velocity import DEFAULT_ROLLING_WINDOW, VelocityTrend
+from jira_sprint_reporter import queries
+from jira_sprint_reporter.sprint_report_queries import get_sprint_report_data
+from utilities.lazy_import import load_lazy_modules
+
+DEFAULT_VELOCITY_WINDOW: int = 6
+DEFAULT_VELOCITY_WORKERS: int = 4
+
+
+def last_closed_sprint_ids(board: str, window: int) -> list[str]:
+    """Returns the ids of the last window closed sprints of the board, oldest
+    first"""
+    if window < 1:
+        raise ValueError(f"The velocity window must be at least 1, got {window}")
+    sprints = queries.list_team_sprints(board, state="closed").sprints
+    if not sprints:
+        raise LookupError(f"Board {board} has no closed sprints")
+    return [str(sprint.sprint_id) for sprint in sprints[-window:]]
+
+
+def fetch_velocity_trend(
+    board: str,
+    window: int = DEFAULT_VELOCITY_WINDOW,
+    workers: int = DEFAULT_VELOCITY_WORKERS,
+    rolling_window: int = DEFAULT_ROLLING_WINDOW,
+) -> VelocityTrend:
+    """
+    Fetches the last closed sprints of the board and computes their trend.
+
+    Parameters
+    __________
+    board: str
+        The board id (rapidViewId).
+    window: int
+        Number of closed sprints included.
+    workers: int
+        Number of sprint reports fetched concurrently.
+    rolling_window: int
+        Number of sprints of the rolling averages.
+    """
+    sprint_ids: list[str] = last_closed_sprint_ids(board, window)
+    load_lazy_modules("requests")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sprints: list[SprintReport] = list(
+            executor.map(
+                lambda sprint_id: get_sprint_report_data(board, sprint_id),
+                sprint_ids,
+            )
+        )
+    return VelocityTrend.from_sprint_reports(board, sprints, rolling_window)
+
+
+def velocity_to_json(trend: VelocityTrend) -> str:
+    return json.dumps(trend.to_dict(), indent=2)
+
+
+def format_velocity(trend: VelocityTrend) -> str:
+    """Returns a plain text table of the trend for the terminal"""
+    lines: list[str] = [
+        f"{'Sprint':<32} {'Committed':>9} {'Delivered':>9} {'Done %':>7} "
+        f"{'Added':>5} {'Removed':>7} {'Avg delivered':>13}"
+    ]
+    for position, name in enumerate(trend.sprint_names):
+        completion: float = trend.completion[position]
+        lines.append(
+            f"{name[:32]:<32} {trend.committed[position]:>9.0f} "
+            f"{trend.delivered[position]:>9.0f} "
+            f"{'N/A' if math.isnan(completion) else f'{completion:.0f}':>7} "
+            f"{trend.added_issues[position]:>5} {trend.removed_issues[position]:>7} "
+            f"{trend.rolling_delivered[position]:>13.1f}"
+        )
+    return "\n".join(lines)
+
+
+def report_velocity(
+    board: str,
+    window: int = DEFAULT_VELOCITY_WINDOW,
+    output: Optional[str] = None,
+) -> VelocityTrend:
+    """Prints the velocity trend of the board and optionally writes it as JSON"""
+    trend: VelocityTrend = fetch_velocity_trend(board, window)
+    print(format_velocity(trend))
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            output_file.write(velocity_to_json(trend))
+    return trend
@@ -1,4 +1,109 @@
+import argparse
+
+from jira_sprint_reporter.archive import DEFAULT_ARCHIVE_WORKERS, report_archive
+from jira_sprint_reporter.batch import (
+    DEFAULT_WORKERS,
+    create_sprint_reports_from_manifest,
+)
 from jira_sprint_reporter.queries import create_sprint_report_with_user_interaction
+from jira_sprint_reporter.store import sync_boards
+from jira_sprint_reporter.tracing import run_traced
+from jira_sprint_reporter.velocity import DEFAULT_VELOCITY_WINDOW, report_velocity
+
+
+def positive_int(value: str) -> int:
+    number: int = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Jira Sprint Reporter")
+    parser.add_argument(
+        "--manifest",
+        help="YAML, JSON or CSV file with board, sprint, space and ancestor rows "
+        "to create the reports without prompts",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help="number of reports created or synced in parallel",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="update the existing pages in manifest mode, skipping unchanged ones",
+    )
+    parser.add_argument(
+        "--velocity",
+        metavar="BOARD",
+        help="print the velocity trend of the board's last closed sprints",
+    )
+    parser.add_argument(
+        "--window",
+        type=positive_int,
+        default=DEFAULT_VELOCITY_WINDOW,
+        help="number of closed sprints of the velocity trend",
+    )
+    parser.add_argument(
+        "--output", help="write the velocity trend as JSON to this file"
+    )
+    parser.add_argument(
+        "--sync",
+        nargs="+",
+        metavar="BOARD",
+        help="store the closed sprint reports of the boards that are not stored yet",
+    )
+    parser.add_argument(
+        "--archive",
+        nargs="+",
+        metavar="PATH",
+        help="decode the sprint report JSON files, directories or glob patterns, "
+        "into --store when set",
+    )
+    parser.add_argument(
+        "--board",
+        type=int,
+        help="board of the --archive files not named <board>-<sprint>.json",
+    )
+    parser.add_argument(
+        "--processes",
+        type=positive_int,
+        default=DEFAULT_ARCHIVE_WORKERS,
+        help="number of processes decoding --archive files, the CPU count by default",
+    )
+    parser.add_argument("--store", help="SQLite file of --sync and --archive")
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="print the time spent per stage and per HTTP call at the end",
+    )
+    parser.add_argument(
+        "--trace-json", help="write the stage and HTTP call records to this file"
+    )
+    parser.add_argument(
+        "--profile",
+        help="run under cProfile and write the stats to this file, "
+        "also set by SPRINT_REPORTER_PROFILE",
+    )
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.sync:
+        sync_boards(args.sync, args.store, args.workers)
+    elif args.archive:
+        report_archive(args.archive, args.board, args.processes, args.store)
+    elif args.velocity:
+        report_velocity(args.velocity, args.window, args.output)
+    elif args.manifest:
+        create_sprint_reports_from_manifest(args.manifest, args.workers, args.upsert)
+    else:
+        create_sprint_report_with_user_interaction()
+
 
 if __name__ == "__main__":
-    create_sprint_report_with_user_interaction()
+    args = parse_args()
+    run_traced(lambda: run(args), args.trace, args.trace_json, args.profile)
@@ -1,34 +1,69 @@
-from typing import Optional
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from entities.sprint_report_api import (
     JiraIssueSprintReport,
     SprintReport,
     get_active_developers,
-    get_added_issues,
-    get_all_jira_issues_from_sprint_report,
+    get_sprint_report_index,
     get_total_commited_pbis,
 )
 
+if TYPE_CHECKING:
+    from entities.velocity import VelocityTrend
+
+
+def sprint_report_template(
+    sprint: SprintReport, board: str, velocity: Optional[VelocityTrend] = None
+) -> str:
+    return "".join(iter_sprint_report_template(sprint, board, velocity))
+
 
-def sprint_report_template(sprint: SprintReport, board: str) -> str:
-    res = f"""
+def iter_sprint_report_template(
+    sprint: SprintReport, board: str, velocity: Optional[VelocityTrend] = None
+) -> Iterator[str]:
+    """Yields the sprint report page in fragments. Every Jira field is escaped
+    when it is written, so the fragments can be streamed without a final pass
+    over the whole document. The velocity trend section is added when a trend
+    is given."""
+    yield """
     This document presents the goals and details of this sprint, aligned to the commitments defined in the 
     Team Agreement document, to serve as a sprint tracking tool.<br />
-    {sprint_date_table(sprint)}<br />
-    {sprint_goal_info(sprint)}
-    {all_pbis(sprint)}<br />
-    {removed_pbis(sprint)}<br />
-    {added_pbis(sprint)}<br />
-    {total_items_table(sprint)}<br />
-    {qppi_link(board)}<br /><br />
-    {spillover_incomplete_pbis(sprint)}<br />
-    {bugs_details(sprint)}
-    {upcoming_releases(sprint)}<br /><br />
-    {happiness_score()}
-    {actions_suggestions()}
     """
-    res = res.replace("&", "&amp;")
-    return res
+    yield sprint_date_table(sprint)
+    yield "<br />\n    "
+    yield sprint_goal_info(sprint)
+    yield "\n    "
+    yield from iter_all_pbis(sprint)
+    yield "<br />\n    "
+    yield from iter_removed_pbis(sprint)
+    yield "<br />\n    "
+    yield from iter_added_pbis(sprint)
+    yield "<br />\n    "
+    yield total_items_table(sprint)
+    yield "<br />\n    "
+    yield qppi_link(board)
+    yield "<br /><br />\n    "
+    if velocity is not None:
+        yield from iter_velocity_trend(velocity)
+        yield "<br />\n    "
+    yield from iter_spillover_incomplete_pbis(sprint)
+    yield "<br />\n    "
+    yield from iter_bugs_details(sprint)
+    yield "\n    "
+    yield upcoming_releases(sprint)
+    yield "<br /><br />\n    "
+    yield happiness_score()
+    yield "\n    "
+    yield actions_suggestions()
+    yield "\n    "
+
+
+def escape_field(value: Any) -> str:
+    """Escapes a Jira field for the Confluence storage format"""
+    return str(value).replace("&", "&amp;")
 
 
 def generate_explanation_message(
@@ -36,80 +71,106 @@ def generate_explanation_message(
 ) -> str:
     explanation_message: str = ""
     if issues:
-        explanation_message = f"<h5>{title}</h5>"
+        explanation_message = f"<h5>{escape_field(title)}</h5>"
     return explanation_message
 
 
 def all_pbis(sprint: SprintReport) -> str:
-    all_issues: list[JiraIssueSprintReport] = get_all_jira_issues_from_sprint_report(
+    return "".join(iter_all_pbis(sprint))
+
+
+def iter_all_pbis(sprint: SprintReport) -> Iterator[str]:
+    all_issues: list[JiraIssueSprintReport] = get_sprint_report_index(
         sprint
-    )
-    res: str = """
+    ).all_issues
+    yield """
     <h2>Sprint Work Items</h2>
     <strong style="color: rgb(255,102,0)">All PBIs</strong><br />
     """
-    return f"{res}{print_pbis(all_issues)}"
+    yield from iter_pbis(all_issues)
 
 
 def removed_pbis(sprint: SprintReport) -> str:
+    return "".join(iter_removed_pbis(sprint))
+
+
+def iter_removed_pbis(sprint: SprintReport) -> Iterator[str]:
     explanation_message: str = generate_explanation_message(
         f"Reasons for being removed from {sprint.name}", sprint.removed_issues
     )
-    return f"""
+    yield """
     <strong style="color: rgb(255,102,0)">Issues Removed From Sprint</strong><br />
-    {print_pbis(sprint.removed_issues)}
+    """
+    yield from iter_pbis(sprint.removed_issues)
+    yield f"""
     {explanation_message}
     """
 
 
 def added_pbis(sprint: SprintReport) -> str:
-    added_issue_list: Optional[list[JiraIssueSprintReport]] = get_added_issues(
-        sprint.added_issues, get_all_jira_issues_from_sprint_report(sprint)
-    )
+    return "".join(iter_added_pbis(sprint))
+
+
+def iter_added_pbis(sprint: SprintReport) -> Iterator[str]:
+    added_issue_list: Optional[list[JiraIssueSprintReport]] = get_sprint_report_index(
+        sprint
+    ).added_issues
     explanation_message: str = generate_explanation_message(
         f"Reasons for being added to {sprint.name}", added_issue_list
     )
-    return f"""
+    yield """
     <strong style="color: rgb(255,102,0)">Issues Added to Sprint</strong><br />
-    {print_pbis(added_issue_list)}
+    """
+    yield from iter_pbis(added_issue_list)
+    yield f"""
     {explanation_message}
     """
 
 
 def spillover_incomplete_pbis(sprint: SprintReport) -> str:
+    return "".join(iter_spillover_incomplete_pbis(sprint))
+
+
+def iter_spillover_incomplete_pbis(sprint: SprintReport) -> Iterator[str]:
     explanation_message: str = generate_explanation_message(
         f"Reasons for not being completed during Sprint {sprint.name}",
         sprint.not_completed_issues,
     )
-    return f"""
+    yield """
     <strong style="color: rgb(255,102,0)">Spillover / Incomplete PBIs</strong><br />
-    {print_pbis(sprint.not_completed_issues)}
+    """
+    yield from iter_pbis(sprint.not_completed_issues)
+    yield f"""
     {explanation_message}
     """
 
 
 def bugs_details(sprint: SprintReport) -> str:
-    all_items = get_all_jira_issues_from_sprint_report(sprint)
-    bug_list: list[JiraIssueSprintReport] = [
-        issue for issue in all_items if issue.issue_type == "Bug"
-    ]
-    res: str = """<strong style="color: rgb(255,102,0)">Bug Details</strong><br />"""
+    return "".join(iter_bugs_details(sprint))
+
+
+def iter_bugs_details(sprint: SprintReport) -> Iterator[str]:
+    bug_list: list[JiraIssueSprintReport] = get_sprint_report_index(
+        sprint
+    ).by_type.get("Bug", [])
     explanation_message: str = generate_explanation_message(
         f"No Bugs encountered during {sprint.name}", bug_list
     )
-    return f"{res}{print_pbis(bug_list)}{explanation_message}"
+    yield """<strong style="color: rgb(255,102,0)">Bug Details</strong><br />"""
+    yield from iter_pbis(bug_list)
+    yield explanation_message
 
 
 def upcoming_releases(sprint: SprintReport) -> str:
-    all_issues: list[JiraIssueSprintReport] = get_all_jira_issues_from_sprint_report(
+    all_issues: list[JiraIssueSprintReport] = get_sprint_report_index(
         sprint
-    )
+    ).all_issues
     project_key: str = "FDA1"
     if all_issues:
         project_key: str = all_issues[0].key.split("-")[0]
     return f"""
     <h2>Upcoming Releases</h2>
-    please review the <a href="https://jira.amer.thermo.com/projects/{project_key}?selectedItem=com.atlassian.jira.jira-projects-plugin%3Arelease-page&status=unreleased">release calendar page</a> for current and upcoming releases
+    please review the <a href="https://jira.amer.thermo.com/projects/{escape_field(project_key)}?selectedItem=com.atlassian.jira.jira-projects-plugin%3Arelease-page&amp;status=unreleased">release calendar page</a> for current and upcoming releases
     """
 
 
@@ -188,16 +249,62 @@ def calculate_completion(sprint: SprintReport) -> str:
     return "N/A"
 
 
+def format_percentage(value: float) -> str:
+    return "N/A" if math.isnan(value) else f"{value:.0f} %"
+
+
+def velocity_trend(velocity: VelocityTrend) -> str:
+    return "".join(iter_velocity_trend(velocity))
+
+
+def iter_velocity_trend(velocity: VelocityTrend) -> Iterator[str]:
+    yield f"""
+        <h2>Velocity Trend (last {len(velocity.sprint_ids)} sprints)</h2>
+        <table>
+            <tbody>
+                <tr>
+                    <th style="text-align: center">Sprint</th>
+                    <th style="text-align: center">Commited Story Points</th>
+                    <th style="text-align: center">Completed Story Points</th>
+                    <th style="text-align: center">Completion %</th>
+                    <th style="text-align: center">Issues Added</th>
+                    <th style="text-align: center">Issues Removed</th>
+                    <th style="text-align: center">Avg Completed ({velocity.rolling_window} sprints)</th>
+                    <th style="text-align: center">Avg Completion % ({velocity.rolling_window} sprints)</th>
+                </tr>"""
+    for position, name in enumerate(velocity.sprint_names):
+        yield f"""
+                <tr>
+                    <td style="text-align: left">{escape_field(name)}</td>
+                    <td style="text-align: center">{velocity.committed[position]:.0f}</td>
+                    <td style="text-align: center">{velocity.delivered[position]:.0f}</td>
+                    <td style="text-align: center">{format_percentage(velocity.completion[position])}</td>
+                    <td style="text-align: center">{velocity.added_issues[position]} ({velocity.added_points[position]:.0f} SP)</td>
+                    <td style="text-align: center">{velocity.removed_issues[position]} ({velocity.removed_points[position]:.0f} SP)</td>
+                    <td style="text-align: center">{velocity.rolling_delivered[position]:.1f}</td>
+                    <td style="text-align: center">{format_percentage(velocity.rolling_completion[position])}</td>
+                </tr>"""
+    yield """
+            </tbody>
+        </table>
+    """
+
+
 def qppi_link(board: str) -> str:
     return f"""
-    <a href="http://victoria.invitrogen.com/tools/qppi?team={board}">Refer to QPPI to find accurate and automated values (click here).</a>
+    <a href="http://victoria.invitrogen.com/tools/qppi?team={escape_field(board)}">Refer to QPPI to find accurate and automated values (click here).</a>
     """
 
 
 def print_pbis(table_rows: Optional[list[JiraIssueSprintReport]]) -> str:
-    res: str = "No issues during the Sprint.<br />"
-    if table_rows:
-        res: str = f"""
+    return "".join(iter_pbis(table_rows))
+
+
+def iter_pbis(table_rows: Optional[list[JiraIssueSprintReport]]) -> Iterator[str]:
+    if not table_rows:
+        yield "No issues during the Sprint.<br />"
+        return
+    yield """
         <table>
             <tbody>
                 <tr>
@@ -207,26 +314,29 @@ def print_pbis(table_rows: Optional[list[JiraIssueSprintReport]]) -> str:
                     <th style="text-align: center">Priority</th>
                     <th style="text-align: center">Status</th>
                     <th style="text-align: center">Resolution</th>
-                </tr>{print_pbis_tr(table_rows)}
+                </tr>"""
+    yield from iter_pbis_tr(table_rows)
+    yield """
             </tbody>
         </table>
         """
-    return res
 
 
 def print_pbis_tr(issues: list[JiraIssueSprintReport]) -> str:
-    res: str = ""
+    return "".join(iter_pbis_tr(issues))
+
+
+def iter_pbis_tr(issues: list[JiraIssueSprintReport]) -> Iterator[str]:
     for issue in issues:
-        res += f"""
+        yield f"""
             <tr>
-                <td style="text-align: left"><a href="https://jira.amer.thermo.com/browse/{issue.key}">{issue.key}: {issue.summary}</a></td>
-                <td style="text-align: left">{issue.issue_type}</td>
-                <td style="text-align: left">{issue.assignee}</td>
-                <td style="text-align: left">{issue.issue_priority}</td>
-                <td style="text-align: left">{issue.issue_status}</td>
-                <td style="text-align: center">{issue.resolution}</td>
+                <td style="text-align: left"><a href="https://jira.amer.thermo.com/browse/{escape_field(issue.key)}">{escape_field(issue.key)}: {escape_field(issue.summary)}</a></td>
+                <td style="text-align: left">{escape_field(issue.issue_type)}</td>
+                <td style="text-align: left">{escape_field(issue.assignee)}</td>
+                <td style="text-align: left">{escape_field(issue.issue_priority)}</td>
+                <td style="text-align: left">{escape_field(issue.issue_status)}</td>
+                <td style="text-align: center">{escape_field(issue.resolution)}</td>
             </tr>"""
-    return res
 
 
 def sprint_goal_info(sprint: SprintReport) -> str:
@@ -241,7 +351,7 @@ def sprint_goal_table(sprint: SprintReport) -> str:
     <table>
         <tbody>
             <tr>
-                <td style="text-align: center">{sprint.goal}</td>
+                <td style="text-align: center">{escape_field(sprint.goal)}</td>
                 <td style="text-align: center">{status_macro("ACHIEVED")}</td>
                 <td style="text-align: center">-- reason in case sprint goal not achieved --</td>
             </tr>
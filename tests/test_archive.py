@@ -0,0 +1,89 @@
+import json
+import shutil
+from pathlib import Path
+
+from entities.sprint_report_api import (
+    SprintReport,
+    sprint_report_from_dict,
+    update_sprint_jira_issue_types,
+)
+from jira_sprint_reporter.archive import (
+    NO_BOARD_ERROR,
+    ArchivedSprintReport,
+    archive_files,
+    decode_archive,
+    decode_archive_file,
+    report_archive,
+)
+from jira_sprint_reporter.store import SprintStore, sprint_report_rows
+from utilities.fixtures import load_fixture
+from utilities.utils import get_absolute_path
+
+FIXTURES: tuple[str, ...] = ("sprint-36928", "sprint-40267")
+
+
+def build_archive(directory: Path) -> list[str]:
+    paths: list[str] = []
+    for name in FIXTURES:
+        sprint_id: str = name.split("-")[1]
+        raw: Path = directory / f"6363-{sprint_id}.json"
+        shutil.copy(get_absolute_path(f"tests/json_files/{name}.json"), raw)
+        cached: Path = directory / f"cached-{sprint_id}.json"
+        cached.write_text(json.dumps({"data": load_fixture(name), "closed": True}))
+        paths += [str(raw), str(cached)]
+    (directory / "broken.json").write_text('{"values": []}')
+    return paths
+
+
+def test_decoded_file_matches_the_serial_decode(tmp_path: Path) -> None:
+    build_archive(tmp_path)
+    sprint: SprintReport = update_sprint_jira_issue_types(
+        sprint_report_from_dict(load_fixture("sprint-36928"))
+    )
+    raw: ArchivedSprintReport = decode_archive_file(str(tmp_path / "6363-36928.json"))
+    cached: ArchivedSprintReport = decode_archive_file(
+        str(tmp_path / "cached-36928.json"), board=6363
+    )
+    assert raw.error is None and raw.board_id == 6363
+    assert (raw.report_row, raw.issue_rows) == sprint_report_rows(6363, sprint)
+    assert (cached.report_row, cached.issue_rows) == (raw.report_row, raw.issue_rows)
+    assert raw.issue_count == len(raw.issue_rows)
+    unknown_board: ArchivedSprintReport = decode_archive_file(
+        str(tmp_path / "cached-36928.json")
+    )
+    assert unknown_board.board_id is None and unknown_board.report_row == ()
+    assert unknown_board.issue_count == raw.issue_count
+
+
+def test_process_pool_streams_every_file_with_errors(tmp_path: Path) -> None:
+    build_archive(tmp_path)
+    files: list[str] = list(archive_files([str(tmp_path)]))
+    assert len(files) == 5
+    serial: dict = {
+        result.path: result for result in decode_archive(files, 6363, workers=1)
+    }
+    pooled: list[ArchivedSprintReport] = list(
+        decode_archive(iter(files), 6363, workers=2, max_in_flight=2)
+    )
+    assert {result.path: result for result in pooled} == serial
+    errors: list[str] = [result.path for result in pooled if result.error]
+    assert errors == [str(tmp_path / "broken.json")]
+
+
+def test_archive_is_written_to_the_store(tmp_path: Path, capsys) -> None:
+    build_archive(tmp_path)
+    database: str = str(tmp_path / "sprints.sqlite3")
+    results: list[ArchivedSprintReport] = report_archive(
+        [str(tmp_path / "*.json")], workers=1, store_path=database
+    )
+    assert all(result.issue_rows == [] for result in results)
+    assert "Decoded 2 sprint reports, 3 failed" in capsys.readouterr().out
+    assert sorted(
+        Path(result.path).name
+        for result in results
+        if result.error == NO_BOARD_ERROR
+    ) == ["cached-36928.json", "cached-40267.json"]
+    with SprintStore(database) as sprint_store:
+        assert sprint_store.stored_sprint_ids(6363) == {36928, 40267}
+        loaded = sprint_store.load_sprint_report(6363, 40267)
+    assert loaded is not None and loaded.name == "Dragonflies 2024 Q1 Sprint 6"
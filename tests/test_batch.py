@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from entities.team_info import ListTeamSprints, TeamSprint
+from jira_sprint_reporter import batch, queries
+from jira_sprint_reporter.batch import ManifestEntry, ManifestResult
+
+ROWS: list[dict] = [
+    {"board": "6363", "sprint": "36928", "space": "TEAMA", "ancestor": "111"},
+    {
+        "board": "5974",
+        "sprint": "latest closed",
+        "space": "TEAMB",
+        "ancestor": "222",
+        "team": "Gene.AI",
+    },
+]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+
+
+def test_load_json_manifest(tmp_path: Path) -> None:
+    manifest: Path = tmp_path / "teams.json"
+    manifest.write_text(json.dumps(ROWS), encoding="utf-8")
+    entries: list[ManifestEntry] = batch.load_manifest(str(manifest))
+    assert entries[0] == ManifestEntry("6363", "36928", "TEAMA", "111", "6363")
+    assert entries[1].team == "Gene.AI"
+
+
+def test_load_csv_manifest(tmp_path: Path) -> None:
+    manifest: Path = tmp_path / "teams.csv"
+    manifest.write_text(
+        "board,sprint,space,ancestor\n6363,latest closed,TEAMA,111\n",
+        encoding="utf-8",
+    )
+    entries: list[ManifestEntry] = batch.load_manifest(str(manifest))
+    assert entries == [ManifestEntry("6363", "latest closed", "TEAMA", "111", "6363")]
+
+
+def test_load_yaml_manifest(tmp_path: Path) -> None:
+    pytest.importorskip("yaml")
+    manifest: Path = tmp_path / "teams.yaml"
+    manifest.write_text(
+        "teams:\n  - board: 6363\n    sprint: 36928\n    space: TEAMA\n    ancestor: 111\n",
+        encoding="utf-8",
+    )
+    entries: list[ManifestEntry] = batch.load_manifest(str(manifest))
+    assert entries == [ManifestEntry("6363", "36928", "TEAMA", "111", "6363")]
+
+
+def test_manifest_row_without_space_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        ManifestEntry.from_dict({"board": "1", "sprint": "2", "ancestor": "3"})
+
+
+def test_latest_closed_sprint_is_the_last_completed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sprints: list[TeamSprint] = [
+        TeamSprint(3, "Sprint 3", None, datetime(2023, 6, 2), 5974, None),
+        TeamSprint(
+            1, "Sprint 1", None, datetime(2023, 5, 19), 5974, None, datetime(2023, 7, 1)
+        ),
+        TeamSprint(2, "Sprint 2", None, None, 5974, None),
+    ]
+    monkeypatch.setattr(
+        queries, "list_team_sprints", lambda board, state: ListTeamSprints(sprints)
+    )
+    assert batch.resolve_sprint_id("5974", "latest closed") == "1"
+    assert batch.resolve_sprint_id("5974", "42") == "42"
+
+
+def test_run_manifest_keeps_order_and_reports_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fake_create_page(
+        creds: str, board: str, sprint: str, space: str, ancestor: str, velocity=None
+    ) -> FakeResponse:
+        if board == "5974":
+            raise ConnectionError("reset")
+        return FakeResponse(200)
+
+    monkeypatch.setattr(queries, "create_confluence_page_with_params", fake_create_page)
+    monkeypatch.setattr(batch, "resolve_sprint_id", lambda board, sprint: "99")
+    entries: list[ManifestEntry] = [ManifestEntry.from_dict(row) for row in ROWS]
+    results: list[ManifestResult] = batch.run_manifest("creds", entries, workers=2)
+    assert [result.entry.board for result in results] == ["6363", "5974"]
+    assert results[0].status_code == 200
+    assert results[1].error == "ConnectionError: reset"
+    summary: str = batch.format_summary(results)
+    assert "Gene.AI" in summary
+    assert "ERROR ConnectionError: reset" in summary
@@ -0,0 +1,46 @@
+from requests.adapters import HTTPAdapter
+
+from jira_sprint_reporter import client
+from jira_sprint_reporter.client import ApiClient
+from utilities.utils import encode_login_credentials
+
+
+def test_bearer_token_is_sent_unchanged_as_authorization_header() -> None:
+    api_client: ApiClient = ApiClient(bearer_token="Bearer abc")
+    assert api_client.build_headers()["Authorization"] == "Bearer abc"
+
+
+def test_basic_credentials_take_precedence_over_bearer_token() -> None:
+    creds: str = encode_login_credentials("user@company.com", "secret")
+    api_client: ApiClient = ApiClient(bearer_token="Bearer abc")
+    headers: dict = api_client.build_headers(basic_credentials=creds)
+    assert headers["Authorization"] == f"Basic {creds}"
+
+
+def test_none_header_values_are_not_sent() -> None:
+    api_client: ApiClient = ApiClient(headers={"Cookie": None})
+    headers: dict = api_client.build_headers()
+    assert "Cookie" not in headers
+    assert "Authorization" not in headers
+
+
+def test_encoded_headers_are_bytes() -> None:
+    api_client: ApiClient = ApiClient(bearer_token="Bearer abc")
+    headers: dict = api_client.build_headers(encode=True)
+    assert headers["Authorization"] == b"Bearer abc"
+
+
+def test_pool_sizes_are_applied_to_the_session_adapters() -> None:
+    api_client: ApiClient = ApiClient(pool_connections=3, pool_maxsize=7)
+    adapter = api_client.session.get_adapter("https://jira.amer.thermo.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+
+
+def test_get_client_returns_the_same_shared_client() -> None:
+    client.set_client(None)
+    first: ApiClient = client.get_client()
+    assert client.get_client() is first
+    client.set_client(None)
+    assert client.get_client() is not first
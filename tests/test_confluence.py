@@ -0,0 +1,127 @@
+import json
+from typing import Any, Generator, Optional
+
+import pytest
+import requests
+
+from jira_sprint_reporter import client, confluence
+from jira_sprint_reporter.confluence import PublishResult
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data: Optional[dict] = None) -> None:
+        self.status_code = status_code
+        self.content = json.dumps(data or {}).encode("utf-8")
+
+
+class FakeConfluence:
+    """Keeps one page per title and answers the content api calls of upsert"""
+
+    def __init__(self) -> None:
+        self.pages: dict[str, dict] = {}
+        self.calls: list[str] = []
+
+    def get(self, url: str, params: dict, **kwargs: Any) -> FakeResponse:
+        self.calls.append("GET")
+        page: Optional[dict] = self.pages.get(params["title"])
+        return FakeResponse(200, {"results": [page] if page else []})
+
+    def post(self, url: str, data: Any = None, **kwargs: Any) -> FakeResponse:
+        self.calls.append("POST")
+        page: dict = json.loads(data)
+        page.update(id="42", version={"number": 1})
+        self.pages[page["title"]] = page
+        return FakeResponse(200, page)
+
+    def put(self, url: str, data: Any = None, **kwargs: Any) -> FakeResponse:
+        hash_property: Optional[dict] = kwargs.get("json")
+        if hash_property is not None:
+            self.calls.append("PUT property")
+            for page in self.pages.values():
+                page["metadata"]["properties"][hash_property["key"]] = {
+                    "value": hash_property["value"],
+                    "version": hash_property["version"],
+                }
+            return FakeResponse(200)
+        self.calls.append("PUT")
+        update: dict = json.loads(data)
+        page = self.pages[update["title"]]
+        page.update(body=update["body"], version=update["version"])
+        return FakeResponse(200, page)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_confluence() -> Generator[FakeConfluence, None, None]:
+    fake: FakeConfluence = FakeConfluence()
+    client.set_client(fake)  # type: ignore[arg-type]
+    yield fake
+    client.set_client(None)
+
+
+def publish(chunks: list[str]) -> PublishResult:
+    return confluence.upsert_confluence_page("creds", "Report", "SPACE", "7", chunks)
+
+
+def with_ancestor(fake: FakeConfluence) -> None:
+    for page in fake.pages.values():
+        page["ancestors"] = [{"id": "1"}, {"id": "7"}]
+        page["metadata"]["properties"][confluence.CONTENT_HASH_PROPERTY][
+            "version"
+        ] = {"number": 1}
+
+
+def test_upsert_creates_then_skips_then_updates(
+    fake_confluence: FakeConfluence,
+) -> None:
+    assert publish(["<p>", "v1", "</p>"]).action == confluence.CREATED
+    with_ancestor(fake_confluence)
+    assert publish(["<p>v1</p>"]).action == confluence.UNCHANGED
+    result: PublishResult = publish(["<p>v2</p>"])
+    assert (result.action, result.page_id) == (confluence.UPDATED, "42")
+    assert publish(["<p>v2</p>"]).action == confluence.UNCHANGED
+    page: dict = fake_confluence.pages["Report"]
+    assert page["version"] == {"number": 2}
+    assert page["body"]["storage"]["value"] == "<p>v2</p>"
+    assert fake_confluence.calls == [
+        "GET",
+        "POST",
+        "GET",
+        "GET",
+        "PUT",
+        "PUT property",
+        "GET",
+    ]
+
+
+def test_pages_under_another_ancestor_are_updated(
+    fake_confluence: FakeConfluence,
+) -> None:
+    publish(["<p>v1</p>"])
+    with_ancestor(fake_confluence)
+    fake_confluence.pages["Report"]["ancestors"] = [{"id": "8"}]
+    result: PublishResult = publish(["<p>v2</p>"])
+    assert (result.action, result.page_id) == (confluence.UPDATED, "42")
+    assert fake_confluence.calls.count("POST") == 1
+
+
+def test_failed_requests_raise(fake_confluence: FakeConfluence) -> None:
+    fake_confluence.post = lambda url, data=None, **kwargs: FakeResponse(400)
+    with pytest.raises(requests.HTTPError, match="creating the page Report"):
+        publish(["<p>v1</p>"])
+
+
+def test_failed_content_hash_saves_raise(fake_confluence: FakeConfluence) -> None:
+    publish(["<p>v1</p>"])
+    with_ancestor(fake_confluence)
+    update = fake_confluence.put
+
+    def put(url: str, data: Any = None, **kwargs: Any) -> FakeResponse:
+        response: FakeResponse = update(url, data, **kwargs)
+        return FakeResponse(409) if "json" in kwargs else response
+
+    fake_confluence.put = put
+    with pytest.raises(requests.HTTPError, match="content hash of page 42"):
+        publish(["<p>v2</p>"])
@@ -1,3 +1,4 @@
+import dataclasses
 import json
 from typing import Generator, Optional
 
@@ -5,18 +6,24 @@ import pytest
 
 from entities.jira_issue import (JiraIssue, jira_issue_from_dict,
                                  jira_issue_to_dict)
-from entities.sprint_report_api import (JiraIssueSprintReport, SprintReport,
+from entities.sprint_report_api import (JiraIssueSprintReport,
+                                        LazySprintReport, SprintReport,
+                                        SprintLookupTables, SprintReportIndex,
                                         clean_issue_types,
                                         get_active_developers,
+                                        get_added_issues,
                                         get_all_jira_issues_from_sprint_report,
                                         get_jira_issues_with_estimation_change,
+                                        get_sprint_report_index,
                                         set_issue_type,
                                         sprint_report_from_dict,
-                                        update_issue_key_with_value)
-from entities.team_info import (ListTeamBoards, ListTeamSprints,
+                                        update_issue_key_with_value,
+                                        update_sprint_jira_issue_types)
+from entities.team_info import (ListTeamBoards, ListTeamSprints, TeamBoard,
                                 team_board_list_from_dict,
                                 team_sprint_list_from_dict)
 from jira_sprint_reporter.sprint_report_queries import get_sprint_report_data
+from templates.sprint_report_template import sprint_report_template
 from utilities.utils import get_absolute_path
 
 
@@ -204,3 +211,145 @@ class TestTeamSprint:
 
     def test_team_sprint_returns_team_sprint_object(self, sprint) -> None:
         assert isinstance(sprint, ListTeamSprints)
+
+
+class TestSprintReportIndex:
+    @pytest.fixture(scope="class")
+    def sprint_data(self) -> Generator[SprintReport, None, None]:
+        json_file_path: str = get_absolute_path("tests/json_files/sprint-36928.json")
+        with open(json_file_path, encoding="utf-8") as json_file:
+            data = json.load(json_file)
+            yield update_sprint_jira_issue_types(sprint_report_from_dict(data))
+
+    def test_index_is_built_once(self, sprint_data: SprintReport) -> None:
+        index: SprintReportIndex = get_sprint_report_index(sprint_data)
+        assert get_sprint_report_index(sprint_data) is index
+
+    def test_index_groups_all_issues(self, sprint_data: SprintReport) -> None:
+        index: SprintReportIndex = get_sprint_report_index(sprint_data)
+        assert len(index.all_issues) == 10
+        assert len(index.by_key) == 10
+        assert sum(len(items) for items in index.by_type.values()) == 10
+        assert index.added_keys == set(sprint_data.added_issues or {})
+
+    def test_index_added_issues_match_get_added_issues(
+        self, sprint_data: SprintReport
+    ) -> None:
+        index: SprintReportIndex = get_sprint_report_index(sprint_data)
+        assert index.added_issues == get_added_issues(
+            sprint_data.added_issues,
+            get_all_jira_issues_from_sprint_report(sprint_data),
+        )
+
+    def test_index_is_rebuilt_when_a_list_is_replaced(
+        self, sprint_data: SprintReport
+    ) -> None:
+        index: SprintReportIndex = get_sprint_report_index(sprint_data)
+        sprint_data.removed_issues = None
+        rebuilt: SprintReportIndex = get_sprint_report_index(sprint_data)
+        assert rebuilt is not index
+        assert len(rebuilt.all_issues) == 9
+
+
+class TestSprintLookupTables:
+    @pytest.fixture
+    def sprint_data(self) -> Generator[SprintReport, None, None]:
+        json_file_path: str = get_absolute_path("tests/json_files/sprint-36928.json")
+        with open(json_file_path, encoding="utf-8") as json_file:
+            yield sprint_report_from_dict(json.load(json_file))
+
+    def test_lookup_tables_resolve_ids_to_names(self, sprint_data) -> None:
+        lookups: SprintLookupTables = SprintLookupTables.from_sprint_report(
+            sprint_data
+        )
+        assert lookups.types["1"] == "Bug"
+        assert lookups.statuses["5"] == "Resolved"
+
+    def test_update_sprint_issue_types_resolves_every_issue(
+        self, sprint_data, capsys: pytest.CaptureFixture
+    ) -> None:
+        sprint: SprintReport = update_sprint_jira_issue_types(sprint_data)
+        issue: JiraIssueSprintReport = (sprint.completed_issues or [])[2]
+        assert (issue.issue_type, issue.issue_status, issue.issue_priority) == (
+            "Bug",
+            "Resolved",
+            "P2 - High",
+        )
+        assert capsys.readouterr().out == ""
+
+    def test_lookup_tables_are_reused_across_sprints(self, sprint_data) -> None:
+        json_file_path: str = get_absolute_path("tests/json_files/sprint-40267.json")
+        with open(json_file_path, encoding="utf-8") as json_file:
+            other_sprint: SprintReport = sprint_report_from_dict(json.load(json_file))
+        lookups: SprintLookupTables = SprintLookupTables()
+        update_sprint_jira_issue_types(sprint_data, lookups)
+        type_count: int = len(lookups.types)
+        update_sprint_jira_issue_types(other_sprint, lookups)
+        assert len(lookups.types) >= type_count
+        assert all(
+            issue.issue_type in lookups.types.values()
+            for issue in get_all_jira_issues_from_sprint_report(other_sprint)
+        )
+
+
+class TestSlottedEntities:
+    def test_entities_have_no_instance_dict(self) -> None:
+        board: TeamBoard = TeamBoard(1, "Team A board", "scrum")
+        issue: JiraIssueSprintReport = JiraIssueSprintReport(
+            1, "AB-1", "1", "Summary", "Doe, Jane", "5", "8", "True"
+        )
+        assert not hasattr(board, "__dict__")
+        assert not hasattr(issue, "__dict__")
+
+    def test_sprint_report_issue_item_access_still_works(self) -> None:
+        issue: JiraIssueSprintReport = JiraIssueSprintReport(
+            1, "AB-1", "1", "Summary", "Doe, Jane", "5", "8", "True"
+        )
+        issue["issue_type"] = "Bug"
+        assert issue["issue_type"] == "Bug"
+
+    def test_team_boards_are_frozen(self) -> None:
+        board: TeamBoard = TeamBoard(1, "Team A board", "scrum")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            board.name = "Team B board"  # type: ignore[misc]
+
+
+class TestLazySprintReport:
+    @pytest.fixture
+    def raw_sprint(self) -> Generator[dict, None, None]:
+        json_file_path: str = get_absolute_path("tests/json_files/sprint-36928.json")
+        with open(json_file_path, encoding="utf-8") as json_file:
+            yield json.load(json_file)
+
+    def test_issue_lists_are_decoded_on_first_access(self, raw_sprint) -> None:
+        sprint: SprintReport = sprint_report_from_dict(raw_sprint, lazy=True)
+        assert isinstance(sprint, LazySprintReport)
+        assert sprint.delivered_story_points == sprint_report_from_dict(
+            raw_sprint
+        ).delivered_story_points
+        assert not sprint.is_decoded("completed_issues")
+        completed = sprint.completed_issues
+        assert sprint.is_decoded("completed_issues")
+        assert sprint.completed_issues is completed
+        assert not sprint.is_decoded("removed_issues")
+
+    def test_lazy_and_eager_reports_decode_the_same_issues(self, raw_sprint) -> None:
+        lazy: SprintReport = sprint_report_from_dict(raw_sprint, lazy=True)
+        eager: SprintReport = sprint_report_from_dict(raw_sprint)
+        assert lazy.to_dict() == eager.to_dict()
+
+    def test_issue_types_are_resolved_for_lists_decoded_later(
+        self, raw_sprint
+    ) -> None:
+        lazy: SprintReport = update_sprint_jira_issue_types(
+            sprint_report_from_dict(raw_sprint, lazy=True)
+        )
+        eager: SprintReport = update_sprint_jira_issue_types(
+            sprint_report_from_dict(raw_sprint)
+        )
+        assert isinstance(lazy, LazySprintReport)
+        assert not lazy.is_decoded("completed_issues")
+        assert lazy.completed_issues == eager.completed_issues
+        assert sprint_report_template(lazy, "6363") == sprint_report_template(
+            eager, "6363"
+        )
@@ -0,0 +1,120 @@
+import copy
+import json
+import re
+import threading
+from typing import Any, Generator
+
+import pytest
+
+from entities.sprint_report_api import (
+    JiraIssueSprintReport,
+    SprintReport,
+    get_all_jira_issues_from_sprint_report,
+    sprint_report_from_dict,
+)
+from jira_sprint_reporter import client, issue_search
+from utilities.utils import get_absolute_path
+
+
+class FakeResponse:
+    def __init__(self, data: dict) -> None:
+        self.status_code = 200
+        self.content = json.dumps(data).encode("utf-8")
+
+
+class FakeJiraSearch:
+    """Answers the JQL key searches from the issue fixture, capping maxResults
+    like a Jira server does, and leaves the keys in missing out"""
+
+    def __init__(self, max_results: int, missing: frozenset = frozenset()) -> None:
+        with open(
+            get_absolute_path("tests/json_files/intgpt-109.json"), encoding="utf-8"
+        ) as issue_file:
+            self.issue: dict = json.load(issue_file)
+        self.max_results = max_results
+        self.missing = missing
+        self.requests: list[dict] = []
+        self.lock = threading.Lock()
+
+    def get(self, url: str, params: dict, **kwargs: Any) -> FakeResponse:
+        with self.lock:
+            self.requests.append(params)
+        keys: list[str] = re.findall(r"[A-Z]+-\d+", params["jql"])
+        found: list[str] = [key for key in keys if key not in self.missing]
+        start: int = params["startAt"]
+        size: int = min(params["maxResults"], self.max_results)
+        issues: list[dict] = []
+        for key in found[start : start + size]:
+            issue: dict = copy.deepcopy(self.issue)
+            issue.update(key=key)
+            issue["fields"]["labels"] = [key.lower()]
+            issues.append(issue)
+        return FakeResponse(
+            {
+                "startAt": start,
+                "maxResults": size,
+                "total": len(found),
+                "issues": issues,
+            }
+        )
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def sprint_data() -> SprintReport:
+    with open(
+        get_absolute_path("tests/json_files/sprint-36928.json"), encoding="utf-8"
+    ) as sprint_file:
+        return sprint_report_from_dict(json.load(sprint_file))
+
+
+@pytest.fixture
+def fake_search() -> Generator[FakeJiraSearch, None, None]:
+    fake: FakeJiraSearch = FakeJiraSearch(max_results=3)
+    client.set_client(fake)  # type: ignore[arg-type]
+    yield fake
+    client.set_client(None)
+
+
+def test_search_requests_only_the_decoded_fields(
+    fake_search: FakeJiraSearch,
+) -> None:
+    issues = issue_search.search_jira_issues(
+        ["INTGPT-1", "INTGPT-2", "INTGPT-1"], chunk_size=5
+    )
+    assert sorted(issues) == ["INTGPT-1", "INTGPT-2"]
+    assert issues["INTGPT-2"].components == ["Global Launch"]
+    fields: list[str] = fake_search.requests[0]["fields"].split(",")
+    assert "summary" in fields and "fixVersions" in fields
+    assert "customfield_10002" not in fields
+
+
+def test_sprint_issues_are_enriched_in_chunks(
+    fake_search: FakeJiraSearch, sprint_data: SprintReport
+) -> None:
+    issue_search.enrich_sprint_report(sprint_data, chunk_size=4)
+    sprint_issues = get_all_jira_issues_from_sprint_report(sprint_data)
+    assert all(
+        issue.labels == [issue.key.lower()] and issue.fix_versions == []
+        for issue in sprint_issues
+    )
+    assert sprint_issues[0].to_dict()["components"] == ["Global Launch"]
+    chunks: int = -(-len({issue.key for issue in sprint_issues}) // 4)
+    assert len({request["jql"] for request in fake_search.requests}) == chunks
+    assert len(fake_search.requests) < len(sprint_issues)
+
+
+def test_missing_keys_are_not_enriched(sprint_data: SprintReport) -> None:
+    completed: list[JiraIssueSprintReport] = sprint_data.completed_issues or []
+    first_key: str = completed[0].key
+    fake: FakeJiraSearch = FakeJiraSearch(50, frozenset({first_key}))
+    client.set_client(fake)  # type: ignore[arg-type]
+    try:
+        issue_search.enrich_sprint_report(sprint_data)
+    finally:
+        client.set_client(None)
+    assert completed[0].labels is None
+    assert "labels" not in completed[0].to_dict()
+    assert completed[1].labels is not None
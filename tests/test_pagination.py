@@ -0,0 +1,88 @@
+import json
+import threading
+from typing import Optional
+
+import pytest
+
+from entities.team_info import ListTeamSprints
+from jira_sprint_reporter import pagination, queries
+from utilities.utils import get_absolute_path
+
+
+def build_pages(total: int, page_size: int, with_total: bool = True) -> dict[int, dict]:
+    pages: dict[int, dict] = {}
+    for start_at in range(0, total, page_size):
+        page: dict = {
+            "maxResults": page_size,
+            "startAt": start_at,
+            "isLast": start_at + page_size >= total,
+            "values": [
+                {"id": i} for i in range(start_at, min(total, start_at + page_size))
+            ],
+        }
+        if with_total:
+            page["total"] = total
+        pages[start_at] = page
+    return pages
+
+
+class FakePageServer:
+    def __init__(self, pages: dict[int, dict]) -> None:
+        self.pages = pages
+        self.requests: list[dict] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url: str, params: dict) -> dict:
+        with self.lock:
+            self.requests.append(params)
+        return self.pages[params["startAt"]]
+
+
+def test_pages_with_total_are_all_fetched_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server: FakePageServer = FakePageServer(build_pages(201, 50))
+    monkeypatch.setattr(pagination, "fetch_agile_page", server)
+    values: list = list(pagination.iter_agile_pages("board", {"name": "qppi"}))
+    assert [value["id"] for value in values] == list(range(201))
+    assert sorted(params["startAt"] for params in server.requests) == [
+        0,
+        50,
+        100,
+        150,
+        200,
+    ]
+    assert all(params["name"] == "qppi" for params in server.requests)
+
+
+def test_pages_without_total_are_walked_until_is_last(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server: FakePageServer = FakePageServer(build_pages(120, 50, with_total=False))
+    monkeypatch.setattr(pagination, "fetch_agile_page", server)
+    values: list = list(pagination.iter_agile_pages("sprint"))
+    assert len(values) == 120
+    assert [params["startAt"] for params in server.requests] == [0, 50, 100]
+
+
+def test_none_filters_are_not_sent(monkeypatch: pytest.MonkeyPatch) -> None:
+    server: FakePageServer = FakePageServer(build_pages(10, 50))
+    monkeypatch.setattr(pagination, "fetch_agile_page", server)
+    list(pagination.iter_agile_pages("sprint", {"state": None}))
+    assert "state" not in server.requests[0]
+
+
+def test_list_team_sprints_sends_state_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    json_file_path: str = get_absolute_path("tests/json_files/6363-sprints.json")
+    with open(json_file_path, encoding="utf-8") as json_file:
+        data: dict = json.load(json_file)
+    received: list[Optional[dict]] = []
+
+    def fake_fetch(url: str, params: dict) -> dict:
+        received.append(params)
+        return data
+
+    monkeypatch.setattr(pagination, "fetch_agile_page", fake_fetch)
+    sprints: ListTeamSprints = queries.list_team_sprints("6363", state="closed")
+    assert len(sprints.sprints) == len(data["values"])
+    assert received[0] == {"state": "closed", "startAt": 0, "maxResults": 50}
@@ -1,7 +1,15 @@
+import json
+import threading
+import time
+from typing import Generator, Optional
+
 import pytest
 import requests
 
+from entities.jira_issue import JIRA_ISSUE_PATHS, jira_issue_from_dict
 from jira_sprint_reporter import queries
+from utilities.json_decoding import field_names
+from utilities.utils import get_absolute_path
 
 
 def test_api_returns_error_519_when_not_connected_to_the_VPN() -> None:
@@ -10,3 +18,124 @@ def test_api_returns_error_519_when_not_connected_to_the_VPN() -> None:
     with pytest.raises(requests.exceptions.ConnectionError) as excinfo:
         queries.query_jira_issue(url)
         assert excinfo.value.args[0] == 519
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data: Optional[dict] = None) -> None:
+        self.status_code = status_code
+        self.data = data
+
+    def json(self) -> Optional[dict]:
+        return self.data
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.data).encode("utf-8")
+
+
+class TestQueryJiraIssues:
+    @pytest.fixture(scope="class")
+    def issue_data(self) -> Generator[dict, None, None]:
+        json_file_path: str = get_absolute_path("tests/json_files/intgpt-109.json")
+        with open(json_file_path, encoding="utf-8") as json_file:
+            yield json.load(json_file)
+
+    def test_results_keep_input_order_and_report_errors_per_key(
+        self, issue_data: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fake_query_jira_issue(key: str) -> FakeResponse:
+            if key == "MISSING-1":
+                return FakeResponse(404)
+            if key == "BROKEN-1":
+                raise requests.exceptions.ConnectionError("reset")
+            return FakeResponse(200, dict(issue_data, key=key))
+
+        monkeypatch.setattr(queries, "query_jira_issue", fake_query_jira_issue)
+        keys: list[str] = ["A-1", "MISSING-1", "B-2", "BROKEN-1", "C-3"]
+        results: list[queries.JiraIssueResult] = queries.query_jira_issues(keys)
+        assert [result.key for result in results] == keys
+        assert [result.issue.key for result in results if result.issue] == [
+            "A-1",
+            "B-2",
+            "C-3",
+        ]
+        assert results[1].error == "HTTP code: 404"
+        assert results[3].error == "ConnectionError: reset"
+
+    def test_in_flight_requests_are_bounded(
+        self, issue_data: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        lock: threading.Lock = threading.Lock()
+        counters: dict[str, int] = {"current": 0, "peak": 0}
+
+        def fake_query_jira_issue(key: str) -> FakeResponse:
+            with lock:
+                counters["current"] += 1
+                counters["peak"] = max(counters["peak"], counters["current"])
+            time.sleep(0.01)
+            with lock:
+                counters["current"] -= 1
+            return FakeResponse(200, dict(issue_data, key=key))
+
+        monkeypatch.setattr(queries, "query_jira_issue", fake_query_jira_issue)
+        results = queries.query_jira_issues([f"K-{i}" for i in range(20)], 3)
+        assert all(result.issue for result in results)
+        assert counters["peak"] <= 3
+
+
+class FakeIssueServer:
+    """Answers issue requests with the fixture reduced to the requested fields,
+    like Jira does with the fields parameter"""
+
+    def __init__(self, issue_data: dict) -> None:
+        self.issue_data = issue_data
+        self.params: list[Optional[dict]] = []
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs) -> FakeResponse:
+        self.params.append(params)
+        if not params:
+            return FakeResponse(200, self.issue_data)
+        fields: dict = self.issue_data["fields"]
+        return FakeResponse(
+            200,
+            {
+                "id": self.issue_data["id"],
+                "key": self.issue_data["key"],
+                "fields": {
+                    name: fields[name]
+                    for name in params["fields"].split(",")
+                    if name in fields
+                },
+            },
+        )
+
+    def close(self) -> None:
+        pass
+
+
+def test_issue_queries_request_only_the_decoded_fields(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    json_file_path: str = get_absolute_path("tests/json_files/intgpt-109.json")
+    with open(json_file_path, encoding="utf-8") as json_file:
+        issue_data: dict = json.load(json_file)
+    server: FakeIssueServer = FakeIssueServer(issue_data)
+    monkeypatch.setattr(queries, "get_client", lambda: server)
+    projected: requests.Response = queries.query_jira_issue("INTGPT-109")
+    full: requests.Response = queries.query_jira_issue("INTGPT-109", None)
+    assert server.params[0] == {"fields": ",".join(field_names(JIRA_ISSUE_PATHS))}
+    assert server.params[1] is None
+    assert len(projected.content) * 5 < len(full.content)
+    assert queries.query_jira_issue_to_jira_issue_type("INTGPT-109") == (
+        jira_issue_from_dict(issue_data)
+    )
+
+
+def test_streamed_confluence_page_body_is_valid_json() -> None:
+    page_data: dict = queries.confluence_page_data("Title & more", "SPACE", "123")
+    chunks: list[str] = ['<p>"Q&amp;A"</p>', "\n", "ünïcode"]
+    body: bytes = b"".join(queries.iter_confluence_page_body(page_data, chunks))
+    decoded: dict = json.loads(body)
+    assert decoded["title"] == "Title & more"
+    assert decoded["ancestors"] == [{"id": "123"}]
+    assert decoded["body"]["storage"]["value"] == "".join(chunks)
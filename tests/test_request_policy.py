@@ -0,0 +1,125 @@
+import socket
+import time
+from email.utils import formatdate
+from typing import Any, Iterator, Optional
+
+import pytest
+import requests
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+
+from jira_sprint_reporter.client import JIRA_BASE_URL, ApiClient
+from jira_sprint_reporter.request_policy import (
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, retry_after: Optional[str] = None) -> None:
+        self.status_code = status_code
+        self.headers = {"Retry-After": retry_after} if retry_after else {}
+        self.content = b"{}"
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Returns or raises the scripted outcomes in order"""
+
+    def __init__(self, outcomes: list[Any]) -> None:
+        self.outcomes: Iterator[Any] = iter(outcomes)
+        self.methods: list[str] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        self.methods.append(method)
+        outcome: Any = next(self.outcomes)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def fake_client(outcomes: list[Any], sleeps: list[float]) -> ApiClient:
+    api_client: ApiClient = ApiClient(
+        retry_policy=RetryPolicy(max_attempts=3, jitter=False),
+        rate_limiter=RateLimiter(),
+        sleep=sleeps.append,
+    )
+    api_client.session = FakeSession(outcomes)  # type: ignore[assignment]
+    return api_client
+
+
+def connection_error(reason: BaseException) -> requests.ConnectionError:
+    return requests.ConnectionError(type("MaxRetryError", (), {"reason": reason})())
+
+
+def test_backoff_doubles_up_to_the_maximum() -> None:
+    policy: RetryPolicy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    jittered: RetryPolicy = RetryPolicy(base_delay=1, max_delay=5)
+    assert all(0 <= jittered.backoff(3) <= 4 for _ in range(20))
+
+
+def test_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert parse_retry_after("7") == 7
+    assert 8 <= (parse_retry_after(formatdate(time.time() + 10, usegmt=True)) or 0)
+    assert parse_retry_after("soon") is None
+
+
+def test_get_is_retried_until_it_succeeds() -> None:
+    sleeps: list[float] = []
+    api_client: ApiClient = fake_client(
+        [FakeResponse(502), FakeResponse(429, "3"), FakeResponse(200)], sleeps
+    )
+    assert api_client.get(f"{JIRA_BASE_URL}/rest/api/2/issue/A-1").status_code == 200
+    assert sleeps == [0.5, 3.0]
+
+
+def test_post_is_only_retried_when_it_was_not_processed() -> None:
+    sleeps: list[float] = []
+    api_client: ApiClient = fake_client(
+        [FakeResponse(503), FakeResponse(502)], sleeps
+    )
+    assert api_client.post(f"{JIRA_BASE_URL}/rest/api/content").status_code == 502
+    assert api_client.session.methods == ["POST", "POST"]  # type: ignore[attr-defined]
+    refused: requests.ConnectionError = connection_error(
+        NewConnectionError(HTTPConnection("jira"), "refused")
+    )
+    reset: requests.ConnectionError = requests.ConnectionError("reset by peer")
+    policy: RetryPolicy = RetryPolicy()
+    assert policy.is_retryable_error("POST", refused)
+    assert not policy.is_retryable_error("POST", reset)
+    assert policy.is_retryable_error("GET", reset)
+
+
+def test_unresolvable_hosts_and_streamed_bodies_are_not_retried() -> None:
+    sleeps: list[float] = []
+    offline: requests.ConnectionError = connection_error(
+        NameResolutionError("jira", HTTPConnection("jira"), socket.gaierror("no VPN"))
+    )
+    api_client: ApiClient = fake_client([offline], sleeps)
+    with pytest.raises(requests.ConnectionError):
+        api_client.get(f"{JIRA_BASE_URL}/rest/api/2/issue/A-1")
+    streamed: ApiClient = fake_client([FakeResponse(503)], sleeps)
+    response = streamed.post(JIRA_BASE_URL, data=iter([b"{}"]))
+    assert response.status_code == 503
+    assert sleeps == []
+
+
+def test_token_bucket_spaces_requests_after_the_burst() -> None:
+    now: list[float] = [0.0]
+    waits: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        waits.append(seconds)
+        now[0] += seconds
+
+    bucket: TokenBucket = TokenBucket(2, 2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert waits == [0.5, 0.5]
+    limiter: RateLimiter = RateLimiter({"jira.amer.thermo.com": bucket})
+    assert limiter.acquire("https://confluence.amer.thermo.com/rest") == 0.0
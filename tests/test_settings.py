@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+from datetime import timezone, tzinfo
+from typing import Generator
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from entities.sprint_report_api import SprintReport, sprint_report_from_dict
+from jira_sprint_reporter import settings
+from jira_sprint_reporter.client import (
+    CONFLUENCE_BASE_URL,
+    JIRA_BASE_URL,
+    client_from_environment,
+)
+from jira_sprint_reporter.request_policy import default_rate_limiter
+from jira_sprint_reporter.settings import Settings
+from utilities.fixtures import load_fixture
+from utilities.utils import get_absolute_path
+
+
+@pytest.fixture
+def shared_settings() -> Generator[None, None, None]:
+    yield
+    settings.set_settings(None)
+
+
+def test_settings_are_read_from_the_environment() -> None:
+    loaded: Settings = Settings.from_environment(
+        {
+            "PASSWORD": "secret",
+            "JIRA_RATE_LIMIT": "2.5",
+            "CONFLUENCE_RATE_LIMIT": "fast",
+            "SPRINT_REPORT_CACHE": "on",
+        }
+    )
+    assert loaded.password == "secret"
+    assert loaded.bearer_token is None
+    assert loaded.jira_rate_limit == 2.5
+    assert loaded.confluence_rate_limit == settings.DEFAULT_CONFLUENCE_RATE
+    assert loaded.sprint_report_cache
+    assert not Settings.from_environment({}).sprint_report_cache
+
+
+def test_sprint_report_dates_are_read_in_the_jira_timezone() -> None:
+    loaded: Settings = Settings(jira_timezone="America/New_York")
+    eastern: tzinfo = loaded.sprint_report_timezone()
+    assert eastern == ZoneInfo("America/New_York")
+    assert Settings().sprint_report_timezone() == timezone.utc
+    raw: dict = load_fixture("sprint-36928")
+    local: SprintReport = sprint_report_from_dict(raw, zone=eastern)
+    utc: SprintReport = sprint_report_from_dict(raw, lazy=True)
+    assert local.end_date.tzinfo == eastern
+    assert local.end_date.replace(tzinfo=None) == utc.end_date.replace(tzinfo=None)
+    assert local.end_date != utc.end_date
+
+
+def test_settings_are_loaded_once_and_shared(shared_settings: None) -> None:
+    assert settings.get_settings() is settings.get_settings()
+    settings.set_settings(Settings(jira_rate_limit=0, confluence_rate_limit=1))
+    limiter = default_rate_limiter(
+        "https://jira.example.com", "https://confluence.example.com"
+    )
+    assert list(limiter.buckets) == ["confluence.example.com"]
+
+
+HEAVY_MODULE_PROBE: str = """
+import json, sys
+import main
+print(json.dumps([
+    name
+    for name in ("requests", "urllib3", "numpy", "dotenv", "asyncio")
+    if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule"
+]))
+"""
+
+
+def test_importing_the_cli_defers_the_heavy_packages() -> None:
+    completed = subprocess.run(
+        [sys.executable, "-c", HEAVY_MODULE_PROBE],
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=get_absolute_path("."),
+    )
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+def test_requests_go_to_the_configured_servers(shared_settings: None) -> None:
+    settings.set_settings(Settings(jira_url="http://127.0.0.1:8080/"))
+    api_client = client_from_environment()
+    assert api_client.resolve_url(f"{JIRA_BASE_URL}/rest/api/2/issue/A-1") == (
+        "http://127.0.0.1:8080/rest/api/2/issue/A-1"
+    )
+    assert api_client.resolve_url(CONFLUENCE_BASE_URL) == CONFLUENCE_BASE_URL
+    api_client.close()
@@ -0,0 +1,196 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Generator, Optional
+
+import pytest
+
+from jira_sprint_reporter import sprint_report_queries
+from jira_sprint_reporter.sprint_report_cache import (
+    CachedSprintReport,
+    SprintReportCache,
+)
+from jira_sprint_reporter.sprint_report_queries import SprintReportMemo
+from utilities.utils import get_absolute_path
+
+
+class FakeResponse:
+    def __init__(
+        self, status_code: int, data: Optional[dict] = None, etag: Optional[str] = None
+    ) -> None:
+        self.status_code = status_code
+        self.data = data
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self) -> Optional[dict]:
+        return self.data
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.data).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def closed_sprint() -> Generator[dict, None, None]:
+    json_file_path: str = get_absolute_path("tests/json_files/sprint-36928.json")
+    with open(json_file_path, encoding="utf-8") as json_file:
+        yield json.load(json_file)
+
+
+@pytest.fixture
+def active_sprint(closed_sprint: dict) -> dict:
+    return dict(closed_sprint, sprint=dict(closed_sprint["sprint"], state="ACTIVE"))
+
+
+def test_closed_sprints_never_expire(tmp_path: Path, closed_sprint: dict) -> None:
+    cache: SprintReportCache = SprintReportCache(str(tmp_path), active_ttl=0)
+    cache.store("6363", "36928", closed_sprint)
+    entry: Optional[CachedSprintReport] = cache.load("6363", "36928")
+    assert entry is not None and entry.closed
+    assert cache.is_fresh(entry)
+
+
+def test_entries_of_another_format_are_missing(
+    tmp_path: Path, closed_sprint: dict
+) -> None:
+    cache: SprintReportCache = SprintReportCache(str(tmp_path))
+    cache.store("6363", "36928", closed_sprint)
+    with open(cache.path("6363", "36928"), encoding="utf-8") as cache_file:
+        stored: dict = json.load(cache_file)
+    del stored["format"]
+    with open(cache.path("6363", "36928"), "w", encoding="utf-8") as cache_file:
+        json.dump(stored, cache_file)
+    assert cache.load("6363", "36928") is None
+
+
+def test_active_sprints_expire_after_ttl(tmp_path: Path, active_sprint: dict) -> None:
+    cache: SprintReportCache = SprintReportCache(str(tmp_path), active_ttl=60)
+    entry: CachedSprintReport = cache.store("6363", "36928", active_sprint)
+    assert cache.is_fresh(entry)
+    entry.fetched_at -= 61
+    assert not cache.is_fresh(entry)
+
+
+def test_least_recently_used_entries_are_evicted(
+    tmp_path: Path, closed_sprint: dict
+) -> None:
+    cache: SprintReportCache = SprintReportCache(str(tmp_path))
+    cache.store("1", "1", closed_sprint)
+    entry_size: int = os.path.getsize(cache.path("1", "1"))
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    old: float = time.time() - 100
+    os.utime(cache.path("1", "1"), (old, old))
+    cache.store("1", "2", closed_sprint)
+    os.utime(cache.path("1", "2"), (old - 10, old - 10))
+    cache.touch("1", "1")
+    cache.store("1", "3", closed_sprint)
+    assert cache.load("1", "2") is None
+    assert cache.load("1", "1") is not None
+    assert cache.load("1", "3") is not None
+
+
+def test_fresh_entries_are_served_without_network(
+    tmp_path: Path, closed_sprint: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[Optional[dict]] = []
+
+    def fake_query(self, board: str, sprint: str, headers=None) -> FakeResponse:
+        calls.append(headers)
+        return FakeResponse(200, closed_sprint)
+
+    monkeypatch.setattr(
+        sprint_report_queries.QuerySprintReport, "query_sprint_data", fake_query
+    )
+    cache: SprintReportCache = SprintReportCache(str(tmp_path))
+    for _ in range(3):
+        data: dict = sprint_report_queries.fetch_sprint_report_json(
+            "6363", "36928", cache
+        )
+        assert data["sprint"]["id"] == 36928
+    assert calls == [None]
+
+
+def test_stale_entries_are_revalidated_with_etag(
+    tmp_path: Path, active_sprint: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[Optional[dict]] = []
+
+    def fake_query(self, board: str, sprint: str, headers=None) -> FakeResponse:
+        calls.append(headers)
+        if headers:
+            return FakeResponse(304)
+        return FakeResponse(200, active_sprint, etag='"v1"')
+
+    monkeypatch.setattr(
+        sprint_report_queries.QuerySprintReport, "query_sprint_data", fake_query
+    )
+    cache: SprintReportCache = SprintReportCache(str(tmp_path), active_ttl=0)
+    sprint_report_queries.fetch_sprint_report_json("6363", "36928", cache)
+    data: dict = sprint_report_queries.fetch_sprint_report_json("6363", "36928", cache)
+    assert data["sprint"]["state"] == "ACTIVE"
+    assert calls == [None, {"If-None-Match": '"v1"'}]
+
+
+@pytest.fixture
+def memo_fetches(
+    closed_sprint: dict, monkeypatch: pytest.MonkeyPatch
+) -> list[tuple[str, str]]:
+    calls: list[tuple[str, str]] = []
+
+    def fake_fetch(board: str, sprint: str) -> dict:
+        calls.append((board, sprint))
+        return closed_sprint
+
+    monkeypatch.setattr(sprint_report_queries, "fetch_sprint_report_json", fake_fetch)
+    monkeypatch.setattr(
+        sprint_report_queries, "_sprint_report_memo", SprintReportMemo()
+    )
+    return calls
+
+
+def test_issue_lists_share_a_single_fetch(memo_fetches: list) -> None:
+    completed = sprint_report_queries.get_completed_issues("6363", "36928")
+    not_completed = sprint_report_queries.get_not_completed_issues("6363", "36928")
+    lists: dict = sprint_report_queries.get_sprint_report_issue_lists("6363", "36928")
+    assert memo_fetches == [("6363", "36928")]
+    assert set(lists) == {
+        "completed_issues",
+        "not_completed_issues",
+        "removed_issues",
+        "issues_completed_outside",
+    }
+    assert [issue.key for issue in lists["completed_issues"]] == [
+        issue.key for issue in completed or []
+    ]
+    assert len(lists["not_completed_issues"]) == len(not_completed or [])
+
+
+def test_memoized_reports_expire_and_can_be_invalidated(memo_fetches: list) -> None:
+    memo: SprintReportMemo = sprint_report_queries.get_sprint_report_memo()
+    sprint_report_queries.get_sprint_report_data("6363", "36928")
+    sprint_report_queries.get_sprint_report_data("6363", "1")
+    assert sprint_report_queries.invalidate_sprint_report("6363", "36928") == 1
+    sprint_report_queries.get_sprint_report_data("6363", "36928")
+    memo.ttl = 0
+    memo.invalidate()
+    sprint_report_queries.get_sprint_report_data("6363", "1")
+    sprint_report_queries.get_sprint_report_data("6363", "1")
+    assert memo_fetches == [
+        ("6363", "36928"),
+        ("6363", "1"),
+        ("6363", "36928"),
+        ("6363", "1"),
+        ("6363", "1"),
+    ]
+
+
+def test_fetch_locks_do_not_grow_with_the_sprints_seen(memo_fetches: list) -> None:
+    memo: SprintReportMemo = sprint_report_queries.get_sprint_report_memo()
+    locks: set[int] = set()
+    for sprint in range(100):
+        memo.get_or_fetch("6363", str(sprint))
+        locks.add(id(memo.fetch_lock("6363", str(sprint))))
+    assert len(memo_fetches) == 100
+    assert len(locks) <= sprint_report_queries.FETCH_LOCK_STRIPES
+    assert memo.fetch_lock("6363", "1") is memo.fetch_lock("6363", "1")
@@ -0,0 +1,105 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from entities.sprint_report_api import (
+    SprintReport,
+    sprint_report_from_dict,
+    sprint_report_to_dict,
+    update_sprint_jira_issue_types,
+)
+from entities.team_info import ListTeamSprints, TeamBoard, TeamSprint
+from jira_sprint_reporter import queries, store
+from jira_sprint_reporter.store import SprintStore
+from utilities.fixtures import load_fixture
+
+
+def resolved_sprint_report(name: str) -> SprintReport:
+    return update_sprint_jira_issue_types(sprint_report_from_dict(load_fixture(name)))
+
+
+def test_stored_sprint_report_round_trips(tmp_path: Path) -> None:
+    sprint: SprintReport = resolved_sprint_report("sprint-36928")
+    with SprintStore(str(tmp_path / "sprints.sqlite3")) as sprint_store:
+        sprint_store.save_sprint_report(6363, sprint)
+        sprint_store.save_sprint_report(6363, sprint)
+        loaded = sprint_store.load_sprint_report(6363, sprint.sprint_id)
+        assert sprint_store.stored_sprint_ids(6363) == {sprint.sprint_id}
+    assert loaded is not None
+    expected: dict = sprint_report_to_dict(sprint)
+    actual: dict = sprint_report_to_dict(loaded)
+    for name in ("completed_issues", "not_completed_issues", "removed_issues"):
+        assert [issue.to_dict() for issue in actual[name] or []] == [
+            issue.to_dict() for issue in expected[name] or []
+        ]
+    assert set(actual["added_issues"]) == set(expected["added_issues"] or {})
+
+
+def test_sprints_are_keyed_by_board(tmp_path: Path) -> None:
+    first: SprintReport = resolved_sprint_report("sprint-36928")
+    second: SprintReport = resolved_sprint_report("sprint-40267")
+    second.sprint_id = first.sprint_id
+    with SprintStore(str(tmp_path / "sprints.sqlite3")) as sprint_store:
+        sprint_store.save_sprint_report(6363, first)
+        sprint_store.save_sprint_report(7000, second)
+        on_first = sprint_store.load_sprint_report(6363, first.sprint_id)
+        on_second = sprint_store.load_sprint_report(7000, first.sprint_id)
+    assert on_first is not None and on_first.name == first.name
+    assert on_second is not None and on_second.name == second.name
+    assert len(on_first.completed_issues or []) == len(first.completed_issues or [])
+
+
+def test_cross_sprint_queries(tmp_path: Path) -> None:
+    first: SprintReport = resolved_sprint_report("sprint-36928")
+    second: SprintReport = resolved_sprint_report("sprint-40267")
+    spilled = (first.not_completed_issues or [])[0]
+    with SprintStore(str(tmp_path / "sprints.sqlite3")) as sprint_store:
+        sprint_store.save_sprint_report(6363, first)
+        sprint_store.save_sprint_report(6363, second)
+        assert sprint_store.issue_spillover_count(spilled.key) >= 1
+        assert sprint_store.issue_history(spilled.key)[0]["sprint_id"] == (
+            first.sprint_id
+        )
+        delivery = sprint_store.board_delivery(6363, datetime(2000, 1, 1))
+        assert [row["sprint_id"] for row in delivery] == sorted(
+            [first.sprint_id, second.sprint_id],
+            key=lambda sprint_id: {
+                first.sprint_id: first.end_date,
+                second.sprint_id: second.end_date,
+            }[sprint_id],
+        )
+        assert sprint_store.assignee_issues(spilled.assignee)
+
+
+def test_sync_only_fetches_sprints_that_are_not_stored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reports: dict[str, SprintReport] = {
+        str(sprint.sprint_id): sprint
+        for sprint in map(resolved_sprint_report, ("sprint-36928", "sprint-40267"))
+    }
+    closed: list[TeamSprint] = [
+        TeamSprint(int(sprint_id), f"Sprint {sprint_id}", None, None, 6363, None)
+        for sprint_id in reports
+    ]
+    fetched: list[str] = []
+
+    def fake_fetch(board: str, sprint_id: str) -> SprintReport:
+        fetched.append(sprint_id)
+        return reports[sprint_id]
+
+    monkeypatch.setattr(
+        queries, "query_team_board", lambda board: TeamBoard(6363, "Team", "scrum")
+    )
+    monkeypatch.setattr(
+        queries,
+        "list_team_sprints",
+        lambda board, state: ListTeamSprints(closed[: len(fetched) + 1]),
+    )
+    monkeypatch.setattr(store, "fetch_resolved_sprint_report", fake_fetch)
+    with SprintStore(str(tmp_path / "sprints.sqlite3")) as sprint_store:
+        assert store.sync_board(sprint_store, "6363") == [closed[0].sprint_id]
+        assert store.sync_board(sprint_store, "6363") == [closed[1].sprint_id]
+        assert store.sync_board(sprint_store, "6363") == []
+    assert fetched == list(reports)
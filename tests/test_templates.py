@@ -3,7 +3,16 @@ from typing import Generator
 
 import pytest
 
-from entities.sprint_report_api import SprintReport, sprint_report_from_dict
+from entities.sprint_report_api import (
+    JiraIssueSprintReport,
+    SprintReport,
+    sprint_report_from_dict,
+)
+from templates.sprint_report_template import (
+    iter_sprint_report_template,
+    print_pbis_tr,
+    sprint_report_template,
+)
 from utilities.utils import get_absolute_path
 
 
@@ -20,3 +29,17 @@ class TestSprintReportMethods:
         res: str = sprint_data.name
         name: str = "Gene.AI Delivery Sprint 12"
         assert name in res
+
+    def test_streamed_fragments_join_to_the_template(self, sprint_data) -> None:
+        fragments: list[str] = list(iter_sprint_report_template(sprint_data, "6363"))
+        assert len(fragments) > 1
+        assert "".join(fragments) == sprint_report_template(sprint_data, "6363")
+
+
+def test_issue_fields_are_escaped() -> None:
+    issue: JiraIssueSprintReport = JiraIssueSprintReport(
+        1, "AB-1", "Story", "Q&A flow", "Doe, Jane", "Done", "P2", "True"
+    )
+    row: str = print_pbis_tr([issue])
+    assert "AB-1: Q&amp;A flow" in row
+    assert "Q&A" not in row
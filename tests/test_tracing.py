@@ -0,0 +1,117 @@
+import json
+import pstats
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from jira_sprint_reporter import tracing
+from jira_sprint_reporter.client import JIRA_BASE_URL, ApiClient
+from jira_sprint_reporter.request_policy import RateLimiter, RetryPolicy
+from jira_sprint_reporter.tracing import Tracer
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers: dict = {}
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    def __init__(self, responses: list[FakeResponse]) -> None:
+        self.responses = iter(responses)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        return next(self.responses)
+
+
+@pytest.fixture
+def tracer() -> Generator[Tracer, None, None]:
+    previous: Tracer = tracing.get_tracer()
+    current: Tracer = Tracer()
+    tracing.set_tracer(current)
+    yield current
+    tracing.set_tracer(previous)
+
+
+def test_url_template_groups_calls_to_the_same_endpoint() -> None:
+    assert (
+        tracing.url_template(
+            f"{JIRA_BASE_URL}/rest/agile/latest/board/6363/sprint?startAt=50"
+        )
+        == "jira.amer.thermo.com/rest/agile/latest/board/{id}/sprint?startAt={}"
+    )
+    assert (
+        tracing.url_template(f"{JIRA_BASE_URL}/rest/api/2/issue/INTGPT-309")
+        == "jira.amer.thermo.com/rest/api/{id}/issue/{key}"
+    )
+
+
+def test_stages_are_recorded_with_their_errors(tracer: Tracer) -> None:
+    with tracing.stage("render"):
+        pass
+    with pytest.raises(ValueError):
+        with tracing.stage("render"):
+            raise ValueError("bad template")
+
+    @tracing.traced("fetch")
+    def fetch() -> int:
+        return 1
+
+    assert fetch() == 1
+    assert [(record.name, record.error) for record in tracer.stages] == [
+        ("render", None),
+        ("render", "ValueError"),
+        ("fetch", None),
+    ]
+    summary: str = tracer.summary()
+    assert "render" in summary and "fetch" in summary
+
+
+def test_every_http_attempt_is_recorded(tracer: Tracer) -> None:
+    api_client: ApiClient = ApiClient(
+        retry_policy=RetryPolicy(max_attempts=2, jitter=False),
+        rate_limiter=RateLimiter(),
+        sleep=lambda seconds: None,
+    )
+    api_client.session = FakeSession(  # type: ignore[assignment]
+        [FakeResponse(503, b""), FakeResponse(200, b'{"id": 1}')]
+    )
+    api_client.get(f"{JIRA_BASE_URL}/rest/api/2/issue/INTGPT-309")
+    assert [
+        (call.status_code, call.response_bytes, call.attempt)
+        for call in tracer.http_calls
+    ] == [(503, 0, 1), (200, 9, 2)]
+    assert "503 x1, 200 x1" in tracer.summary()
+
+
+def test_run_traced_exports_json_and_profile(tracer: Tracer, tmp_path: Path) -> None:
+    def run() -> str:
+        with tracing.stage("render"):
+            return "done"
+
+    json_path: Path = tmp_path / "trace.json"
+    profile_path: Path = tmp_path / "run.prof"
+    assert tracing.run_traced(run, False, str(json_path), str(profile_path)) == "done"
+    assert json.loads(json_path.read_text())["stages"][0]["name"] == "render"
+    profile: pstats.StatsProfile = pstats.Stats(str(profile_path)).get_stats_profile()
+    assert "run" in profile.func_profiles
+    assert tracing.get_tracer() is tracer
+
+
+def test_untraced_runs_record_nothing() -> None:
+    default: Tracer = tracing.get_tracer()
+    assert isinstance(default, tracing.NullTracer)
+
+    def run() -> int:
+        with tracing.stage("render"):
+            pass
+        return len(tracing.get_tracer().stages)
+
+    assert tracing.run_traced(run) == 0
+    assert tracing.run_traced(run, summary=True) == 1
+    assert tracing.get_tracer() is default and default.stages == []
@@ -1,6 +1,15 @@
 import json
+import sys
+from datetime import datetime, timedelta, timezone
+from types import ModuleType
 
-from utilities import utils
+import pytest
+
+from entities.jira_issue import JIRA_ISSUE_PATHS, JiraIssue
+from entities.sprint_report_api import SPRINT_REPORT_PATHS, sprint_report_from_dict
+from utilities import json_decoding, utils
+from utilities.lazy_import import lazy_import, load_lazy_modules
+from utilities.timestamps import parse_jira_timestamp, parse_sprint_report_timestamp
 
 
 def test_get_object_path_str() -> None:
@@ -50,3 +59,122 @@ def test_base64_encodes_login_credentials() -> None:
         )
         == res
     )
+
+
+def test_compiled_path_is_cached() -> None:
+    assert utils.compile_path("fields.status.name") is utils.compile_path(
+        "fields.status.name"
+    )
+
+
+def test_compiled_path_returns_nested_value() -> None:
+    data: dict = {"fields": {"status": {"name": "Done"}}}
+    assert utils.compile_path("fields.status.name")(data) == "Done"
+
+
+def test_compiled_path_is_none_safe() -> None:
+    data: dict = {"fields": {"assignee": None}}
+    assert utils.get_object(data, "fields.assignee.name") is None
+    assert utils.get_object(data, "fields.reporter.name") is None
+    assert utils.get_object(None, "key") is None
+
+
+def test_get_object_list_of_str_with_missing_list() -> None:
+    data: dict = {"fields": {"components": None}}
+    assert utils.get_object_list_of_str(data, "fields.components.name") == []
+
+
+def test_jira_timestamps_keep_their_offset() -> None:
+    data: dict = {"fields": {"created": "2023-05-24T17:58:20.554-0400"}}
+    created: datetime = utils.get_object_datetime(data, "fields.created")
+    assert created == datetime(
+        2023, 5, 24, 17, 58, 20, 554000, tzinfo=timezone(timedelta(hours=-4))
+    )
+
+
+def test_sprint_report_timestamps_honour_am_pm() -> None:
+    assert parse_sprint_report_timestamp("09/Oct/23 5:00 AM") == datetime(
+        2023, 10, 9, 5, 0, tzinfo=timezone.utc
+    )
+    assert parse_sprint_report_timestamp("20/Oct/23 7:09 PM") == datetime(
+        2023, 10, 20, 19, 9, tzinfo=timezone.utc
+    )
+    assert parse_sprint_report_timestamp("25/Mar/24 12:07 AM") == datetime(
+        2024, 3, 25, 0, 7, tzinfo=timezone.utc
+    )
+
+
+def test_sprint_report_and_jira_timestamps_compare() -> None:
+    eastern: timezone = timezone(timedelta(hours=-4))
+    completed: datetime = parse_sprint_report_timestamp("20/Oct/23 7:09 PM", eastern)
+    assert completed == parse_jira_timestamp("2023-10-20T23:09:00.000+00:00")
+    assert completed < parse_jira_timestamp("2023-10-20T19:10:00.000-04:00")
+    assert parse_jira_timestamp("2023-10-20T19:10:00").tzinfo == timezone.utc
+
+
+def test_repeated_timestamps_are_memoized() -> None:
+    parse_jira_timestamp.cache_clear()
+    for _ in range(3):
+        parse_jira_timestamp("2023-05-08T12:00:00.000-04:00")
+    assert parse_jira_timestamp.cache_info().hits == 2
+
+
+def test_selection_keeps_the_shortest_prefix() -> None:
+    assert json_decoding.compile_selection(("a.b", "a", "c.d.e", "c.f")) == {
+        "a": True,
+        "c": {"d": {"e": True}, "f": True},
+    }
+
+
+def test_selected_paths_walk_through_lists() -> None:
+    data: bytes = b'{"a": [{"b": 1, "c": 2}, {"c": 3}], "d": {"e": 4}}'
+    assert json_decoding.loads(data, ["a.b", "d.x"]) == {"a": [{"b": 1}, {}], "d": {}}
+
+
+@pytest.mark.parametrize("backend", ["json", ""])
+def test_selected_jira_issue_decodes_like_the_full_payload(backend: str) -> None:
+    json_file_path: str = utils.get_absolute_path("tests/json_files/intgpt-109.json")
+    with open(json_file_path, "rb") as json_file:
+        raw: bytes = json_file.read()
+    selected: dict = json_decoding.loads(raw, JIRA_ISSUE_PATHS, backend)
+    assert len(json.dumps(selected)) < len(raw) / 2
+    assert JiraIssue.from_dict(selected) == JiraIssue.from_dict(json.loads(raw))
+
+
+def test_selected_sprint_report_decodes_like_the_full_payload() -> None:
+    json_file_path: str = utils.get_absolute_path("tests/json_files/sprint-36928.json")
+    with open(json_file_path, "rb") as json_file:
+        raw: bytes = json_file.read()
+    selected: dict = json_decoding.loads(raw, SPRINT_REPORT_PATHS)
+    assert selected["sprint"]["state"] == "CLOSED"
+    assert (
+        sprint_report_from_dict(selected).to_dict()
+        == sprint_report_from_dict(json.loads(raw)).to_dict()
+    )
+
+
+def test_projection_names_the_fields_and_expansions_read() -> None:
+    assert json_decoding.projection_params(
+        ["key", "fields.status.name", "fields.labels", "fields.status.id"]
+    ) == {"fields": "status,labels"}
+    assert json_decoding.projection_params(
+        ["fields.summary", "changelog.histories", "renderedFields.description"]
+    ) == {"fields": "summary", "expand": "changelog,renderedFields"}
+
+
+def test_lazy_modules_load_on_first_attribute_access() -> None:
+    module = lazy_import("colorsys")
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert lazy_import("colorsys") is module
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("not_an_installed_module")
+
+
+def test_lazy_modules_are_loaded_before_thread_pools(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delitem(sys.modules, "tabnanny", raising=False)
+    module = lazy_import("tabnanny")
+    assert type(module) is not ModuleType
+    load_lazy_modules("tabnanny", "not_an_imported_module")
+    assert type(module) is ModuleType
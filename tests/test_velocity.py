@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+
+from entities.sprint_report_api import (
+    SprintReport,
+    sprint_report_from_dict,
+    update_sprint_jira_issue_types,
+)
+from entities.team_info import ListTeamSprints, TeamSprint
+from entities.velocity import VelocityTrend, rolling_mean
+from jira_sprint_reporter import queries, velocity
+from templates.sprint_report_template import sprint_report_template
+from utilities.fixtures import load_fixture
+
+
+def sprint_reports() -> list[SprintReport]:
+    return [
+        update_sprint_jira_issue_types(sprint_report_from_dict(load_fixture(name)))
+        for name in ("sprint-36928", "sprint-40267")
+    ]
+
+
+def test_rolling_mean_averages_the_available_sprints() -> None:
+    values: np.ndarray = np.array([10.0, 20.0, 30.0, 40.0])
+    assert rolling_mean(values, 3).tolist() == [10.0, 15.0, 20.0, 30.0]
+
+
+def test_trend_matches_the_sprint_reports() -> None:
+    sprints: list[SprintReport] = sprint_reports()
+    trend: VelocityTrend = VelocityTrend.from_sprint_reports("6363", sprints, 2)
+    assert trend.sprint_ids == [sprint.sprint_id for sprint in sprints]
+    for position, sprint in enumerate(sprints):
+        assert trend.delivered[position] == (sprint.delivered_story_points or 0)
+        assert trend.removed_issues[position] == len(sprint.removed_issues or [])
+        if sprint.commited_story_points:
+            assert trend.completion[position] == pytest.approx(
+                (sprint.delivered_story_points or 0)
+                / sprint.commited_story_points
+                * 100
+            )
+    assert trend.rolling_delivered[1] == pytest.approx(trend.delivered.mean())
+
+
+def test_trend_exports_json_and_renders_its_section() -> None:
+    sprints: list[SprintReport] = sprint_reports()
+    trend: VelocityTrend = VelocityTrend.from_sprint_reports("6363", sprints)
+    exported: dict = json.loads(velocity.velocity_to_json(trend))
+    assert [item["sprint_id"] for item in exported["sprints"]] == trend.sprint_ids
+    page: str = sprint_report_template(sprints[-1], "6363", trend)
+    assert "Velocity Trend (last 2 sprints)" in page
+    assert "Velocity Trend" not in sprint_report_template(sprints[-1], "6363")
+
+
+def test_fetch_velocity_trend_uses_the_last_closed_sprints(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    reports: dict[str, SprintReport] = {
+        str(sprint.sprint_id): sprint for sprint in sprint_reports()
+    }
+    closed: list[TeamSprint] = [
+        TeamSprint(sprint_id, f"Sprint {sprint_id}", None, None, 6363, None)
+        for sprint_id in [1, *map(int, reports)]
+    ]
+    monkeypatch.setattr(
+        queries, "list_team_sprints", lambda board, state: ListTeamSprints(closed)
+    )
+    monkeypatch.setattr(
+        velocity, "get_sprint_report_data", lambda board, sprint: reports[sprint]
+    )
+    trend: VelocityTrend = velocity.fetch_velocity_trend("6363", window=2)
+    assert [str(sprint_id) for sprint_id in trend.sprint_ids] == list(reports)
+    assert "Avg delivered" in velocity.format_velocity(trend)
+
+
+def test_last_closed_sprint_ids_rejects_an_empty_window() -> None:
+    with pytest.raises(ValueError):
+        velocity.last_closed_sprint_ids("6363", 0)
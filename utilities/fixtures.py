@@ -0,0 +1,70 @@
+"""
+Fixtures
+________
+Loads the recorded Jira responses of tests/json_files and scales the sprint
+report fixtures up to thousands of issues, for the tests and the benchmarks.
+"""
+
+import copy
+import json
+from typing import Any
+
+from utilities.utils import get_absolute_path
+
+SPRINT_REPORT_FIXTURES: tuple[str, ...] = ("sprint-36928", "sprint-40267")
+
+ISSUE_LISTS: tuple[str, ...] = (
+    "completedIssues",
+    "issuesNotCompletedInCurrentSprint",
+    "puntedIssues",
+    "issuesCompletedInAnotherSprint",
+)
+
+
+def load_fixture(name: str) -> Any:
+    json_file_path: str = get_absolute_path(f"tests/json_files/{name}.json")
+    with open(json_file_path, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def synthetic_sprint_report(base: dict, issue_count: int) -> dict:
+    """
+    Returns a copy of the sprint report with issue_count issues, built by cycling
+    through the issues of the base report. The issues keep the original list
+    proportions and every tenth issue is marked as added during the sprint.
+
+    Parameters
+    __________
+    base: dict
+        A raw sprint report JSON response.
+    issue_count: int
+        Number of issues of the synthetic report.
+
+    Returns
+    _______
+    dict
+        The scaled raw sprint report.
+    """
+    contents: dict = base["contents"]
+    templates: list[tuple[str, dict]] = [
+        (list_name, issue)
+        for list_name in ISSUE_LISTS
+        for issue in contents.get(list_name) or []
+    ]
+    result: dict = copy.deepcopy({k: v for k, v in base.items() if k != "contents"})
+    result["contents"] = {
+        k: copy.deepcopy(v) for k, v in contents.items() if k not in ISSUE_LISTS
+    }
+    for list_name in ISSUE_LISTS:
+        result["contents"][list_name] = []
+    added: dict = {}
+    for number in range(issue_count):
+        list_name, template = templates[number % len(templates)]
+        issue: dict = copy.deepcopy(template)
+        issue["id"] = 10_000_000 + number
+        issue["key"] = f"SYN-{number + 1}"
+        result["contents"][list_name].append(issue)
+        if number % 10 == 0:
+            added[issue["key"]] = True
+    result["contents"]["issueKeysAddedDuringSprint"] = added
+    return result
@@ -0,0 +1,177 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+KEEP_SUBTREE: bool = True
+UNEXPANDED_ROOTS: frozenset[str] = frozenset({"id", "key", "self", "fields", "expand"})
+
+Selection = Union[bool, dict[str, "Selection"]]
+
+
+def json_backend(decoder: Optional[str] = None) -> str:
+    """
+    Returns the name of the JSON decoder in use, "orjson" when it is installed
+    unless decoder is "json".
+
+    Args:
+        decoder (Optional[str]): Requested decoder, e.g. the JSON_DECODER setting
+
+    Returns:
+        str: "orjson" or "json"
+    """
+    if orjson is not None and (decoder or "").lower() != "json":
+        return "orjson"
+    return "json"
+
+
+def _backend_loads(decoder: Optional[str] = None) -> Callable[[Union[bytes, str]], Any]:
+    if orjson is not None and json_backend(decoder) == "orjson":
+        return orjson.loads
+    return json.loads
+
+
+@lru_cache(maxsize=64)
+def compile_selection(paths: tuple[str, ...]) -> Selection:
+    """
+    Builds the tree of the subtrees to keep out of dotted paths. Lists are
+    transparent, "contents.completedIssues.key" keeps the key of every issue.
+
+    Args:
+        paths (tuple[str, ...]): Dotted paths such as "fields.summary"
+
+    Returns:
+        Selection: Nested dicts whose leaves are KEEP_SUBTREE
+    """
+    tree: dict[str, Selection] = {}
+    for path in paths:
+        node: dict[str, Selection] = tree
+        parts: list[str] = path.split(".")
+        for part in parts[:-1]:
+            child: Selection = node.setdefault(part, {})
+            if not isinstance(child, dict):
+                break
+            node = child
+        else:
+            node[parts[-1]] = KEEP_SUBTREE
+    return tree
+
+
+def select_paths(obj: Any, selection: Selection) -> Any:
+    """
+    Returns a copy of obj reduced to the selected subtrees. Missing keys are
+    left out, so the None-safe utils getters behave as on the full object.
+
+    Args:
+        obj (Any): Decoded JSON value
+        selection (Selection): Tree returned by compile_selection
+
+    Returns:
+        Any: The reduced value, sharing the kept subtrees with obj
+    """
+    if not isinstance(selection, dict):
+        return obj
+    if isinstance(obj, dict):
+        return {
+            key: select_paths(obj[key], child)
+            for key, child in selection.items()
+            if key in obj
+        }
+    if isinstance(obj, list):
+        return [select_paths(item, selection) for item in obj]
+    return obj
+
+
+def field_names(paths: Iterable[str], root: str = "fields") -> tuple[str, ...]:
+    """
+    Returns the names of the root's children read by the dotted paths, in
+    order, e.g. the fields parameter of the Jira issue rest api.
+
+    Args:
+        paths (Iterable[str]): Dotted paths such as "fields.issuetype.name"
+        root (str): The object whose children are named
+
+    Returns:
+        tuple[str, ...]: ("issuetype", ...) without duplicates
+    """
+    names: dict[str, None] = {}
+    for path in paths:
+        parts: list[str] = path.split(".")
+        if len(parts) > 1 and parts[0] == root:
+            names[parts[1]] = None
+    return tuple(names)
+
+
+def projection_params(paths: Iterable[str]) -> dict[str, str]:
+    """
+    Returns the fields and expand query parameters of the Jira rest api that
+    return no more than the dotted paths read from an issue. Roots other than
+    fields, such as "changelog" or "renderedFields", are expanded.
+
+    Args:
+        paths (Iterable[str]): Dotted issue paths such as "fields.summary"
+
+    Returns:
+        dict[str, str]: {"fields": "summary,...", "expand": "changelog"}, without
+            expand when nothing needs it
+    """
+    paths = tuple(paths)
+    params: dict[str, str] = {"fields": ",".join(field_names(paths))}
+    expand: dict[str, None] = {
+        path.split(".")[0]: None
+        for path in paths
+        if path.split(".")[0] not in UNEXPANDED_ROOTS
+    }
+    if expand:
+        params["expand"] = ",".join(expand)
+    return params
+
+
+def loads(
+    data: Union[bytes, str],
+    paths: Optional[Iterable[str]] = None,
+    decoder: Optional[str] = None,
+) -> Any:
+    """
+    Decodes a JSON document with the fastest available backend.
+
+    Args:
+        data (Union[bytes, str]): The JSON document
+        paths (Optional[Iterable[str]]): Only keep these dotted paths, the
+            rest of the document is released right after decoding
+        decoder (Optional[str]): "json" forces the standard library, see
+            json_backend
+
+    Returns:
+        Any: The decoded document
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    decoded: Any = _backend_loads(decoder)(data)
+    if paths is None:
+        return decoded
+    return select_paths(decoded, compile_selection(tuple(paths)))
+
+
+def decode_response(
+    response: Any,
+    paths: Optional[Iterable[str]] = None,
+    decoder: Optional[str] = None,
+) -> Any:
+    """
+    Decodes the body of a requests.Response, see loads.
+
+    Args:
+        response (requests.Response): Response with a JSON body
+        paths (Optional[Iterable[str]]): Only keep these dotted paths
+        decoder (Optional[str]): "json" forces the standard library
+
+    Returns:
+        Any: The decoded body
+    """
+    return loads(response.content, paths, decoder)
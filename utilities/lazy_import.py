@@ -0,0 +1,51 @@
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module, deferring its execution until one of its attributes is
+    first used. Used for the heavy third party packages (requests, numpy) so
+    importing the reporter stays fast when no network call or computation
+    happens.
+
+    Args:
+        name (str): Absolute module name, e.g. "requests"
+
+    Returns:
+        ModuleType: The module, already loaded when it was imported before
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+    """
+    module: Optional[ModuleType] = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load_lazy_modules(*names: str) -> None:
+    """
+    Executes the modules deferred by lazy_import that are not loaded yet. Called
+    on the main thread before starting a thread pool whose tasks use them, as
+    importlib.util.LazyLoader is not thread safe before Python 3.12.3: a thread
+    can see a module that another thread is still executing.
+
+    Args:
+        names (str): Absolute module names, e.g. "requests"
+    """
+    for name in names:
+        module: Optional[ModuleType] = sys.modules.get(name)
+        if module is not None:
+            # any attribute access executes a deferred module
+            getattr(module, "__name__")
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+
+TIMESTAMP_CACHE_SIZE: int = 65536
+
+_MONTHS: dict[str, int] = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_jira_timestamp(value: str) -> datetime:
+    """
+    Parses the ISO 8601 timestamps of the Jira rest api, keeping the timezone
+    offset. Repeated timestamps are served from a cache.
+
+    Args:
+        value (str): Timestamp such as "2023-05-24T17:58:20.554-0400"
+
+    Returns:
+        datetime: Timezone aware datetime, in UTC when the value has no offset
+    """
+    parsed: datetime = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_sprint_report_timestamp(value: str, zone: tzinfo = timezone.utc) -> datetime:
+    """
+    Parses the greenhopper sprint report dates ("%d/%b/%y %I:%M %p"), with a
+    single or two digit hour. Repeated timestamps are served from a cache.
+
+    Args:
+        value (str): Timestamp such as "20/Oct/23 7:09 PM"
+        zone (tzinfo): Timezone of the Jira user profile, the sprint report
+            renders its dates in it without an offset
+
+    Returns:
+        datetime: Timezone aware datetime in zone
+
+    Raises:
+        ValueError: If the value is not a sprint report date
+    """
+    try:
+        date_part, time_part, meridiem = value.split(" ")
+        day, month_name, year = date_part.split("/")
+        hour_text, minute_text = time_part.split(":")
+        hour: int = int(hour_text) % 12
+        if meridiem.upper() == "PM":
+            hour += 12
+        elif meridiem.upper() != "AM":
+            raise ValueError(meridiem)
+        short_year: int = int(year)
+        return datetime(
+            short_year + (2000 if short_year < 69 else 1900),
+            _MONTHS[month_name],
+            int(day),
+            hour,
+            int(minute_text),
+            tzinfo=zone,
+        )
+    except (ValueError, KeyError):
+        return datetime.strptime(value, "%d/%b/%y %I:%M %p").replace(tzinfo=zone)
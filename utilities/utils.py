@@ -1,7 +1,12 @@
 import base64
 import os
-from datetime import datetime
-from typing import Any, Optional
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Callable, Optional, cast
+
+from utilities.timestamps import parse_jira_timestamp, parse_sprint_report_timestamp
+
+ISO_DATE_FORMAT: str = "%Y-%m-%dT%H:%M:%S"
+SPRINT_REPORT_DATE_FORMAT: str = "%d/%b/%y %I:%M %p"
 
 # def get_absolute_path(relative_path: str, base_path: Optional[str] = None) -> str:
 #     """Returns the absolute path for a given relative path."""
@@ -93,10 +98,59 @@ def get_relative_path(path: str, base_path: Optional[str] = None) -> str:
     return os.path.relpath(abs_path, start=base_path)
 
 
+_compiled_paths: dict[str, Callable[[Any], Any]] = {}
+
+
+def build_path_getter_source(path: str) -> str:
+    """
+    Returns the source of a function walking the dotted path with .get() and
+    returning None as soon as one of the levels is missing.
+
+    Args:
+        path (str): Dotted path such as "fields.priority.name"
+
+    Returns:
+        str: Python source defining get_path(object_name)
+    """
+    lines: list[str] = [
+        "def get_path(object_name):",
+        "    if object_name is None:",
+        "        return None",
+    ]
+    elements: list[str] = path.split(".")
+    for element in elements[:-1]:
+        lines.append(f"    object_name = object_name.get({element!r})")
+        lines.append("    if object_name is None:")
+        lines.append("        return None")
+    lines.append(f"    return object_name.get({elements[-1]!r})")
+    return "\n".join(lines)
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    Returns the None-safe accessor for a dotted path. Each path is parsed and
+    compiled once, later calls reuse the cached function.
+
+    Args:
+        path (str): Dotted path such as "fields.priority.name"
+
+    Returns:
+        Callable[[Any], Any]: Function returning the value at the path or None
+    """
+    getter: Optional[Callable[[Any], Any]] = _compiled_paths.get(path)
+    if getter is None:
+        namespace: dict[str, Any] = {}
+        exec(build_path_getter_source(path), namespace)  # pylint: disable=exec-used
+        compiled: Callable[[Any], Any] = cast(
+            Callable[[Any], Any], namespace["get_path"]
+        )
+        _compiled_paths[path] = compiled
+        return compiled
+    return getter
+
+
 def get_object(object_name: Any, path: str) -> Any:
-    for element in path.split("."):
-        object_name = object_name.get(element)
-    return object_name
+    return compile_path(path)(object_name)
 
 
 def build_get_object_path(object_name: str, name: str) -> str:
@@ -119,12 +173,10 @@ def get_object_int(object_name: Any, path: str) -> int:
 
 
 def get_object_list_of_str(object_name: Any, path: str) -> list[str]:
-    path_list: list[str] = path.split(".")
-    path_list_len: int = len(path_list)
-    for index, element in enumerate(path.split(".")):
-        if index < path_list_len - 1:
-            object_name = object_name.get(element)
-    return [item.get(path_list[path_list_len - 1]) for item in object_name]
+    list_path, _, item_path = path.rpartition(".")
+    items: Any = compile_path(list_path)(object_name) if list_path else object_name
+    get_item: Callable[[Any], Any] = compile_path(item_path)
+    return [get_item(item) for item in items] if items else []
 
 
 def get_object_simple_list(object_name: Any, path: str) -> list[str]:
@@ -134,18 +186,29 @@ def get_object_simple_list(object_name: Any, path: str) -> list[str]:
 def get_object_datetime(
     object_name: Any,
     path: str,
-    date_format: str = "%Y-%m-%dT%H:%M:%S",
-    str_len: int = -9,
+    date_format: str = ISO_DATE_FORMAT,
+    str_len: Optional[int] = None,
 ) -> datetime:
-    return datetime.strptime(get_object_str(object_name, path)[:str_len], date_format)
+    """
+    Returns the timestamp at the path. Jira ISO timestamps keep their timezone
+    offset; a custom date_format or str_len uses the former strptime parsing of
+    the value sliced to str_len characters.
+    """
+    value: str = get_object_str(object_name, path)
+    if date_format == ISO_DATE_FORMAT and str_len is None:
+        return parse_jira_timestamp(value)
+    return datetime.strptime(value[: -9 if str_len is None else str_len], date_format)
 
 
 def get_object_datetime_sprint_report(
-    object_name: Any, path: str, date_format: str = "%d/%b/%y %H:%M %p"
+    object_name: Any,
+    path: str,
+    date_format: str = SPRINT_REPORT_DATE_FORMAT,
+    zone: tzinfo = timezone.utc,
 ) -> datetime:
     datetime_str: str = get_object(object_name, path)
-    if len(datetime_str) < 18:
-        datetime_str = datetime_str[:10] + "1" + datetime_str[10:]
+    if date_format == SPRINT_REPORT_DATE_FORMAT:
+        return parse_sprint_report_timestamp(datetime_str, zone)
     return datetime.strptime(datetime_str, date_format)
 
 
@@ -165,14 +228,14 @@ def get_optional_int(object_name: Any, path: str) -> Optional[int]:
 
 
 def get_optional_datetime(
-    object_name: Any, path: str, str_len: int = -9
+    object_name: Any, path: str, str_len: Optional[int] = None
 ) -> Optional[datetime]:
     object_exists: Any = get_object(object_name, path)
-    return (
-        get_object_datetime(object_name, path, str_len=str_len)
-        if object_exists
-        else None
-    )
+    if not object_exists:
+        return None
+    if str_len is None:
+        return parse_jira_timestamp(str(object_exists))
+    return datetime.strptime(str(object_exists)[:str_len], ISO_DATE_FORMAT)
 
 
 def encode_login_credentials(user_name: str, password: str) -> str: